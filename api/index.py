@@ -1,6 +1,389 @@
-from flask import Flask, redirect, url_for, render_template_string
+import os
+import sys
+import time
+import signal
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import Flask, Response, redirect, url_for, render_template_string, request, jsonify
+
+# Make the parser modules importable when the API is run from the api directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pdf_extractor import PDFExtractor, NoTextError
+from src.field_extractor import FieldExtractor
+from src.utils.metrics import MetricsRegistry
+
+# Pool sizing, overridable through the environment
+WORKERS = int(os.environ.get('PDF_PARSER_WORKERS', os.cpu_count() or 1))
+QUEUE_SIZE = int(os.environ.get('PDF_PARSER_QUEUE_SIZE', WORKERS * 2))
+REQUEST_TIMEOUT = float(os.environ.get('PDF_PARSER_TIMEOUT', 60))
+MAX_UPLOAD_MB = int(os.environ.get('PDF_PARSER_MAX_UPLOAD_MB', 50))
 
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
+
+# Extractors built once per worker process
+_worker = {}
+
+def _init_worker(ocr_language, pids=None):
+    """
+    Build the extractors of a worker process.
+    
+    Args:
+        ocr_language (str): Language for OCR.
+        pids (SimpleQueue): Optional queue receiving the process ID of the worker,
+            so that the pool can kill it.
+    """
+    if pids is not None:
+        pids.put(os.getpid())
+    _worker['metrics'] = MetricsRegistry()
+    _worker['pdf_extractor'] = PDFExtractor(ocr_language=ocr_language, metrics=_worker['metrics'])
+    _worker['field_extractor'] = FieldExtractor(metrics=_worker['metrics'])
+
+def _extract_document(pdf_bytes):
+    """
+    Extract the fields of one PDF in a worker process.
+    
+    Args:
+        pdf_bytes (bytes): Contents of the PDF file.
+    
+    Returns:
+        dict: 'fields', 'timings' (seconds per stage), 'pages', 'ocr_pages' and
+            the 'metrics' recorded while extracting.
+    """
+    pdf_extractor = _worker['pdf_extractor']
+    field_extractor = _worker['field_extractor']
+    metrics = _worker['metrics']
+    metrics.reset()
+    
+    start = time.perf_counter()
+    timings = {}
+    pages = []
+    
+    def on_page(page):
+        pages.append(page.source)
+        for stage, seconds in page.timings.items():
+            timings[stage] = timings.get(stage, 0.0) + seconds
+    
+    try:
+        text = pdf_extractor.extract_usable_text(pdf_bytes, on_page)
+    except NoTextError as e:
+        raise ExtractionError(str(e), metrics.snapshot())
+    timings['extraction'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    fields = field_extractor.extract_fields(text)
+    timings['fields'] = time.perf_counter() - start
+    
+    return {
+        'fields': fields,
+        'timings': {stage: round(seconds, 4) for stage, seconds in timings.items()},
+        'pages': len(pages),
+        'ocr_pages': pages.count('OCR'),
+        'metrics': metrics.snapshot(),
+    }
+
+class ExtractionError(ValueError):
+    """Raised by a worker when a document yields no usable text."""
+    
+    def __init__(self, message, metrics=None):
+        super().__init__(message, metrics)
+        self.message = message
+        self.metrics = metrics
+    
+    def __str__(self):
+        return self.message
+
+class QueueFullError(Exception):
+    """Raised when the extraction queue has no room for a request."""
+
+class ExtractionPool:
+    """
+    Bounded pool of extraction worker processes.
+    
+    At most ``workers + queue_size`` documents are running or waiting at any
+    time; further submissions are refused instead of piling up, so callers can
+    back off and the latency of accepted requests stays predictable.
+    
+    A slot is only freed when its document is done, so a document whose
+    request timed out cannot be left running: the pool is retired (new
+    documents go to a fresh one) and its worker processes are killed once
+    only abandoned documents remain in it. A pool broken by a crashed worker
+    is replaced the same way.
+    """
+    
+    def __init__(self, workers, queue_size, ocr_language='eng'):
+        """
+        Initialize the pool. Worker processes are started on first use.
+        
+        Args:
+            workers (int): Number of worker processes.
+            queue_size (int): Number of documents allowed to wait for a worker.
+            ocr_language (str): Language for OCR.
+        """
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.ocr_language = ocr_language
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor = None
+        self._lock = threading.Lock()
+        # Executor of each unfinished future, and the futures of each executor
+        # whose requests gave up on them
+        self._owners = {}
+        self._abandoned = {}
+        # Queue each executor's workers report their process ID on, the IDs
+        # read from it so far, and the executors a worker crash has broken
+        self._pid_queues = {}
+        self._pids = {}
+        self._broken = set()
+    
+    def _get_executor(self):
+        # Called with the lock held
+        if self._executor is None:
+            pids = multiprocessing.SimpleQueue()
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.ocr_language, pids))
+            self._abandoned[self._executor] = set()
+            self._pid_queues[self._executor] = pids
+            self._pids[self._executor] = set()
+        return self._executor
+    
+    def worker_pids(self, executor=None):
+        """
+        Return the process IDs of the workers of an executor that have started.
+        
+        Args:
+            executor (ProcessPoolExecutor): The executor. Default is the current one.
+        
+        Returns:
+            set: Process IDs, empty if no worker has started yet.
+        """
+        with self._lock:
+            executor = self._executor if executor is None else executor
+            return set(self._read_pids(executor))
+    
+    def _read_pids(self, executor):
+        # Called with the lock held
+        pids = self._pids.get(executor, set())
+        queue = self._pid_queues.get(executor)
+        while queue is not None and not queue.empty():
+            pids.add(queue.get())
+        return pids
+    
+    def submit_many(self, documents):
+        """
+        Queue documents for extraction, all or none.
+        
+        Args:
+            documents (list): PDF contents as bytes.
+        
+        Returns:
+            list: One future per document.
+        
+        Raises:
+            QueueFullError: If the queue cannot take every document.
+        """
+        acquired = 0
+        for _ in documents:
+            if not self._slots.acquire(blocking=False):
+                for _ in range(acquired):
+                    self._slots.release()
+                raise QueueFullError("Extraction queue is full, retry later.")
+            acquired += 1
+        
+        submitted = []
+        with self._lock:
+            for pdf_bytes in documents:
+                executor = self._get_executor()
+                try:
+                    future = executor.submit(_extract_document, pdf_bytes)
+                except BrokenProcessPool:
+                    # A worker died since the last document finished: start a fresh pool
+                    self._broken.add(executor)
+                    self._retire(executor)
+                    executor = self._get_executor()
+                    future = executor.submit(_extract_document, pdf_bytes)
+                self._owners[future] = executor
+                submitted.append(future)
+        
+        for future in submitted:
+            # The slot is held until the worker is done, even if the request timed out
+            future.add_done_callback(self._finish)
+        return submitted
+    
+    def abandon(self, future):
+        """
+        Give up on a document whose request timed out.
+        
+        A document that has not started is cancelled. A running one cannot be
+        interrupted, so its pool is retired and its workers are killed as soon
+        as nothing but abandoned documents runs in it, which frees the slots.
+        
+        Args:
+            future (Future): Future returned by submit_many().
+        """
+        if future.cancel():
+            return
+        with self._lock:
+            executor = self._owners.get(future)
+            if executor is None:
+                # Finished in the meantime
+                return
+            self._abandoned[executor].add(future)
+            self._retire(executor)
+    
+    def _finish(self, future):
+        """Free the slot of a finished document and retire its pool if it broke."""
+        self._slots.release()
+        with self._lock:
+            executor = self._owners.pop(future, None)
+            if executor is None:
+                return
+            abandoned = self._abandoned.get(executor, set())
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                # Killing the workers of abandoned documents also breaks the pool
+                if future not in abandoned:
+                    metrics.inc('api_worker_crashes_total')
+                self._broken.add(executor)
+            abandoned.discard(future)
+            self._retire(executor)
+    
+    def _retire(self, executor):
+        """
+        Stop sending documents to an executor and reap it once it only holds abandoned ones.
+        
+        Called with the lock held; a no-op for the current executor unless it
+        has abandoned documents or is broken.
+        """
+        running = {future for future, owner in self._owners.items() if owner is executor}
+        abandoned = self._abandoned.get(executor, set())
+        broken = executor in self._broken
+        if executor is self._executor:
+            if not abandoned and not broken:
+                return
+            self._executor = None
+        
+        if running and not running <= abandoned:
+            # Other requests are still waiting on this pool: reap it when they are done
+            return
+        if running:
+            # Only abandoned documents are left: kill their workers so the futures fail
+            for pid in self._read_pids(executor):
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    # Already exited
+                    pass
+        else:
+            self._abandoned.pop(executor, None)
+            self._pid_queues.pop(executor, None)
+            self._pids.pop(executor, None)
+            self._broken.discard(executor)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+pool = ExtractionPool(WORKERS, QUEUE_SIZE, os.environ.get('PDF_PARSER_OCR_LANGUAGE', 'eng'))
+
+# Metrics of this process, with the extraction metrics of the workers merged in
+metrics = MetricsRegistry()
+
+def _wait_for_result(future, deadline):
+    """
+    Wait for one extraction until the deadline.
+    
+    Args:
+        future (Future): Future returned by the pool.
+        deadline (float): time.monotonic() value after which the request times out.
+    
+    Returns:
+        tuple: (response dictionary, HTTP status code)
+    """
+    try:
+        result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        metrics.merge(result.pop('metrics'))
+        return result, 200
+    except FutureTimeoutError:
+        # Cancel the document, or free its worker if it is already running
+        pool.abandon(future)
+        metrics.inc('api_timeouts_total')
+        return {'error': f"Extraction timed out after {REQUEST_TIMEOUT:g} s."}, 504
+    except ExtractionError as e:
+        if e.metrics is not None:
+            metrics.merge(e.metrics)
+        return {'error': str(e)}, 422
+    except Exception as e:
+        return {'error': f"Error processing file: {e}"}, 500
+
+@app.route('/extract', methods=['POST'])
+def extract():
+    """
+    Extract the fields of one PDF.
+    
+    The PDF is sent either as the raw request body (Content-Type: application/pdf)
+    or as a multipart upload in the ``file`` field.
+    """
+    uploaded = request.files.get('file')
+    pdf_bytes = uploaded.read() if uploaded else request.get_data()
+    if not pdf_bytes:
+        return jsonify({'error': "No PDF supplied."}), 400
+    
+    start = time.monotonic()
+    try:
+        future, = pool.submit_many([pdf_bytes])
+    except QueueFullError as e:
+        metrics.inc('api_requests_total', endpoint='extract', status=429)
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '1'}
+    
+    result, status = _wait_for_result(future, start + REQUEST_TIMEOUT)
+    result['seconds'] = round(time.monotonic() - start, 4)
+    metrics.inc('api_requests_total', endpoint='extract', status=status)
+    metrics.observe('api_request_seconds', result['seconds'], endpoint='extract')
+    return jsonify(result), status
+
+@app.route('/extract/batch', methods=['POST'])
+def extract_batch():
+    """
+    Extract the fields of several PDFs uploaded as multipart ``files``.
+    
+    The batch is accepted only if the queue has room for every file, and the
+    request timeout applies to the batch as a whole.
+    """
+    uploads = request.files.getlist('files')
+    if not uploads:
+        return jsonify({'error': "No PDFs supplied."}), 400
+    
+    documents = [uploaded.read() for uploaded in uploads]
+    if len(documents) > pool.capacity:
+        return jsonify({'error': f"Batch too large, at most {pool.capacity} files are accepted."}), 413
+    
+    start = time.monotonic()
+    try:
+        futures = pool.submit_many(documents)
+    except QueueFullError as e:
+        metrics.inc('api_requests_total', endpoint='batch', status=429)
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '1'}
+    
+    deadline = start + REQUEST_TIMEOUT
+    results = []
+    for uploaded, future in zip(uploads, futures):
+        result, status = _wait_for_result(future, deadline)
+        result['file_name'] = uploaded.filename
+        result['status'] = status
+        results.append(result)
+    
+    seconds = round(time.monotonic() - start, 4)
+    metrics.inc('api_requests_total', endpoint='batch', status=200)
+    metrics.observe('api_request_seconds', seconds, endpoint='batch')
+    return jsonify({'results': results, 'seconds': seconds})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose request and extraction metrics in the Prometheus text format, or as JSON with ?format=json."""
+    if request.args.get('format') == 'json':
+        return Response(metrics.to_json(), mimetype='application/json')
+    return Response(metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def home():
@@ -70,6 +453,14 @@ def home():
                 <li>Run the application with <code>streamlit run app.py</code></li>
             </ol>
             
+            <h2>HTTP API</h2>
+            <p>When the API is run on a server with the parser dependencies installed, fields can be extracted over HTTP:</p>
+            <ul>
+                <li><code>POST /extract</code> with the PDF as the request body or as the multipart field <code>file</code></li>
+                <li><code>POST /extract/batch</code> with several PDFs as the multipart field <code>files</code></li>
+            </ul>
+            <p>Requests are refused with <code>429</code> when the extraction queue is full and return <code>504</code> when they time out.</p>
+            
             <a href="https://github.com/Aresgod112/PDF-Parser" class="button">View on GitHub</a>
         </div>
     </body>
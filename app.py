@@ -3,8 +3,8 @@ import sys
 import traceback
 import streamlit as st
 import pandas as pd
-import base64
-from io import BytesIO
+import tempfile
+import uuid
 
 # Add basic logging
 print("Starting PDF Parser application...")
@@ -12,16 +12,16 @@ print(f"Python version: {sys.version}")
 print(f"Current working directory: {os.getcwd()}")
 
 try:
-    from src.pdf_extractor import PDFExtractor
-    from src.field_extractor import FieldExtractor
-    from src.utils.export import export_to_csv
+    from src.extraction_service import ExtractionService
+    from src.field_extractor import EXTRACTOR_VERSION
+    from src.pdf_extractor import CACHE_VERSION
+    from src.records import RecordBatch
+    from src.utils.cache import ResultStore
+    from src.utils.export import export_to_excel
     from src.utils.helpers import (
-        create_temp_file, 
-        clean_temp_files, 
-        get_file_name, 
         generate_output_filename,
-        format_extraction_results,
-        handle_missing_fields
+        results_to_frame,
+        DISPLAY_FIELDS
     )
     print("Successfully imported all modules")
 except Exception as e:
@@ -48,7 +48,7 @@ try:
     print("Initializing session state variables...")
     if 'extraction_results' not in st.session_state:
         # Add sample data for testing
-        st.session_state.extraction_results = [
+        st.session_state.extraction_results = RecordBatch.from_dicts([
             {
                 'print_name': 'John Smith',
                 'title': 'CEO',
@@ -67,16 +67,27 @@ try:
                 'further_term': None,
                 'file_name': 'sample_contract_2.pdf'
             }
-        ]
-    if 'temp_files' not in st.session_state:
-        st.session_state.temp_files = []
-    if 'processed_files' not in st.session_state:
-        st.session_state.processed_files = set(['sample_contract.pdf', 'sample_contract_2.pdf'])
+        ])
+    if 'results_version' not in st.session_state:
+        # Changes whenever the results do, so cached exports are never stale
+        st.session_state.results_version = uuid.uuid4().hex
+    if 'pending_jobs' not in st.session_state:
+        # Job id -> (file name, OCR language, content key) of the files being processed in the background
+        st.session_state.pending_jobs = {}
+        st.session_state.processing_messages = []
+        st.session_state.batch_results = 0
+    if 'processed_keys' not in st.session_state:
+        # Content keys (ResultStore.key) of the uploads already in the results
+        st.session_state.processed_keys = set()
     print("Session state variables initialized successfully")
 except Exception as e:
     print(f"Error initializing session state: {e}")
     traceback.print_exc()
 
+# Columns of the results table that hold extracted fields
+FIELD_COLUMNS = list(DISPLAY_FIELDS.values())
+MISSING_LABEL = "Not found"
+
 def main():
     """Main function to run the Streamlit app."""
     print("Entering main function...")
@@ -127,16 +138,19 @@ def main():
         
         # Clear results button
         if st.button("Clear All Results"):
-            # Clean up temporary files
-            clean_temp_files(st.session_state.temp_files)
-            
             # Reset session state
-            st.session_state.extraction_results = []
-            st.session_state.temp_files = []
-            st.session_state.processed_files = set()
+            st.session_state.extraction_results = RecordBatch()
+            st.session_state.results_version = uuid.uuid4().hex
+            st.session_state.processed_keys = set()
             
-            st.success("All results cleared!")
+            # Drop the files still being processed
+            for job_id, (_, language, _) in st.session_state.pending_jobs.items():
+                get_extraction_service(language).discard([job_id])
+            st.session_state.pending_jobs = {}
+            st.session_state.processing_messages = []
             
+            st.success("All results cleared!")
+        
         st.markdown("---")
         st.markdown("### About")
         st.markdown("""
@@ -161,12 +175,16 @@ def main():
     # Process button
     col1, col2 = st.columns([1, 5])
     with col1:
-        process_button = st.button("Process Files", type="primary", use_container_width=True)
+        process_button = st.button("Process Files", type="primary", width="stretch")
     
-    # Process files when button is clicked
+    # Queue files when button is clicked; they are processed in the background
     if process_button and uploaded_files:
-        with st.spinner("Processing PDF files..."):
-            process_files(uploaded_files, ocr_language)
+        process_files(uploaded_files, ocr_language)
+    
+    if st.session_state.pending_jobs:
+        show_progress()
+    for level, message in st.session_state.processing_messages:
+        getattr(st, level)(message)
     
     # Display results if available
     if st.session_state.extraction_results:
@@ -178,96 +196,176 @@ def main():
     st.markdown("---")
     st.markdown("Developed with ❤️ using Streamlit, PyPDF2, and Tesseract OCR")
 
-def process_files(uploaded_files, ocr_language):
+@st.cache_resource
+def get_extraction_service(ocr_language):
     """
-    Process uploaded PDF files.
+    Get the extraction service shared by every session of this server.
     
     Args:
-        uploaded_files (list): List of uploaded PDF files.
         ocr_language (str): Language for OCR processing.
+    
+    Returns:
+        ExtractionService: Service whose worker processes keep their extractors between files.
     """
-    # Initialize extractors
-    pdf_extractor = PDFExtractor(ocr_language=ocr_language)
-    field_extractor = FieldExtractor()
+    workers = int(os.environ.get('PDF_PARSER_WORKERS', 0)) or None
+    return ExtractionService(workers=workers, ocr_language=ocr_language)
+
+@st.cache_resource
+def get_result_store():
+    """
+    Get the store of extraction results shared by every session of this server.
     
-    # Track new results
-    new_results = []
-    new_temp_files = []
+    Returns:
+        ResultStore: Results keyed by PDF content and OCR language, spilled to
+            PDF_PARSER_RESULT_DIR (default: a directory in the system temp dir).
+    """
+    directory = os.environ.get('PDF_PARSER_RESULT_DIR', os.path.join(tempfile.gettempdir(), 'pdf_parser_results'))
+    return ResultStore(max_items=int(os.environ.get('PDF_PARSER_RESULT_ITEMS', 1024)), directory=directory)
+
+def process_files(uploaded_files, ocr_language):
+    """
+    Queue uploaded PDF files for background processing.
     
-    # Process each file
-    progress_bar = st.progress(0)
+    Uploads are identified by content, not by name. Documents already in the
+    result store, from this session or another one, are added at once;
+    the others are extracted in parallel by the extraction service, and
+    show_progress() polls their progress and adds their results as they land.
     
-    for i, uploaded_file in enumerate(uploaded_files):
-        # Skip if already processed
-        if uploaded_file.name in st.session_state.processed_files:
+    Args:
+        uploaded_files (list): List of uploaded PDF files.
+        ocr_language (str): Language for OCR processing.
+    """
+    service = get_extraction_service(ocr_language)
+    store = get_result_store()
+    pending_keys = {key for _, _, key in st.session_state.pending_jobs.values()}
+    st.session_state.processing_messages = []
+    
+    queued = 0
+    known_results = []
+    for uploaded_file in uploaded_files:
+        pdf_bytes = uploaded_file.getvalue()
+        # Results of an older extractor are not reused, even from the disk spill
+        key = ResultStore.key(pdf_bytes, f"v{CACHE_VERSION}.{EXTRACTOR_VERSION}|{ocr_language}")
+        
+        # Skip if already processed or queued, whatever the file is named
+        if key in st.session_state.processed_keys or key in pending_keys:
             continue
         
-        try:
-            # Update progress
-            progress_percent = (i + 1) / len(uploaded_files)
-            progress_bar.progress(progress_percent)
-            
-            # Create a temporary file
-            temp_file_path = create_temp_file(uploaded_file)
-            if not temp_file_path:
-                st.error(f"Failed to process {uploaded_file.name}. Could not create temporary file.")
-                continue
-                
-            new_temp_files.append(temp_file_path)
-            
-            # Extract text from PDF
-            text = pdf_extractor.extract_text(temp_file_path)
-            
-            if not text or len(text.strip()) < 10:  # Arbitrary threshold
-                st.warning(f"Little or no text extracted from {uploaded_file.name}. The file may be corrupted or heavily image-based.")
-                continue
-            
-            # Extract fields from text
-            fields = field_extractor.extract_fields(text)
-            
-            # Add file name to results
+        # Known document: reuse its result without extracting it again
+        fields = store.get(key)
+        if fields is not None:
             fields['file_name'] = uploaded_file.name
-            
-            # Add to results
-            new_results.append(fields)
-            
-            # Mark as processed
-            st.session_state.processed_files.add(uploaded_file.name)
-            
-        except Exception as e:
-            st.error(f"Error processing {uploaded_file.name}: {str(e)}")
+            known_results.append(fields)
+            st.session_state.processed_keys.add(key)
+            continue
+        
+        # The PDF is sent straight from the upload buffer (no temporary file)
+        job_id = service.submit(uploaded_file.name, pdf_bytes)
+        st.session_state.pending_jobs[job_id] = (uploaded_file.name, ocr_language, key)
+        pending_keys.add(key)
+        queued += 1
+    
+    if known_results:
+        st.session_state.extraction_results.extend(known_results)
+        st.session_state.results_version = uuid.uuid4().hex
+        st.session_state.processing_messages.append(
+            ('success', f"Loaded {len(known_results)} previously processed file(s) instantly."))
+    
+    if queued:
+        st.session_state.batch_results = 0
+    elif not known_results:
+        st.info("No new files to process.")
+
+@st.fragment(run_every=1.0)
+def show_progress():
+    """Poll the queued files, showing per-page progress and adding results as they land."""
+    pending = st.session_state.pending_jobs
+    if not pending:
+        return
+    
+    # Jobs are grouped by the service (OCR language) they were submitted to
+    by_language = {}
+    for job_id, (_, ocr_language, _) in pending.items():
+        by_language.setdefault(ocr_language, []).append(job_id)
+    
+    jobs = []
+    finished = []
+    for ocr_language, job_ids in by_language.items():
+        service = get_extraction_service(ocr_language)
+        jobs.extend(service.jobs(job_ids))
+        finished.extend(service.collect(job_ids))
+    
+    # Progress counts pages, so a long document moves the bar while it is read
+    files_done = sum(job.finished for job in jobs)
+    pages_done = sum(job.pages_done for job in jobs)
+    progress = sum(job.fraction for job in jobs) / len(jobs) if jobs else 1.0
+    st.progress(progress, text=f"Processed {files_done}/{len(jobs)} file(s), {pages_done} page(s) read...")
+    
+    store = get_result_store()
+    new_results = []
+    for job in finished:
+        _, _, key = pending.pop(job.job_id)
+        if job.error is not None:
+            st.session_state.processing_messages.append(('warning', f"Error processing {job.name}: {job.error}"))
+            continue
+        
+        # Share the result with every session, then add the file name and mark as processed
+        fields = job.result
+        store.set(key, fields)
+        fields['file_name'] = job.name
+        new_results.append(fields)
+        st.session_state.processed_keys.add(key)
     
-    # Clear progress bar
-    progress_bar.empty()
+    if new_results:
+        st.session_state.extraction_results.extend(new_results)
+        st.session_state.results_version = uuid.uuid4().hex
+        st.session_state.batch_results += len(new_results)
     
-    # Update session state
-    st.session_state.extraction_results.extend(new_results)
-    st.session_state.temp_files.extend(new_temp_files)
+    if not pending and st.session_state.batch_results:
+        st.session_state.processing_messages.append(
+            ('success', f"Successfully processed {st.session_state.batch_results} new file(s)!"))
     
-    # Show success message
-    if new_results:
-        st.success(f"Successfully processed {len(new_results)} new file(s)!")
-    else:
-        st.info("No new files to process.")
+    # Redraw the whole page so the results table shows the new rows
+    if finished:
+        st.rerun()
 
-def display_results():
-    """Display extraction results in a tabular format with improved formatting."""
+def get_results_frame():
+    """
+    Get the results table of this session, rebuilt only when results were added.
     
-    # Handle missing fields
-    results, missing_count = handle_missing_fields(st.session_state.extraction_results)
+    The table wraps the code buffers of the session's RecordBatch without
+    copying them, and the missing-field count is kept up to date by the
+    batch as results are appended.
     
-    # Format results for display
-    formatted_results = format_extraction_results(results)
+    Returns:
+        dict: 'frame' (pandas.DataFrame of the results), 'rows' (results it
+            covers) and 'missing' (number of missing fields).
+    """
+    results = st.session_state.extraction_results
+    cache = st.session_state.get('results_frame')
+    if cache is None or cache['batch'] is not results or cache['rows'] != len(results):
+        cache = {
+            'batch': results,
+            'frame': results_to_frame(results),
+            'rows': len(results),
+            'missing': results.missing_count(DISPLAY_FIELDS),
+        }
+        st.session_state.results_frame = cache
+    return cache
+
+def display_results():
+    """Display extraction results in a paginated table with improved formatting."""
     
-    # Convert to DataFrame for display
-    df = pd.DataFrame(formatted_results)
+    results = get_results_frame()
+    df = results['frame']
+    missing_count = results['missing']
     
     # Display results section header
     st.markdown('<p class="sub-header">Extraction Results</p>', unsafe_allow_html=True)
     
     # Add summary statistics
-    total_files = len(formatted_results)
-    total_fields = total_files * 4  # 4 main fields per file (Effective Date, Start Date, Initial Term, Further Term)
+    total_files = len(df)
+    total_fields = total_files * len(FIELD_COLUMNS)
     success_rate = ((total_fields - missing_count) / total_fields) * 100 if total_fields > 0 else 0
     
     # Create metrics row
@@ -282,7 +380,7 @@ def display_results():
     # Show warning if missing fields with more details
     if missing_count > 0:
         st.warning(
-            f"{missing_count} fields could not be extracted. They are marked as 'Not found' in the table below. "
+            f"{missing_count} fields could not be extracted. They are marked as '{MISSING_LABEL}' in the table below. "
             "This may be due to non-standard formatting in the original documents."
         )
     
@@ -291,11 +389,12 @@ def display_results():
     filter_cols = st.columns(3)
     
     # File filter
+    selected_files = []
     with filter_cols[0]:
-        if len(df) > 0 and 'File' in df.columns:
+        if len(df) > 0:
             selected_files = st.multiselect(
                 "Filter by File",
-                options=df['File'].unique(),
+                options=df['File'].unique().tolist(),
                 default=[]
             )
     
@@ -303,107 +402,115 @@ def display_results():
     with filter_cols[1]:
         show_missing = st.checkbox("Show Missing Fields Only", value=False)
     
-    # Apply filters
-    filtered_df = df.copy()
-    if len(df) > 0:
-        if selected_files:
-            filtered_df = filtered_df[filtered_df['File'].isin(selected_files)]
-        
-        if show_missing:
-            # Create a mask for rows with at least one "Not found" value
-            mask = filtered_df.apply(lambda row: any(str(val) == "Not found" for val in row), axis=1)
-            filtered_df = filtered_df[mask]
-            
+    with filter_cols[2]:
+        page_size = st.selectbox("Rows per page", options=[25, 50, 100, 250], index=1)
+    
+    # Apply filters with vectorized masks
+    filtered_df = df
+    if selected_files:
+        filtered_df = filtered_df[filtered_df['File'].isin(selected_files)]
+    if show_missing:
+        filtered_df = filtered_df[filtered_df[FIELD_COLUMNS].isna().any(axis=1)]
+    
     # Add a message if no results after filtering
     if len(filtered_df) == 0 and len(df) > 0:
         st.info("No results match the current filter criteria. Try adjusting your filters.")
     elif len(df) == 0:
         st.info("No files have been processed yet. Upload and process PDF files to see results here.")
     
+    # Only the visible page is formatted and styled
+    st.markdown("### Extracted Data")
+    page_count = max(1, -(-len(filtered_df) // page_size))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1) if page_count > 1 else 1
+    first_row = (page - 1) * page_size
+    page_df = filtered_df.iloc[first_row:first_row + page_size]
+    
     # Style the dataframe
     def highlight_missing(val):
-        if val == "Not found":
+        if val == MISSING_LABEL:
             return 'color: #F44336; font-weight: bold'
         return ''
     
-    # Apply styling (using .map instead of .applymap which is deprecated)
-    styled_df = filtered_df.style.map(highlight_missing)
+    styled_df = page_df.astype(object).fillna(MISSING_LABEL).style.map(highlight_missing, subset=FIELD_COLUMNS)
     
     # Display table with improved styling
-    st.markdown("### Extracted Data")
     st.dataframe(
         styled_df,
-        use_container_width=True,
+        width="stretch",
         height=400,  # Fixed height with scrolling
+        hide_index=True,
     )
+    if len(filtered_df) > 0:
+        st.caption(f"Showing rows {first_row + 1}-{first_row + len(page_df)} of {len(filtered_df)}")
     
     # Export options with better styling
     st.markdown("### Export Options")
     export_cols = st.columns([1, 1, 3])
     
     with export_cols[0]:
-        # Generate CSV download link with better styling
-        csv_filename = generate_output_filename()
-        csv = filtered_df.to_csv(index=False)
-        b64 = base64.b64encode(csv.encode()).decode()
-        
-        download_button_style = """
-            <style>
-            .download-button {
-                background-color: #4CAF50;
-                color: white;
-                padding: 10px 15px;
-                text-align: center;
-                text-decoration: none;
-                display: inline-block;
-                font-size: 16px;
-                margin: 4px 2px;
-                cursor: pointer;
-                border-radius: 5px;
-            }
-            </style>
-        """
-        
-        st.markdown(download_button_style, unsafe_allow_html=True)
-        href = f'<a href="data:file/csv;base64,{b64}" download="{csv_filename}" class="download-button">Download CSV</a>'
-        st.markdown(href, unsafe_allow_html=True)
+        # Built when the button is clicked, then cached for this filter state
+        filter_state = (st.session_state.results_version, tuple(selected_files), show_missing)
+        st.download_button(
+            "Download CSV",
+            data=lambda: build_csv_export(filter_state, filtered_df),
+            file_name=generate_output_filename(),
+            mime="text/csv",
+            on_click="ignore",
+        )
     
     with export_cols[1]:
-        # Generate Excel download option
-        if st.button("Download Excel", type="primary"):
-            # Create a BytesIO object
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                filtered_df.to_excel(writer, sheet_name='Extraction Results', index=False)
-                
-                # Get the xlsxwriter workbook and worksheet objects
-                workbook = writer.book
-                worksheet = writer.sheets['Extraction Results']
-                
-                # Add some formatting
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'bg_color': '#D3D3D3',
-                    'border': 1
-                })
-                
-                # Write the column headers with the defined format
-                for col_num, value in enumerate(filtered_df.columns.values):
-                    worksheet.write(0, col_num, value, header_format)
-                    
-                # Set column widths
-                for i, col in enumerate(filtered_df.columns):
-                    max_len = max(
-                        filtered_df[col].astype(str).map(len).max(),
-                        len(col)
-                    ) + 2
-                    worksheet.set_column(i, i, max_len)
-            
-            # Set up download link
-            b64_excel = base64.b64encode(output.getvalue()).decode()
-            excel_filename = generate_output_filename().replace('.csv', '.xlsx')
-            href_excel = f'<a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64_excel}" download="{excel_filename}">Click to Download</a>'
-            st.markdown(href_excel, unsafe_allow_html=True)
+        # The workbook is only built when the button is clicked, then cached for this filter state
+        st.download_button(
+            "Download Excel",
+            data=lambda: build_excel_export(filter_state, filtered_df),
+            file_name=generate_output_filename().replace('.csv', '.xlsx'),
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            type="primary",
+            on_click="ignore",
+        )
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_csv_export(filter_state, _df):
+    """
+    Build the CSV export of the filtered results, cached by filter state.
+    
+    Args:
+        filter_state (tuple): Results version and filter settings the rows were
+            selected with. The table itself is not hashed.
+        _df (pandas.DataFrame): The filtered table.
+    
+    Returns:
+        str: Contents of the CSV file.
+    """
+    return _df.to_csv(index=False, na_rep=MISSING_LABEL)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_excel_export(filter_state, _df):
+    """
+    Build the Excel export of the filtered results.
+    
+    The workbook is streamed to a temporary file in constant memory and
+    cached by filter state, so repeated downloads of the same view reuse it.
+    
+    Args:
+        filter_state (tuple): Results version and filter settings the rows were
+            selected with. The table itself is not hashed.
+        _df (pandas.DataFrame): The filtered table.
+    
+    Returns:
+        bytes: Contents of the .xlsx file.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, 'export.xlsx')
+        # Missing values are labelled row by row as the rows are written, without copying the table
+        rows = (
+            [MISSING_LABEL if pd.isna(value) else value for value in row]
+            for row in _df.itertuples(index=False, name=None)
+        )
+        if not export_to_excel(rows, list(_df.columns), output_path):
+            raise RuntimeError("Excel export failed")
+        with open(output_path, 'rb') as f:
+            return f.read()
 
 if __name__ == "__main__":
     try:
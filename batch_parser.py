@@ -0,0 +1,360 @@
+"""
+Batch entry point for the Contract PDF Parser.
+Processes a directory, glob or manifest of PDFs across a pool of worker processes
+and streams the results to a JSONL, CSV or Parquet file as documents complete.
+
+Usage:
+    python batch_parser.py <dir|glob|file.pdf>... [--manifest paths.txt] --output results.jsonl
+                           [--workers 8] [--ocr-language eng] [--cache-dir .cache] [--early-exit]
+                           [--job-db jobs.sqlite [--recover]] [--metrics metrics.prom]
+
+With --job-db, every document's state and result is kept in a SQLite job
+store: rerunning the same command after a crash resumes where it stopped.
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from src.pdf_extractor import PDFExtractor
+from src.field_extractor import FieldExtractor
+from src.pipeline import extract_fields_from_pdf
+from src.utils.cache import DiskCache, OCRCache
+from src.job_queue import JobQueue, OCR
+from src.utils.metrics import MetricsRegistry
+from src.utils.export import open_writer, resolve_format
+
+# Fields shown in the app; with --early-exit, reading stops once these are found
+REQUIRED_FIELDS = ['effective_date', 'start_date', 'initial_term', 'further_term']
+
+# Extractors built once per worker process
+_worker = {}
+
+def _init_worker(ocr_language, cache_dir, early_exit, job_db=None, collect_metrics=False, job_owner=None):
+    """
+    Build the extractors of a worker process.
+    
+    Args:
+        ocr_language (str): Language for OCR.
+        cache_dir (str): Directory of the extraction cache, or None. OCR'd page
+            images are cached in its 'ocr' subdirectory.
+        early_exit (bool): Stop reading pages once the required fields are found.
+        job_db (str): Path of the job database, or None.
+        collect_metrics (bool): Instrument the extractors and return each document's metrics.
+        job_owner (str): worker_id of the JobQueue that claims the jobs.
+    """
+    cache = DiskCache(cache_dir) if cache_dir else None
+    ocr_cache = OCRCache(os.path.join(cache_dir, 'ocr')) if cache_dir else None
+    metrics = MetricsRegistry() if collect_metrics else None
+    _worker['metrics'] = metrics
+    _worker['pdf_extractor'] = PDFExtractor(ocr_language=ocr_language, cache=cache, metrics=metrics,
+                                            ocr_cache=ocr_cache)
+    _worker['field_extractor'] = FieldExtractor(metrics=metrics)
+    _worker['early_exit'] = early_exit
+    _worker['job_queue'] = JobQueue(job_db, owner=job_owner) if job_db else None
+
+def process_document(pdf_path, job_id=None):
+    """
+    Extract the fields of one PDF in a worker process.
+    
+    Args:
+        pdf_path (str): Path to the PDF file.
+        job_id (int): Id of the document's job, if a job database is used.
+    
+    Returns:
+        dict: Extracted fields plus file_name, path, seconds and error, and the
+            document's metrics under 'metrics' when they are collected.
+    """
+    start = time.perf_counter()
+    result = {'file_name': os.path.basename(pdf_path), 'path': pdf_path}
+    
+    try:
+        pdf_extractor = _worker['pdf_extractor']
+        field_extractor = _worker['field_extractor']
+        if _worker['job_queue'] is not None and job_id is not None:
+            _worker['job_queue'].start(job_id)
+        on_page = _job_state_recorder(job_id)
+        
+        if _worker['early_exit']:
+            stats = {}
+            fields = extract_fields_from_pdf(pdf_extractor, field_extractor, pdf_path,
+                                             required_fields=REQUIRED_FIELDS, stats=stats, on_page=on_page)
+            if not stats['page_count']:
+                result['error'] = "No pages could be read. The file may be corrupted."
+            else:
+                result.update(fields)
+                result['error'] = None
+        else:
+            text = pdf_extractor.extract_usable_text(pdf_path, on_page)
+            result.update(field_extractor.extract_fields(text))
+            result['error'] = None
+    except Exception as e:
+        result['error'] = str(e)
+    
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    
+    metrics = _worker['metrics']
+    if metrics is not None:
+        result['metrics'] = metrics.snapshot()
+        metrics.reset()
+    return result
+
+def _job_state_recorder(job_id):
+    """
+    Return a page callback that moves the job to the OCR state on its first OCR'd page.
+    
+    Args:
+        job_id (int): Id of the document's job, or None.
+    
+    Returns:
+        callable: Function to call with each PageResult.
+    """
+    job_queue = _worker['job_queue']
+    reported = []
+    
+    def on_page(page):
+        if job_queue is not None and job_id is not None and page.source == 'OCR' and not reported:
+            job_queue.set_state(job_id, OCR)
+            reported.append(True)
+    
+    return on_page
+
+def collect_inputs(inputs, manifest=None):
+    """
+    Expand directories, globs, files and a manifest into a list of PDF paths.
+    
+    Args:
+        inputs (list): Directories (searched recursively), glob patterns or PDF paths.
+        manifest (str): Optional file listing one PDF path per line ('#' starts a comment).
+    
+    Returns:
+        list: Unique PDF paths, in the order they were found.
+    """
+    candidates = []
+    
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                candidates.extend(os.path.join(root, name) for name in sorted(files))
+        elif glob.has_magic(item):
+            candidates.extend(sorted(glob.glob(item, recursive=True)))
+        else:
+            candidates.append(item)
+    
+    if manifest:
+        with open(manifest, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    candidates.append(line)
+    
+    seen = set()
+    paths = []
+    for path in candidates:
+        if path.lower().endswith('.pdf') and path not in seen:
+            seen.add(path)
+            paths.append(path)
+    return paths
+
+def run_batch(paths, writer, workers, ocr_language='eng', cache_dir=None, early_exit=False, job_queue=None,
+              metrics=None):
+    """
+    Process PDFs across a worker pool, writing each result as soon as it completes.
+    
+    At most four documents per worker are queued at a time, so memory stays
+    flat on very large batches. With a job queue, the leases of every queued
+    document are renewed while it waits, so none is claimed again by another
+    run before a worker gets to it. If a worker process dies (e.g. killed for
+    running out of memory), the pool is restarted and the documents it was
+    holding are failed, or retried when a job queue is used.
+    
+    Args:
+        paths (list): PDF paths to process. Ignored when job_queue is set.
+        writer: Destination of the results, a writer of src.utils.export.
+        workers (int): Number of worker processes.
+        ocr_language (str): Language for OCR.
+        cache_dir (str): Directory of the extraction cache, or None.
+        early_exit (bool): Stop reading pages once the required fields are found.
+        job_queue (JobQueue): Job store to claim documents from and record results in.
+        metrics (MetricsRegistry): Registry receiving the metrics of every worker.
+    
+    Returns:
+        dict: Counts of processed and failed documents.
+    """
+    counts = {'processed': 0, 'failed': 0}
+    
+    if job_queue is not None:
+        claim = job_queue.claim
+        total = sum(job_queue.counts().values())
+    else:
+        remaining = iter(paths)
+        claim = lambda limit: [(None, path) for path in islice(remaining, limit)]
+        total = len(paths)
+    
+    def new_executor():
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(ocr_language, cache_dir, early_exit,
+                                             job_queue.db_path if job_queue is not None else None,
+                                             metrics is not None,
+                                             job_queue.worker_id if job_queue is not None else None))
+    
+    def record(future, job_id, path):
+        """Write the result of a finished future. Returns False if its worker crashed."""
+        try:
+            result = future.result()
+        except BrokenProcessPool as e:
+            error = f"Worker process crashed: {e}"
+            if metrics is not None:
+                metrics.inc('batch_worker_crashes_total')
+            if job_queue is not None:
+                if not job_queue.fail(job_id, error, retry=True):
+                    crash['charged'] = True
+                print(f"Requeued: {path}: {error}", file=sys.stderr)
+                return False
+            result = {'file_name': os.path.basename(path), 'path': path, 'error': error, 'seconds': None}
+        
+        snapshot = result.pop('metrics', None)
+        if metrics is not None:
+            if snapshot is not None:
+                metrics.merge(snapshot)
+            metrics.inc('batch_documents_total', status='failed' if result['error'] else 'done')
+            if result['seconds'] is not None:
+                metrics.observe('batch_document_seconds', result['seconds'])
+        
+        # Written before the job is marked done: a crash in between repeats a line instead of losing it
+        writer.write(result)
+        if job_queue is not None:
+            if result['error']:
+                job_queue.fail(job_id, result['error'])
+            elif not job_queue.complete(job_id, result):
+                print(f"Lease lost, result kept by the job's new owner: {path}", file=sys.stderr)
+        
+        counts['processed'] += 1
+        if result['error']:
+            counts['failed'] += 1
+            print(f"Failed: {result['path']}: {result['error']}", file=sys.stderr)
+        
+        if counts['processed'] % 100 == 0:
+            print(f"Processed {counts['processed']}/{total} documents...")
+        return not isinstance(future.exception(), BrokenProcessPool)
+    
+    pending = {}
+    executor = new_executor()
+    crash = {'charged': False, 'idle': 0}
+    # Leases are renewed well before they expire
+    heartbeat = job_queue.lease_seconds / 3 if job_queue is not None else None
+    renewed = time.monotonic()
+    try:
+        while True:
+            room = workers * 4 - len(pending)
+            if room > 0:
+                for job_id, path in claim(room):
+                    pending[executor.submit(process_document, path, job_id)] = (job_id, path)
+            
+            if not pending:
+                break
+            
+            done, _ = wait(pending, timeout=heartbeat, return_when=FIRST_COMPLETED)
+            if heartbeat is not None and time.monotonic() - renewed >= heartbeat:
+                job_queue.renew([job_id for job_id, _ in pending.values()])
+                renewed = time.monotonic()
+            healthy = all([record(future, *pending.pop(future)) for future in done])
+            if not healthy:
+                # Every document still in the broken pool fails the same way
+                wait(pending)
+                for future in list(pending):
+                    record(future, *pending.pop(future))
+                executor.shutdown(wait=False)
+                
+                # Workers that die before starting any document would otherwise be restarted forever
+                crash['idle'] = 0 if crash['charged'] or job_queue is None else crash['idle'] + 1
+                crash['charged'] = False
+                if crash['idle'] >= 2:
+                    raise RuntimeError("Worker processes crashed twice before starting any document.")
+                executor = new_executor()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    
+    return counts
+
+def main():
+    """Main function to run a batch."""
+    parser = argparse.ArgumentParser(description="Extract contract fields from many PDFs in parallel.")
+    parser.add_argument("inputs", nargs="*", help="Directories, glob patterns or PDF files.")
+    parser.add_argument("--manifest", help="File listing one PDF path per line.")
+    parser.add_argument("--output", required=True,
+                        help="Output file (.jsonl, .csv or .parquet). A Parquet file is complete once the run ends.")
+    parser.add_argument("--format", choices=["jsonl", "csv", "parquet"],
+                        help="Output format (default: from the extension).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument("--ocr-language", default="eng", help="Language for OCR.")
+    parser.add_argument("--cache-dir", help="Directory of an extraction and OCR cache shared by the workers.")
+    parser.add_argument("--early-exit", action="store_true",
+                        help="Stop reading a document once the displayed fields are found.")
+    parser.add_argument("--job-db", help="SQLite job store; rerun with the same file to resume a batch.")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                        help="Times a document is retried after a worker crash (with --job-db).")
+    parser.add_argument("--recover", action="store_true",
+                        help="Requeue documents left running by a crashed run without waiting for their lease "
+                             "to expire. Only use when no other run shares the job store.")
+    parser.add_argument("--metrics", help="Write extraction metrics to this file (.json, or Prometheus text otherwise).")
+    args = parser.parse_args()
+    
+    paths = collect_inputs(args.inputs, args.manifest)
+    job_queue = None
+    if args.job_db:
+        job_queue = JobQueue(args.job_db, max_attempts=args.max_attempts)
+        added = job_queue.add(paths)
+        if args.recover:
+            job_queue.recover()
+        states = job_queue.counts()
+        print(f"Job store '{args.job_db}': {added} new jobs, "
+              + ", ".join(f"{count} {state}" for state, count in states.items()))
+    elif not paths:
+        print("Error: No PDF files found.")
+        return
+    
+    print(f"Processing with {args.workers} workers...")
+    output_format = resolve_format(args.output, args.format)
+    fieldnames = ['file_name', 'path'] + list(FieldExtractor().patterns) + ['print_name_2', 'error', 'seconds']
+    # A resumed run adds to the results of the runs before it. A Parquet file is
+    # unreadable until it is closed, so it is rebuilt from the job store instead
+    rebuild = job_queue is not None and output_format == 'parquet'
+    writer = open_writer(args.output, output_format, append=job_queue is not None and not rebuild,
+                         fieldnames=fieldnames)
+    start = time.perf_counter()
+    try:
+        if rebuild:
+            for path, state, result, error in job_queue.results():
+                writer.write(result or {'file_name': os.path.basename(path), 'path': path, 'error': error,
+                                        'seconds': None})
+        metrics = MetricsRegistry() if args.metrics else None
+        counts = run_batch(paths, writer, args.workers, args.ocr_language, args.cache_dir, args.early_exit,
+                           job_queue, metrics)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    
+    print("\nBatch Summary:")
+    print("-" * 50)
+    print(f"Documents: {counts['processed']} ({counts['processed'] - counts['failed']} succeeded, "
+          f"{counts['failed']} failed)")
+    print(f"Elapsed: {elapsed:.1f} s")
+    print(f"Throughput: {counts['processed'] / elapsed:.2f} documents/s" if elapsed > 0 else "Throughput: n/a")
+    print(f"Results written to '{args.output}'")
+    if metrics is not None:
+        with open(args.metrics, 'w', encoding='utf-8') as file:
+            file.write(metrics.to_json() if args.metrics.lower().endswith('.json') else metrics.to_prometheus())
+        print(f"Metrics written to '{args.metrics}'")
+    if job_queue is not None:
+        states = job_queue.counts()
+        print("Job store: " + ", ".join(f"{count} {state}" for state, count in states.items()))
+        job_queue.close()
+
+if __name__ == "__main__":
+    main()
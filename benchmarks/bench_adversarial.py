@@ -0,0 +1,73 @@
+"""
+Worst-case benchmark for FieldExtractor on adversarial, unpunctuated text.
+Long OCR output without periods makes the lazy term patterns backtrack; this
+shows how extraction time grows with the text length for each implementation.
+
+Run from the repository root:
+    python -m benchmarks.bench_adversarial [--sizes 5000 10000 20000 40000 80000] [--legacy-max 10000]
+"""
+
+import argparse
+import time
+
+from benchmarks.bench_fields import legacy_extract_fields
+from src.field_extractor import FieldExtractor
+
+# Repeated fragments that defeat the term patterns: every one starts a match
+# that can only fail after scanning to a period that never comes
+ADVERSARIAL_INPUTS = {
+    'renew_chain': "after the initial term the parties may renew for another ",
+    'notice_chain': "unless either party provides notice to renew for ",
+    'digit_run': "term: 1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 16 ",
+    'unpunctuated': "the initial term is 12 months subject to review and the term of this agreement shall be reviewed ",
+}
+
+
+def build_text(fragment, size):
+    """Repeat a fragment up to the given number of characters."""
+    return (fragment * (size // len(fragment) + 1))[:size]
+
+
+def time_call(function, text):
+    """Return the seconds taken by one call of function(text)."""
+    start = time.perf_counter()
+    function(text)
+    return time.perf_counter() - start
+
+
+def main():
+    """Main function to run the adversarial benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark worst-case field extraction time.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 10000, 20000, 40000, 80000],
+                        help="Text lengths in characters.")
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="Largest text given to the original implementation, which grows super-linearly.")
+    args = parser.parse_args()
+    
+    extractor = FieldExtractor()
+    
+    modes = [
+        ('original', lambda text: legacy_extract_fields(extractor.patterns, text)),
+        ('anchor windows', extractor.extract_fields),
+    ]
+    
+    print(f"Adversarial field extraction (matches bounded to {extractor.anchor_window} characters)")
+    print("-" * 72)
+    print(f"{'Input':<14}{'Mode':<18}{'Chars':>8}{'Seconds':>10}{'us/char':>10}{'Growth':>10}")
+    
+    for name, fragment in ADVERSARIAL_INPUTS.items():
+        for label, function in modes:
+            previous = None
+            for size in sorted(args.sizes):
+                if label == 'original' and size > args.legacy_max:
+                    break
+                seconds = time_call(function, build_text(fragment, size))
+                # Time ratio when the text doubles: about 2 for linear growth, 4 or more for super-linear
+                growth = f"{seconds / previous[1] * previous[0] / size * 2:.2f}" if previous else "-"
+                print(f"{name:<14}{label:<18}{size:>8}{seconds:>10.3f}{seconds / size * 1e6:>10.2f}{growth:>10}")
+                previous = (size, seconds)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Micro-benchmark for date normalization.
+Compares fuzzy dateutil parsing of every value with DateNormalizer's fast paths,
+with and without its memo cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_dates [--values 20000] [--distinct 2000]
+"""
+
+import argparse
+import random
+import time
+
+from dateutil import parser as date_parser
+
+from benchmarks.text_corpus import _date_variants
+from src.utils.dates import DateNormalizer
+
+
+def legacy_normalize(value):
+    """Reference copy of the original conversion: fuzzy dateutil on every value."""
+    try:
+        return date_parser.parse(value, fuzzy=True).strftime('%Y-%m-%d')
+    except (ValueError, OverflowError):
+        return None
+
+
+def main():
+    """Main function to run the date benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark date normalization.")
+    parser.add_argument("--values", type=int, default=20000, help="Number of dates to normalize.")
+    parser.add_argument("--distinct", type=int, default=2000,
+                        help="Number of distinct dates among them (repeats hit the memo cache).")
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    pool = [value for _ in range(args.distinct // 4 + 1) for value in _date_variants(rng)][:args.distinct]
+    values = [rng.choice(pool) for _ in range(args.values)]
+    
+    uncached = DateNormalizer(cache_size=0)
+    cached = DateNormalizer()
+    modes = [
+        ('dateutil', lambda column: [legacy_normalize(value) for value in column]),
+        ('fast paths', lambda column: [uncached.normalize(value) for value in column]),
+        ('+ memo cache', lambda column: [cached.normalize(value) for value in column]),
+    ]
+    
+    print(f"Normalizing {len(values)} dates ({len(pool)} distinct)")
+    print("-" * 48)
+    print(f"{'Mode':<16}{'Seconds':>10}{'Values/s':>12}{'Speedup':>10}")
+    
+    baseline_seconds, baseline = None, None
+    for label, normalize in modes:
+        start = time.perf_counter()
+        results = normalize(values)
+        seconds = time.perf_counter() - start
+        if baseline is None:
+            baseline_seconds, baseline = seconds, results
+        print(f"{label:<16}{seconds:>10.3f}{len(values) / seconds:>12.0f}{baseline_seconds / seconds:>10.2f}")
+        
+        if results != baseline:
+            print(f"  Warning: {label} output differs from dateutil")
+
+
+if __name__ == "__main__":
+    main()
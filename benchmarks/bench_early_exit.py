@@ -0,0 +1,71 @@
+"""
+Benchmark for early-exit field extraction on long contracts.
+Compares reading the whole PDF before extracting fields with feeding pages incrementally.
+
+Run from the repository root:
+    python -m benchmarks.bench_early_exit [--filler-clauses 1500] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.text_corpus import generate_contract_texts
+from create_sample_pdf import text_to_pdf
+from src.field_extractor import FieldExtractor
+from src.pdf_extractor import PDFExtractor
+from src.pipeline import extract_fields_from_pdf
+
+# Fields shown in the app; the signature fields rarely match a pattern
+REQUIRED_FIELDS = ['effective_date', 'start_date', 'initial_term', 'further_term']
+
+
+def main():
+    """Main function to run the early-exit benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark early-exit field extraction.")
+    parser.add_argument("--filler-clauses", type=int, default=1500, help="Boilerplate clauses in the contract.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the fastest one is reported.")
+    args = parser.parse_args()
+    
+    text = generate_contract_texts(1, filler_clauses=args.filler_clauses, missing_rate=0)[0]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'contract.txt')
+        pdf_path = os.path.join(directory, 'contract.pdf')
+        with open(text_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        text_to_pdf(text_path, pdf_path)
+        
+        pdf_extractor = PDFExtractor()
+        field_extractor = FieldExtractor()
+        
+        full_time = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            full_results = field_extractor.extract_fields(pdf_extractor.extract_text(pdf_path))
+            elapsed = time.perf_counter() - start
+            full_time = elapsed if full_time is None else min(full_time, elapsed)
+        
+        early_time = None
+        stats = {}
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            early_results = extract_fields_from_pdf(pdf_extractor, field_extractor, pdf_path,
+                                                    required_fields=REQUIRED_FIELDS, stats=stats)
+            elapsed = time.perf_counter() - start
+            early_time = elapsed if early_time is None else min(early_time, elapsed)
+    
+    print(f"Benchmarking early exit on a {stats['page_count']}-page contract")
+    print("-" * 50)
+    print(f"{'Mode':<14}{'Seconds':>10}{'Pages read':>14}{'Speedup':>12}")
+    print(f"{'full':<14}{full_time:>10.3f}{stats['page_count']:>14}{1.0:>12.2f}")
+    print(f"{'early exit':<14}{early_time:>10.3f}{stats['pages_read']:>14}{full_time / early_time:>12.2f}")
+    
+    for field in REQUIRED_FIELDS:
+        if full_results[field] != early_results[field]:
+            print(f"  Warning: {field} differs: {full_results[field]!r} vs {early_results[field]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Micro-benchmark for FieldExtractor throughput.
+Compares the original per-field extraction loop with the current FieldExtractor on a synthetic corpus.
+
+Run from the repository root:
+    python -m benchmarks.bench_fields [--documents 2000] [--filler-clauses 40] [--scaling]
+"""
+
+import argparse
+import re
+import time
+
+from dateutil import parser as date_parser
+
+from benchmarks.text_corpus import generate_contract_texts
+from src.field_extractor import FieldExtractor
+
+
+def legacy_extract_fields(patterns, text):
+    """
+    Reference copy of the original extraction loop, used as the "before" baseline.
+    
+    The text is normalized once per field and uncompiled patterns are searched
+    with re.IGNORECASE on every call.
+    
+    Args:
+        patterns (dict): Field name to list of regex pattern strings.
+        text (str): The text to extract fields from.
+    
+    Returns:
+        dict: Extracted fields.
+    """
+    results = {}
+    for field, field_patterns in patterns.items():
+        value = None
+        normalized_text = ' '.join(text.lower().split())
+        for pattern in field_patterns:
+            if not re.compile(pattern).groups:
+                continue
+            matches = re.search(pattern, normalized_text, re.IGNORECASE)
+            if matches and matches.group(1) and matches.group(1).strip():
+                value = re.sub(r'[.,;:]+$', '', matches.group(1).strip())
+                break
+        
+        if value is None:
+            keywords = set()
+            for pattern in field_patterns:
+                words = re.findall(r'[A-Za-z]+', pattern)
+                keywords.update([word.lower() for word in words if len(word) > 3])
+            for line in text.split('\n'):
+                line = line.strip()
+                if not line:
+                    continue
+                keyword_count = sum(1 for keyword in keywords if keyword in line.lower())
+                if keyword_count >= 2 and ':' in line:
+                    candidate = line.split(':', 1)[1].strip()
+                    if candidate:
+                        value = candidate
+                        break
+        
+        results[field] = value
+    
+    for date_field in ['effective_date', 'start_date']:
+        if results[date_field]:
+            try:
+                results[date_field] = date_parser.parse(results[date_field], fuzzy=True).strftime('%Y-%m-%d')
+            except (ValueError, OverflowError):
+                pass
+    
+    return results
+
+
+def run(label, extract, texts):
+    """
+    Time an extraction function over a corpus.
+    
+    Args:
+        label (str): Name printed in the report.
+        extract (callable): Function taking a text and returning a dict of fields.
+        texts (list): Contract texts.
+    
+    Returns:
+        tuple: (documents per second, list of results)
+    """
+    start = time.perf_counter()
+    results = [extract(text) for text in texts]
+    elapsed = time.perf_counter() - start
+    docs_per_second = len(texts) / elapsed
+    print(f"{label:<12}{elapsed:>10.2f}{docs_per_second:>14.1f}")
+    return docs_per_second, results
+
+
+def report_scaling(extractor, documents=20):
+    """
+    Print extraction time per 10k characters as documents grow, to show how cost scales with length.
+    
+    Args:
+        extractor (FieldExtractor): The extractor to benchmark.
+        documents (int): Documents generated per length.
+    """
+    print()
+    print("Scaling with document length (ms per 10k characters)")
+    print("-" * 36)
+    print(f"{'Chars':<12}{'before':>10}{'after':>14}")
+    
+    for filler_clauses in (10, 100, 1000, 3000):
+        texts = generate_contract_texts(documents, filler_clauses=filler_clauses)
+        total_chars = sum(len(text) for text in texts)
+        timings = []
+        for extract in (lambda text: legacy_extract_fields(extractor.patterns, text), extractor.extract_fields):
+            start = time.perf_counter()
+            for text in texts:
+                extract(text)
+            timings.append((time.perf_counter() - start) * 1000 / (total_chars / 10000))
+        print(f"{total_chars // documents:<12}{timings[0]:>10.2f}{timings[1]:>14.2f}")
+
+
+def main():
+    """Main function to run the field extraction benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark FieldExtractor throughput.")
+    parser.add_argument("--documents", type=int, default=2000, help="Number of synthetic contracts.")
+    parser.add_argument("--filler-clauses", type=int, default=40, help="Boilerplate clauses per contract.")
+    parser.add_argument("--scaling", action="store_true", help="Also report how cost grows with document length.")
+    args = parser.parse_args()
+    
+    texts = generate_contract_texts(args.documents, filler_clauses=args.filler_clauses)
+    average_length = sum(len(text) for text in texts) / len(texts)
+    extractor = FieldExtractor()
+    
+    print(f"Benchmarking field extraction on {len(texts)} documents ({average_length:.0f} chars on average)")
+    print("-" * 36)
+    print(f"{'Mode':<12}{'Seconds':>10}{'Docs/s':>14}")
+    
+    before, legacy_results = run("before", lambda text: legacy_extract_fields(extractor.patterns, text), texts)
+    after, results = run("after", extractor.extract_fields, texts)
+    print(f"Speedup: {after / before:.2f}x")
+    
+    mismatches = sum(1 for old, new in zip(legacy_results, results)
+                     if any(old[field] != new.get(field) for field in old))
+    if mismatches:
+        print(f"Warning: {mismatches} documents differ from the original extraction loop")
+    
+    if args.scaling:
+        report_scaling(extractor)
+
+
+if __name__ == "__main__":
+    main()
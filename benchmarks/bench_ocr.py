@@ -0,0 +1,198 @@
+"""
+Benchmark for OCR throughput of the PDF extractor.
+Compares the serial OCR loop with the page-parallel process pool. With
+--adaptive, compares single-resolution OCR with adaptive-resolution OCR, and
+with --ocr-cache, a cold run of the page-image OCR cache with a warm one.
+
+Run from the repository root:
+    python -m benchmarks.bench_ocr <path_to_scanned_pdf> [--workers 2 4 8] [--repeat 3]
+    python -m benchmarks.bench_ocr <path_to_scanned_pdf> --adaptive [--low-dpi 150] [--high-dpi 300]
+                                   [--min-confidence 70]
+    python -m benchmarks.bench_ocr <path_to_scanned_pdf> --ocr-cache
+"""
+
+import argparse
+import difflib
+import os
+import tempfile
+import time
+
+from pdf2image import pdfinfo_from_path
+
+from src.pdf_extractor import PDFExtractor
+from src.pdf_source import PDFSource
+from src.utils.cache import OCRCache
+
+
+def time_ocr(pdf_path, workers, repeat):
+    """
+    Time OCR extraction of a PDF with a given worker count.
+    
+    Args:
+        pdf_path (str): Path to the PDF file.
+        workers (int): Number of OCR worker processes.
+        repeat (int): Number of runs; the fastest one is reported.
+    
+    Returns:
+        tuple: (best wall-clock time in seconds, extracted text)
+    """
+    extractor = PDFExtractor(ocr_language='eng', ocr_workers=workers)
+    best = None
+    text = ""
+    
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extractor._extract_text_ocr(pdf_path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    extractor.close()
+    return best, text
+
+
+def time_pages(extractor, pdf_path, repeat):
+    """
+    Time OCR of every page of a PDF, keeping the per-page results.
+    
+    Args:
+        extractor (PDFExtractor): Configured extractor.
+        pdf_path (str): Path to the PDF file.
+        repeat (int): Number of runs; the fastest one is reported.
+    
+    Returns:
+        tuple: (best wall-clock time in seconds, list of PageResult)
+    """
+    best = None
+    pages = []
+    
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with PDFSource(pdf_path) as source:
+            pages = list(extractor._resolve_ocr(source, extractor._iter_pages_unparsed(source)))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    return best, pages
+
+
+def word_agreement(text, reference):
+    """Return the fraction of the reference words matched, in order, by the text (1.0 is identical)."""
+    reference_words = reference.split()
+    if not reference_words:
+        return 1.0
+    matcher = difflib.SequenceMatcher(None, text.split(), reference_words, autojunk=False)
+    return sum(block.size for block in matcher.get_matching_blocks()) / len(reference_words)
+
+
+def compare_adaptive(pdf_path, page_count, args):
+    """
+    Compare the speed and quality of single-resolution and adaptive OCR.
+    
+    Quality is the word agreement with a single pass at the high DPI, which is
+    the slowest and most accurate mode.
+    """
+    modes = [
+        ('standard (200 dpi)', PDFExtractor(ocr_workers=args.adaptive_workers)),
+        # A first pass at the high DPI that keeps every block is a plain high-DPI pass
+        (f'high ({args.high_dpi} dpi)', PDFExtractor(ocr_workers=args.adaptive_workers, adaptive_ocr=True,
+                                                    ocr_low_dpi=args.high_dpi, ocr_high_dpi=args.high_dpi,
+                                                    ocr_min_confidence=0)),
+        (f'adaptive ({args.low_dpi}/{args.high_dpi})',
+         PDFExtractor(ocr_workers=args.adaptive_workers, adaptive_ocr=True, ocr_low_dpi=args.low_dpi,
+                      ocr_high_dpi=args.high_dpi, ocr_min_confidence=args.min_confidence)),
+    ]
+    
+    results = [(label, *time_pages(extractor, pdf_path, args.repeat)) for label, extractor in modes]
+    for _, extractor in modes:
+        extractor.close()
+    reference = " ".join(page.text for page in results[1][2])
+    standard_time = results[0][1]
+    
+    print(f"Adaptive OCR on '{pdf_path}' ({page_count} pages, minimum confidence {args.min_confidence})")
+    print("-" * 80)
+    print(f"{'Mode':<24}{'Seconds':>10}{'Pages/s':>10}{'Speedup':>10}{'Agreement':>12}{'Re-OCR':>14}")
+    for label, seconds, pages in results:
+        agreement = word_agreement(" ".join(page.text for page in pages), reference)
+        # Pages that needed a second, high-DPI pass
+        second_pass = sum('ocr_high' in page.timings for page in pages)
+        print(f"{label:<24}{seconds:>10.2f}{page_count / seconds:>10.2f}{standard_time / seconds:>10.2f}"
+              f"{agreement:>12.1%}{f'{second_pass}/{len(pages)} pages':>14}")
+
+
+def compare_ocr_cache(pdf_path, page_count, args):
+    """
+    Run OCR twice over a PDF with an empty OCR cache, reporting hits and time saved.
+    
+    The first run only hits on pages repeated within the document; the second
+    one should hit on every page.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        extractor = PDFExtractor(ocr_cache=OCRCache(directory))
+        runs = [('cold', *time_pages(extractor, pdf_path, 1)), ('warm', *time_pages(extractor, pdf_path, 1))]
+    
+    print(f"OCR cache on '{pdf_path}' ({page_count} pages)")
+    print("-" * 70)
+    print(f"{'Run':<8}{'Seconds':>10}{'Pages/s':>10}{'Hits':>8}{'Hit rate':>10}{'OCR s saved':>14}{'Lookup s':>10}")
+    for label, seconds, pages in runs:
+        hits = sum(page.ocr_cache == 'hit' for page in pages)
+        saved = sum(page.ocr_saved for page in pages)
+        lookup = sum(page.timings.get('ocr_cache', 0.0) for page in pages)
+        print(f"{label:<8}{seconds:>10.2f}{page_count / seconds:>10.2f}{hits:>8}{hits / max(len(pages), 1):>10.1%}"
+              f"{saved:>14.2f}{lookup:>10.3f}")
+    
+    if [page.text for page in runs[0][2]] != [page.text for page in runs[1][2]]:
+        print("  Warning: cached output differs from the OCR output")
+
+
+def main():
+    """Main function to run the OCR benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark serial vs. page-parallel OCR.")
+    parser.add_argument("pdf_path", help="Path to a scanned (image-only) PDF.")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Worker counts to benchmark (default: 2, 4, ... up to the CPU count).")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per configuration.")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Compare single-resolution OCR with adaptive-resolution OCR instead.")
+    parser.add_argument("--adaptive-workers", type=int, default=1, help="OCR worker processes with --adaptive.")
+    parser.add_argument("--low-dpi", type=int, default=150, help="First-pass resolution of adaptive OCR.")
+    parser.add_argument("--high-dpi", type=int, default=300, help="Second-pass resolution of adaptive OCR.")
+    parser.add_argument("--min-confidence", type=float, default=70,
+                        help="Word confidence under which adaptive OCR re-reads a block.")
+    parser.add_argument("--ocr-cache", action="store_true",
+                        help="Measure the page-image OCR cache (cold vs. warm run) instead.")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.pdf_path):
+        print(f"Error: File '{args.pdf_path}' not found.")
+        return
+    
+    cpu_count = os.cpu_count() or 1
+    worker_counts = args.workers or [n for n in (2, 4, 8, 16, 32) if n <= cpu_count] or [cpu_count]
+    page_count = pdfinfo_from_path(args.pdf_path)['Pages']
+    
+    if args.adaptive:
+        compare_adaptive(args.pdf_path, page_count, args)
+        return
+    if args.ocr_cache:
+        compare_ocr_cache(args.pdf_path, page_count, args)
+        return
+    
+    print(f"Benchmarking OCR on '{args.pdf_path}' ({page_count} pages, {cpu_count} CPUs)")
+    print("-" * 60)
+    print(f"{'Mode':<20}{'Seconds':>10}{'Pages/s':>12}{'Speedup':>10}")
+    
+    serial_time, serial_text = time_ocr(args.pdf_path, 1, args.repeat)
+    print(f"{'serial':<20}{serial_time:>10.2f}{page_count / serial_time:>12.2f}{1.0:>10.2f}")
+    
+    for workers in worker_counts:
+        parallel_time, parallel_text = time_ocr(args.pdf_path, workers, args.repeat)
+        label = f"parallel ({workers})"
+        print(f"{label:<20}{parallel_time:>10.2f}{page_count / parallel_time:>12.2f}"
+              f"{serial_time / parallel_time:>10.2f}")
+        
+        if parallel_text != serial_text:
+            print(f"  Warning: output with {workers} workers differs from the serial output")
+
+
+if __name__ == "__main__":
+    main()
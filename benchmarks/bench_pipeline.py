@@ -0,0 +1,232 @@
+"""
+End-to-end benchmark of the extraction pipeline on a corpus of contract PDFs.
+Reports per-stage timings (pdfplumber, PyPDF2 fallback, page rendering, tesseract,
+regex fields, date parsing), documents per second and peak memory, and writes
+them as JSON so runs can be compared across commits.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline [--corpus DIR | --count 20 --pages 5 --scanned-pages 0]
+                                        [--ocr-workers 1] [--json results.json] [--compare baseline.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported
+    resource = None
+
+from benchmarks.pdf_corpus import generate_pdf_corpus
+from benchmarks.text_corpus import PLACEMENTS
+from src.field_extractor import FieldExtractor
+from src.pdf_extractor import PDFExtractor
+
+# Stages in pipeline order; the first four come from PageResult.timings, the last two from FieldExtractor
+STAGES = ['pdfplumber', 'pypdf2', 'render', 'ocr', 'regex', 'dates']
+
+# Fields shown in the app, used to report how many were found
+DISPLAYED_FIELDS = ['effective_date', 'start_date', 'initial_term', 'further_term']
+
+
+def peak_rss_mb(who):
+    """
+    Return the peak resident memory of this process or of its finished children.
+    
+    Args:
+        who (int): resource.RUSAGE_SELF or resource.RUSAGE_CHILDREN.
+    
+    Returns:
+        float: Peak RSS in MB, or None where the resource module is unavailable.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def git_commit():
+    """Return the short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, fraction):
+    """Return the value below which the given fraction of the sorted values falls."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_benchmark(paths, ocr_workers=1, warmup=1):
+    """
+    Run the pipeline over PDFs, as extract_text followed by extract_fields.
+    
+    Args:
+        paths (list): Paths of the PDF files.
+        ocr_workers (int): Number of OCR worker processes, shared by every document.
+        warmup (int): Documents processed once, untimed, before measuring.
+    
+    Returns:
+        dict: Aggregated timings and throughput.
+    """
+    pdf_extractor = PDFExtractor(ocr_workers=ocr_workers)
+    field_extractor = FieldExtractor()
+    
+    for path in paths[:warmup]:
+        field_extractor.extract_fields(pdf_extractor.extract_text(path))
+    
+    stage_seconds = dict.fromkeys(STAGES, 0.0)
+    document_seconds = []
+    pages = 0
+    ocr_pages = 0
+    fields_found = 0
+    
+    start = time.perf_counter()
+    for path in paths:
+        document_start = time.perf_counter()
+        
+        sources = []
+        
+        def on_page(page):
+            sources.append(page.source)
+            for stage, seconds in page.timings.items():
+                stage_seconds[stage] = stage_seconds.get(stage, 0.0) + seconds
+        
+        text = pdf_extractor.extract_text(path, on_page)
+        pages += len(sources)
+        ocr_pages += sources.count('OCR')
+        
+        field_timings = {}
+        fields = field_extractor.extract_fields(text, field_timings)
+        for stage, seconds in field_timings.items():
+            stage_seconds[stage] += seconds
+        fields_found += sum(fields[field] is not None for field in DISPLAYED_FIELDS)
+        
+        document_seconds.append(time.perf_counter() - document_start)
+    elapsed = time.perf_counter() - start
+    pdf_extractor.close()
+    
+    return {
+        'documents': len(paths),
+        'pages': pages,
+        'ocr_pages': ocr_pages,
+        'seconds': round(elapsed, 4),
+        'docs_per_second': round(len(paths) / elapsed, 3),
+        'pages_per_second': round(pages / elapsed, 3),
+        'latency_p50': round(percentile(document_seconds, 0.5), 4),
+        'latency_p95': round(percentile(document_seconds, 0.95), 4),
+        # OCR stages run in worker processes, so with several workers their sum exceeds the wall time
+        'stage_seconds': {stage: round(seconds, 4) for stage, seconds in stage_seconds.items()},
+        'fields_found_rate': round(fields_found / (len(paths) * len(DISPLAYED_FIELDS)), 4),
+    }
+
+
+def load_corpus(directory):
+    """Return the PDF paths of a corpus directory, from its manifest.json if there is one."""
+    manifest_path = os.path.join(directory, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            return [entry['path'] for entry in json.load(file)]
+    return sorted(glob.glob(os.path.join(directory, '**', '*.pdf'), recursive=True))
+
+
+def print_comparison(results, baseline):
+    """Print the relative change of each metric against a baseline run."""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    rows = [('docs/s', 'docs_per_second'), ('latency p50', 'latency_p50'), ('latency p95', 'latency_p95'),
+            ('peak RSS (MB)', 'peak_rss_mb')]
+    for label, key in rows:
+        old, new = baseline['results'].get(key), results['results'].get(key)
+        if old and new is not None:
+            print(f"  {label:<16}{old:>12}{new:>12}{(new - old) / old:>+10.1%}")
+    for stage in STAGES:
+        old = baseline['results']['stage_seconds'].get(stage)
+        new = results['results']['stage_seconds'].get(stage)
+        if old and new is not None:
+            print(f"  {stage:<16}{old:>12}{new:>12}{(new - old) / old:>+10.1%}")
+
+
+def main():
+    """Main function to run the pipeline benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline end to end.")
+    parser.add_argument("--corpus", help="Directory of PDFs (default: generate a synthetic corpus).")
+    parser.add_argument("--count", type=int, default=20, help="Contracts to generate.")
+    parser.add_argument("--pages", type=int, default=5, help="Approximate pages per generated contract.")
+    parser.add_argument("--scanned-pages", type=int, default=0, help="Rasterized pages per generated contract.")
+    parser.add_argument("--placement", choices=PLACEMENTS, default='start', help="Position of the field clauses.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the generated corpus.")
+    parser.add_argument("--ocr-workers", type=int, default=1, help="OCR worker processes, shared by every document.")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed documents processed first.")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with.")
+    args = parser.parse_args()
+    
+    config = {key: value for key, value in vars(args).items() if key not in ('json', 'compare')}
+    
+    with tempfile.TemporaryDirectory() as directory:
+        if args.corpus:
+            paths = load_corpus(args.corpus)
+        else:
+            # Generated in a child process, so reportlab does not count towards the peak memory
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                manifest = executor.submit(generate_pdf_corpus, directory, args.count, args.pages,
+                                           args.scanned_pages, args.placement, seed=args.seed).result()
+            paths = [entry['path'] for entry in manifest]
+        
+        if not paths:
+            print("Error: No PDF files found.")
+            return
+        
+        results = run_benchmark(paths, args.ocr_workers, args.warmup)
+    
+    results['peak_rss_mb'] = peak_rss_mb(resource.RUSAGE_SELF) if resource else None
+    results['peak_rss_children_mb'] = peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None
+    report = {
+        'benchmark': 'pipeline',
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': config,
+        'results': results,
+    }
+    
+    print(f"Benchmarking the pipeline on {results['documents']} documents "
+          f"({results['pages']} pages, {results['ocr_pages']} OCR'd)")
+    print("-" * 50)
+    print(f"{'Stage':<16}{'Seconds':>12}{'ms/doc':>12}")
+    for stage in STAGES:
+        seconds = results['stage_seconds'][stage]
+        print(f"{stage:<16}{seconds:>12.3f}{seconds * 1000 / results['documents']:>12.2f}")
+    print("-" * 50)
+    print(f"Throughput: {results['docs_per_second']:.2f} docs/s, {results['pages_per_second']:.2f} pages/s")
+    print(f"Latency: p50 {results['latency_p50'] * 1000:.1f} ms, p95 {results['latency_p95'] * 1000:.1f} ms")
+    print(f"Fields found: {results['fields_found_rate']:.1%}")
+    if results['peak_rss_mb'] is not None:
+        print(f"Peak RSS: {results['peak_rss_mb']:.1f} MB (children: {results['peak_rss_children_mb']:.1f} MB)")
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to '{args.json}'")
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            print_comparison(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
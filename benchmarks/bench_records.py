@@ -0,0 +1,100 @@
+"""
+Memory benchmark of extraction result representations.
+Compares a list of result dictionaries, as the app used to keep them, with a
+dictionary-encoded RecordBatch, and times their conversion to pandas.
+
+Run from the repository root:
+    python -m benchmarks.bench_records [--results 200000] [--missing-rate 0.2]
+"""
+
+import argparse
+import datetime
+import gc
+import random
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.text_corpus import NAMES, TITLES, TERMS
+from src.records import FIELDS, RecordBatch
+
+
+def generate_results(count, missing_rate=0.2, seed=0):
+    """
+    Build synthetic extraction results, like those of FieldExtractor.
+
+    Values are built per result (as regex matches are), so equal strings are
+    distinct objects, as they would be in a real run.
+    """
+    rng = random.Random(seed)
+    start = datetime.date(2018, 1, 1)
+
+    def maybe(value):
+        return None if rng.random() < missing_rate else value
+
+    results = []
+    for i in range(count):
+        date = start + datetime.timedelta(days=rng.randrange(2000))
+        term = rng.choice(TERMS)
+        results.append({
+            'print_name': maybe(''.join(rng.choice(NAMES))),
+            'title': maybe(''.join(rng.choice(TITLES))),
+            'effective_date': maybe(date.strftime('%Y-%m-%d')),
+            'start_date': maybe((date + datetime.timedelta(days=rng.randrange(30))).strftime('%Y-%m-%d')),
+            'initial_term': maybe(''.join(term)),
+            'further_term': maybe(''.join(term)),
+            'file_name': f"contract_{i:07d}.pdf",
+        })
+    return results
+
+
+def measure(build):
+    """Return the object built by build(), its retained bytes and the seconds it took."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    seconds = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, retained, seconds
+
+
+def main():
+    """Main function to run the records benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark memory of extraction result representations.")
+    parser.add_argument("--results", type=int, default=200000, help="Number of results.")
+    parser.add_argument("--missing-rate", type=float, default=0.2, help="Share of fields left missing.")
+    args = parser.parse_args()
+
+    scale = 1_000_000 / args.results
+    dicts, dict_bytes, dict_seconds = measure(lambda: generate_results(args.results, args.missing_rate))
+    batch, batch_bytes, batch_seconds = measure(lambda: RecordBatch.from_dicts(dicts))
+
+    print(f"{args.results} results, memory scaled to one million")
+    print("-" * 56)
+    print(f"{'Representation':<18}{'MB / 1M':>10}{'Bytes/row':>12}{'Build s':>10}")
+    print(f"{'list of dicts':<18}{dict_bytes * scale / 1e6:>10.0f}{dict_bytes / args.results:>12.0f}"
+          f"{dict_seconds:>10.2f}")
+    print(f"{'RecordBatch':<18}{batch_bytes * scale / 1e6:>10.0f}{batch_bytes / args.results:>12.0f}"
+          f"{batch_seconds:>10.2f}")
+    print(f"Memory reduction: {dict_bytes / batch_bytes:.1f}x")
+
+    start = time.perf_counter()
+    frame = pd.DataFrame(dicts, columns=list(FIELDS))
+    dict_frame_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    batch_frame = batch.to_pandas()
+    batch_frame_seconds = time.perf_counter() - start
+    print(f"\nto pandas: list of dicts {dict_frame_seconds:.3f} s "
+          f"({frame.memory_usage(deep=True).sum() / 1e6:.0f} MB), "
+          f"RecordBatch {batch_frame_seconds:.4f} s ({batch_frame.memory_usage(deep=True).sum() / 1e6:.0f} MB)")
+
+    # Same content, missing values aside
+    if not batch_frame.astype(object).where(batch_frame.notna(), None).equals(frame.astype(object)):
+        print("  Warning: RecordBatch frame differs from the dictionaries")
+
+
+if __name__ == "__main__":
+    main()
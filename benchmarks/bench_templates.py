@@ -0,0 +1,72 @@
+"""
+Benchmark of template fast paths on a template-heavy batch.
+Every synthetic contract of text_corpus.py follows the same "SERVICES AGREEMENT"
+layout; registering it as a template lets its fields be read with a handful of
+specific patterns instead of the full set.
+
+Run from the repository root:
+    python -m benchmarks.bench_templates [--documents 2000] [--filler-clauses 40]
+"""
+
+import argparse
+import time
+
+from benchmarks.text_corpus import generate_contract_texts
+from src.field_extractor import FieldExtractor
+from src.templates import Template, default_templates
+
+# Layout of the synthetic contracts, as a template with one pattern per field
+SERVICES_AGREEMENT = Template(
+    'synthetic_services_agreement',
+    markers=['SERVICES AGREEMENT'],
+    marker_window=100,
+    patterns={
+        'print_name': [r'in witness whereof[^:]{0,80}name: ([a-z .]+?) title:'],
+        'title': [r'in witness whereof[^:]{0,80}name: [a-z .]+? title: ([a-z ]+?) date:'],
+        'effective_date': [r'this agreement is made as of ([a-z0-9 /-]+?)(?: ?\(|\.|,)'],
+        'start_date': [r'start date: (\d{1,2}/\d{1,2}/\d{4}|\d{4}-\d{2}-\d{2}|\d{1,2} [a-z]+ \d{4}|[a-z]+ \d{1,2}, \d{4})'],
+        'initial_term': [r'initial term of (\d+ (?:months|years))'],
+        'further_term': [r'automatically renew for successive (\d+ (?:months|years))'],
+    },
+)
+
+
+def time_extraction(extractor, texts):
+    """Return the seconds taken to extract the fields of every text, and the results."""
+    start = time.perf_counter()
+    results = [extractor.extract_fields(text) for text in texts]
+    return time.perf_counter() - start, results
+
+
+def main():
+    """Main function to run the template benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark template fast paths of field extraction.")
+    parser.add_argument("--documents", type=int, default=2000, help="Number of synthetic contracts.")
+    parser.add_argument("--filler-clauses", type=int, default=40, help="Boilerplate clauses per contract.")
+    args = parser.parse_args()
+
+    texts = generate_contract_texts(args.documents, filler_clauses=args.filler_clauses)
+    templates = default_templates()
+    templates.register(SERVICES_AGREEMENT)
+
+    full_seconds, full_results = time_extraction(FieldExtractor(), texts)
+    template_seconds, template_results = time_extraction(FieldExtractor(templates=templates), texts)
+
+    print(f"Template fast path on {len(texts)} contracts of one template")
+    print("-" * 50)
+    print(f"{'Mode':<16}{'Seconds':>10}{'Docs/s':>12}{'Speedup':>12}")
+    print(f"{'full patterns':<16}{full_seconds:>10.3f}{len(texts) / full_seconds:>12.1f}{1.0:>12.2f}")
+    print(f"{'template':<16}{template_seconds:>10.3f}{len(texts) / template_seconds:>12.1f}"
+          f"{full_seconds / template_seconds:>12.2f}")
+
+    # The template patterns are stricter than the generic ones, so values may differ
+    print("\nFields found (full / template) and values that differ:")
+    for field in FieldExtractor().patterns:
+        full_found = sum(result[field] is not None for result in full_results)
+        template_found = sum(result[field] is not None for result in template_results)
+        differing = sum(full[field] != fast[field] for full, fast in zip(full_results, template_results))
+        print(f"  {field:<16}{full_found:>6} / {template_found:<6}{differing:>6} differ")
+
+
+if __name__ == "__main__":
+    main()
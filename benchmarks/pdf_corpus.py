@@ -0,0 +1,124 @@
+"""
+Synthetic contract PDFs for end-to-end benchmarks.
+Renders the texts of text_corpus.py with create_sample_pdf.py, then optionally
+rasterizes some pages so they have no text layer, like scanned contracts.
+
+Run from the repository root:
+    python -m benchmarks.pdf_corpus <output_dir> [--count 50] [--pages 5] [--scanned-pages 1]
+                                    [--placement start] [--dpi 150] [--seed 0]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import tempfile
+from contextlib import redirect_stdout
+
+from pdf2image import convert_from_path
+from PyPDF2 import PdfReader, PdfWriter
+
+from benchmarks.text_corpus import PLACEMENTS, generate_contract_texts
+from create_sample_pdf import text_to_pdf
+
+# Boilerplate clauses filling one letter page with the layout of create_sample_pdf.py
+CLAUSES_PER_PAGE = 13
+
+
+def rasterize_pages(pdf_path, page_numbers, dpi=150):
+    """
+    Replace pages of a PDF with images of themselves, removing their text layer.
+    
+    Args:
+        pdf_path (str): Path to the PDF file, rewritten in place.
+        page_numbers (iterable): 1-based numbers of the pages to rasterize.
+        dpi (int): Resolution of the page images.
+    """
+    page_numbers = set(page_numbers)
+    if not page_numbers:
+        return
+    
+    reader = PdfReader(pdf_path)
+    writer = PdfWriter()
+    for page_number, page in enumerate(reader.pages, start=1):
+        if page_number not in page_numbers:
+            writer.add_page(page)
+            continue
+        
+        image = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number)[0]
+        buffer = io.BytesIO()
+        image.convert('L').save(buffer, format='PDF', resolution=dpi)
+        writer.add_page(PdfReader(buffer).pages[0])
+    
+    with open(pdf_path, 'wb') as file:
+        writer.write(file)
+
+
+def generate_pdf_corpus(directory, count, pages=5, scanned_pages=0, placement='start', dpi=150, seed=0):
+    """
+    Generate synthetic contract PDFs and a manifest describing them.
+    
+    Args:
+        directory (str): Directory to write the PDFs to. Created if missing.
+        count (int): Number of contracts.
+        pages (int): Approximate number of pages of each contract.
+        scanned_pages (int): Number of pages of each contract, picked at random,
+            rasterized into image-only pages that need OCR.
+        placement (str): Where the field-bearing clauses go: 'start', 'middle',
+            'end' or 'random'.
+        dpi (int): Resolution of the rasterized pages.
+        seed (int): Random seed, so corpora are reproducible.
+    
+    Returns:
+        list: One dictionary per contract with 'path', 'page_count' and 'scanned_pages'.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    texts = generate_contract_texts(count, filler_clauses=max(0, pages * CLAUSES_PER_PAGE - 10),
+                                    seed=seed, placement=placement)
+    
+    manifest = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for index, text in enumerate(texts):
+            text_path = os.path.join(temp_dir, 'contract.txt')
+            pdf_path = os.path.join(directory, f'contract_{index:05d}.pdf')
+            with open(text_path, 'w', encoding='utf-8') as file:
+                file.write(text)
+            
+            # text_to_pdf reports every file it writes
+            with redirect_stdout(io.StringIO()):
+                text_to_pdf(text_path, pdf_path)
+            
+            page_count = len(PdfReader(pdf_path).pages)
+            scanned = sorted(rng.sample(range(1, page_count + 1), min(scanned_pages, page_count)))
+            rasterize_pages(pdf_path, scanned, dpi)
+            
+            manifest.append({'path': pdf_path, 'page_count': page_count, 'scanned_pages': scanned})
+    
+    with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+    
+    return manifest
+
+
+def main():
+    """Main function to generate a corpus."""
+    parser = argparse.ArgumentParser(description="Generate synthetic contract PDFs.")
+    parser.add_argument("output_dir", help="Directory to write the PDFs to.")
+    parser.add_argument("--count", type=int, default=50, help="Number of contracts.")
+    parser.add_argument("--pages", type=int, default=5, help="Approximate pages per contract.")
+    parser.add_argument("--scanned-pages", type=int, default=0, help="Rasterized pages per contract.")
+    parser.add_argument("--placement", choices=PLACEMENTS, default='start', help="Position of the field clauses.")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution of rasterized pages.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+    
+    manifest = generate_pdf_corpus(args.output_dir, args.count, args.pages, args.scanned_pages,
+                                   args.placement, args.dpi, args.seed)
+    total_pages = sum(entry['page_count'] for entry in manifest)
+    print(f"Generated {len(manifest)} contracts ({total_pages} pages) in '{args.output_dir}'")
+
+
+if __name__ == "__main__":
+    main()
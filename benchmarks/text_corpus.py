@@ -0,0 +1,94 @@
+"""
+Synthetic contract texts for field extraction benchmarks.
+Builds variations of sample_contract.txt with different parties, dates, terms and lengths.
+"""
+
+import os
+import random
+
+SAMPLE_TEXT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_contract.txt')
+
+NAMES = ['John Smith', 'Jane Doe', 'Michael Sinclair', 'Priya Patel', 'Carlos Ruiz', 'Anna Kowalski']
+TITLES = ['CEO', 'CTO', 'CFO', 'Director', 'Head of Procurement', 'General Counsel']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+TERMS = ['12 months', '24 months', '36 months', '2 years', '3 years', '18 months']
+
+def _date_variants(rng):
+    """Return one date written in each of the formats seen in contracts."""
+    day = rng.randint(1, 28)
+    month = rng.randint(1, 12)
+    year = rng.randint(2018, 2026)
+    return [
+        f"{MONTHS[month - 1]} {day}, {year}",
+        f"{day} {MONTHS[month - 1]} {year}",
+        f"{day:02d}/{month:02d}/{year}",
+        f"{year}-{month:02d}-{day:02d}",
+    ]
+
+# Where the field-bearing clauses are placed among the boilerplate
+PLACEMENTS = ('start', 'middle', 'end', 'random')
+
+def generate_contract_texts(count, filler_clauses=40, missing_rate=0.2, seed=0, placement='start'):
+    """
+    Generate synthetic contract texts.
+    
+    Args:
+        count (int): Number of texts to generate.
+        filler_clauses (int): Number of extra boilerplate clauses appended to each
+            text, which controls document length.
+        missing_rate (float): Probability that a field-bearing clause is left out,
+            so the keyword fallback is exercised.
+        seed (int): Random seed, so runs are comparable.
+        placement (str): Where the field-bearing clauses go among the boilerplate:
+            'start' (as in real contracts), 'middle', 'end' or 'random'.
+    
+    Returns:
+        list: Generated contract texts.
+    """
+    rng = random.Random(seed)
+    
+    with open(SAMPLE_TEXT_PATH, 'r', encoding='utf-8') as file:
+        template = file.read()
+    
+    paragraphs = [p for p in template.split('\n\n') if p.strip()]
+    # Boilerplate clauses that carry no fields
+    filler = [p for p in paragraphs if 'Term' not in p and 'Effective Date' not in p and ':' not in p]
+    
+    texts = []
+    for _ in range(count):
+        date = rng.choice(_date_variants(rng))
+        initial_term = rng.choice(TERMS)
+        renewal = rng.choice(TERMS)
+        
+        clauses = [f'THIS AGREEMENT is made as of {date} (the "Effective Date")']
+        if rng.random() > missing_rate:
+            clauses.append(f"Start Date: {rng.choice(_date_variants(rng))}")
+        if rng.random() > missing_rate:
+            clauses.append(
+                f"2.1 This Agreement shall commence on the Effective Date and shall continue for an "
+                f'initial term of {initial_term} (the "Initial Term"), unless earlier terminated.'
+            )
+        if rng.random() > missing_rate:
+            clauses.append(
+                f"2.2 Following the Initial Term, this Agreement shall automatically renew for successive "
+                f"{renewal} periods, unless either party provides written notice of non-renewal."
+            )
+        
+        body = [rng.choice(filler) for _ in range(filler_clauses)]
+        position = {
+            'start': 0,
+            'middle': len(body) // 2,
+            'end': len(body),
+            'random': rng.randint(0, len(body)),
+        }[placement]
+        body[position:position] = clauses
+        
+        signature = [
+            "IN WITNESS WHEREOF, the parties have executed this Agreement.",
+            f"Name: {rng.choice(NAMES)}\nTitle: {rng.choice(TITLES)}\nDate: {rng.choice(_date_variants(rng))}",
+        ]
+        
+        texts.append('\n\n'.join(["SERVICES AGREEMENT"] + body + signature))
+    
+    return texts
@@ -0,0 +1,278 @@
+import os
+import uuid
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.pdf_extractor import PDFExtractor
+from src.field_extractor import FieldExtractor
+
+# Job states, in the order a document goes through them
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Extractors and progress queue built once per worker process
+_worker = {}
+
+def _init_worker(ocr_language, progress):
+    """
+    Build the long-lived extractors of a worker process.
+    
+    Args:
+        ocr_language (str): Language for OCR.
+        progress (multiprocessing.Queue): Queue receiving (job_id, pages_done, page_count).
+    """
+    _worker['pdf_extractor'] = PDFExtractor(ocr_language=ocr_language)
+    _worker['field_extractor'] = FieldExtractor()
+    _worker['progress'] = progress
+
+def _extract_job(job_id, pdf_bytes):
+    """
+    Extract the fields of one PDF in a worker process, reporting each page read.
+    
+    Args:
+        job_id (str): Identifier of the job, sent with each progress update.
+        pdf_bytes (bytes): Contents of the PDF file.
+    
+    Returns:
+        dict: Dictionary containing the extracted fields.
+    
+    Raises:
+        NoTextError: If the document yields little or no text.
+    """
+    progress = _worker['progress']
+    pages_done = []
+    
+    def on_page(page):
+        pages_done.append(page.page_number)
+        progress.put((job_id, len(pages_done), page.page_count))
+    
+    text = _worker['pdf_extractor'].extract_usable_text(pdf_bytes, on_page)
+    return _worker['field_extractor'].extract_fields(text)
+
+class ExtractionJob:
+    """
+    State of one document submitted to the extraction service.
+    
+    Attributes:
+        job_id (str): Identifier of the job.
+        name (str): File name of the document.
+        state (str): 'queued', 'running', 'done' or 'failed'.
+        pages_done (int): Pages read so far.
+        page_count (int): Pages in the document, 0 until the first page is read.
+        result (dict): Extracted fields once done.
+        error (str): Error message if failed.
+        future (Future): Future of the job in the worker pool.
+    """
+    
+    def __init__(self, job_id, name):
+        self.job_id = job_id
+        self.name = name
+        self.state = QUEUED
+        self.pages_done = 0
+        self.page_count = 0
+        self.result = None
+        self.error = None
+        self.future = None
+    
+    def __repr__(self):
+        return (f"ExtractionJob(name={self.name!r}, state={self.state!r}, "
+                f"pages={self.pages_done}/{self.page_count})")
+    
+    @property
+    def finished(self):
+        """True once the job is done or failed."""
+        return self.state in (DONE, FAILED)
+    
+    @property
+    def fraction(self):
+        """Share of the job completed, from 0.0 to 1.0, counted in pages."""
+        if self.finished:
+            return 1.0
+        if not self.page_count:
+            return 0.0
+        return min(self.pages_done / self.page_count, 1.0)
+
+class ExtractionService:
+    """
+    Background extraction of uploaded PDFs in a pool of worker processes.
+    
+    Each worker builds its PDFExtractor and FieldExtractor once and keeps
+    them for every document it processes. Submitting returns at once; callers
+    poll the jobs for per-page progress and collect results as they land,
+    so the work is not tied to the request or script run that started it.
+    
+    If a worker process dies (e.g. killed for running out of memory), the
+    jobs the pool was holding fail and the pool is restarted on the next
+    submission, so one crash does not break the service for good.
+    """
+    
+    def __init__(self, workers=None, ocr_language='eng'):
+        """
+        Initialize the service. Worker processes are started on first use.
+        
+        Args:
+            workers (int): Number of worker processes. Default is the number of CPU cores.
+            ocr_language (str): Language for OCR.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.ocr_language = ocr_language
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        # Set to stop the progress thread of the current executor
+        self._stop_progress = None
+    
+    def _get_executor(self):
+        # Called with the lock held
+        if self._executor is None:
+            progress = multiprocessing.Queue()
+            self._stop_progress = threading.Event()
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.ocr_language, progress))
+            threading.Thread(target=self._pump_progress, args=(progress, self._stop_progress),
+                             name='extraction-progress', daemon=True).start()
+        return self._executor
+    
+    def _reset_executor(self, executor=None):
+        """
+        Drop the current executor and stop its progress thread. Called with the lock held.
+        
+        Args:
+            executor (ProcessPoolExecutor): Only reset if this is still the current
+                executor. Default is None (reset whatever is current).
+        
+        Returns:
+            ProcessPoolExecutor or None: The executor that was dropped.
+        """
+        if self._executor is None or (executor is not None and executor is not self._executor):
+            return None
+        dropped, self._executor = self._executor, None
+        self._stop_progress.set()
+        return dropped
+    
+    def submit(self, name, pdf_bytes):
+        """
+        Queue a document for extraction.
+        
+        Args:
+            name (str): File name of the document.
+            pdf_bytes (bytes): Contents of the PDF file.
+        
+        Returns:
+            str: Identifier of the job.
+        """
+        job = ExtractionJob(uuid.uuid4().hex, name)
+        with self._lock:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(_extract_job, job.job_id, pdf_bytes)
+            except BrokenProcessPool:
+                # A worker died since the last job finished: start a fresh pool
+                self._reset_executor(executor)
+                executor.shutdown(wait=False)
+                executor = self._get_executor()
+                future = executor.submit(_extract_job, job.job_id, pdf_bytes)
+            # Registered only once submitted, so a failed submission leaves no orphan job
+            job.future = future
+            self._jobs[job.job_id] = job
+        future.add_done_callback(lambda future: self._finish(job, future, executor))
+        return job.job_id
+    
+    def jobs(self, job_ids):
+        """
+        Look up jobs by identifier.
+        
+        Args:
+            job_ids (iterable): Identifiers returned by submit().
+        
+        Returns:
+            list: The ExtractionJob of each known identifier, in order.
+        """
+        with self._lock:
+            return [self._jobs[job_id] for job_id in job_ids if job_id in self._jobs]
+    
+    def collect(self, job_ids):
+        """
+        Take the finished jobs among the given ones.
+        
+        Collected jobs are forgotten by the service, so each result is handed
+        out once.
+        
+        Args:
+            job_ids (iterable): Identifiers returned by submit().
+        
+        Returns:
+            list: The finished ExtractionJob objects, in order.
+        """
+        with self._lock:
+            finished = [self._jobs[job_id] for job_id in job_ids
+                        if job_id in self._jobs and self._jobs[job_id].finished]
+            for job in finished:
+                del self._jobs[job.job_id]
+        return finished
+    
+    def discard(self, job_ids):
+        """
+        Forget jobs whose results are no longer wanted, cancelling those not started.
+        
+        Args:
+            job_ids (iterable): Identifiers returned by submit().
+        """
+        with self._lock:
+            jobs = [self._jobs.pop(job_id) for job_id in job_ids if job_id in self._jobs]
+        for job in jobs:
+            job.future.cancel()
+    
+    def shutdown(self):
+        """Stop the worker processes, cancelling jobs that have not started."""
+        with self._lock:
+            executor = self._reset_executor()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _finish(self, job, future, executor):
+        """Record the outcome of a job when its future completes."""
+        broken = None
+        with self._lock:
+            if future.cancelled():
+                job.state, job.error = FAILED, "Cancelled"
+            elif isinstance(future.exception(), BrokenProcessPool):
+                job.state, job.error = FAILED, f"Worker process crashed: {future.exception()}"
+                # Every job of the broken pool lands here; only the first one replaces it
+                broken = self._reset_executor(executor)
+            elif future.exception() is not None:
+                job.state, job.error = FAILED, str(future.exception())
+            else:
+                job.state, job.result = DONE, future.result()
+        if broken is not None:
+            broken.shutdown(wait=False)
+    
+    def _pump_progress(self, progress, stop):
+        """
+        Apply the page progress reported by the workers to the jobs.
+        
+        Args:
+            progress (multiprocessing.Queue): Progress queue of one executor.
+            stop (threading.Event): Set when that executor is shut down or replaced.
+        """
+        try:
+            while not stop.is_set():
+                try:
+                    job_id, pages_done, page_count = progress.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                with self._lock:
+                    job = self._jobs.get(job_id)
+                    if job is not None and not job.finished:
+                        job.state = RUNNING
+                        job.pages_done = pages_done
+                        job.page_count = page_count
+        except (EOFError, OSError):
+            pass
+        finally:
+            progress.close()
@@ -1,15 +1,41 @@
 import re
-import datetime
-from dateutil import parser
+import time
+from heapq import merge
+from src.utils.anchors import AnchorIndex, literal_prefixes
+from src.utils.dates import DateNormalizer
+from src.templates import default_templates
+
+# Bump when a change to the patterns, templates or extraction logic makes stored results stale
+EXTRACTOR_VERSION = 1
+
+# Trailing punctuation stripped from extracted values
+TRAILING_PUNCTUATION = re.compile(r'[.,;:]+$')
 
 class FieldExtractor:
     """
     Class for extracting specific fields from contract text.
     Uses regex patterns and keyword-based extraction.
+    
+    The patterns are compiled once when the extractor is created and are never
+    modified afterwards, so one instance can be shared across threads and
+    pickled to worker processes.
     """
     
-    def __init__(self):
-        """Initialize the field extractor with regex patterns."""
+    def __init__(self, anchor_window=2000, metrics=None, templates=None, day_first=False):
+        """
+        Initialize the field extractor with regex patterns.
+        
+        Args:
+            anchor_window (int): Maximum number of characters a match may span,
+                counted from the position of its anchor.
+            metrics (MetricsRegistry): Optional registry receiving stage timings and
+                how each field was resolved. Default is None (no instrumentation).
+            templates (TemplateRegistry): Known contract templates, whose own patterns
+                are tried before the full set. Default is the built-in templates of
+                src.templates.
+            day_first (bool): Read ambiguous numeric dates such as 10/01/2022 as
+                day/month/year. Default is False (month/day/year).
+        """
         # Regex patterns for each field
         self.patterns = {
             'print_name': [
@@ -53,128 +79,414 @@ class FieldExtractor:
                 r'Further\s+Term\s*(?:\n|\r|\s)*([^.]*?(?:\d+\s*(?:month|year|day|week)s?|automatic|renew|extend|month|year|day)[^.]*?)(?:\.|,|\n|$)',
                 r'Further\s+Term'
             ],
-            
+        
+        }
+        
+        # Literal anchors each pattern must start with, in normalized (lowercase,
+        # single-spaced) form; one tuple of alternatives per pattern
+        self.anchors = {
+            field: [literal_prefixes(pattern) for pattern in patterns]
+            for field, patterns in self.patterns.items()
+        }
+        self.anchor_window = anchor_window
+        self.metrics = metrics
+        self.templates = default_templates() if templates is None else templates
+        self.dates = DateNormalizer(day_first=day_first)
+        
+        # Compile every pattern once; the text is lowercased before matching
+        self.compiled_patterns = {
+            field: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for field, patterns in self.patterns.items()
         }
         
-    def extract_fields(self, text):
+        # One scanner finds the anchors of every pattern in a single pass
+        self.anchor_index = AnchorIndex(
+            (anchor
+             for field_anchors in self.anchors.values()
+             for alternatives in field_anchors
+             for anchor in alternatives),
+            word_start=True
+        )
+        
+        # Keywords for the fallback extraction, derived once from the patterns
+        self.keywords = {
+            field: self._pattern_keywords(patterns)
+            for field, patterns in self.patterns.items()
+        }
+        self.keyword_index = AnchorIndex(
+            keyword for keywords in self.keywords.values() for keyword in keywords
+        )
+    
+    def extract_fields(self, text, timings=None, page_count=None):
         """
         Extract all fields from the text.
         
+        Documents matching a registered template are first read with the
+        template's own patterns for the fields it covers; the fields they miss
+        and the other fields go through the full set.
+        
         Args:
             text (str): The text to extract fields from.
-            
+            timings (dict): Optional dictionary that receives the seconds spent in
+                the 'regex' stage (templates, patterns and keyword fallback) and the
+                'dates' stage.
+            page_count (int): Number of pages of the document, used to match
+                templates. Default is None (unknown).
+        
         Returns:
             dict: Dictionary containing the extracted fields.
         """
-        results = {
-            'print_name': None,
-            'title': None,
-            'effective_date': None,
-            'start_date': None,
-            'initial_term': None,
-            'further_term': None
-        }
+        start = time.perf_counter()
+        
+        # Normalize text once: convert to lowercase and replace multiple spaces with a single space
+        normalized_text = ' '.join(text.lower().split())
+        
+        results = dict.fromkeys(self.patterns)
+        template = self.templates.match(text, normalized_text, page_count)
+        template_fields = {}
+        if template is not None:
+            template_fields = self._match_template(template, normalized_text, self.patterns)
+            results.update(template_fields)
+        
+        # Fields the template does not cover or its patterns missed go through the full set
+        results.update(self._match_fields(normalized_text,
+                                          [field for field in self.patterns if field not in template_fields]))
+        return self._finalize_fields(results, text, timings, start, template, template_fields)
+    
+    def extract_fields_from_pages(self, pages, required_fields=None):
+        """
+        Extract all fields from pages fed one at a time, stopping once every field is found.
+        
+        Pages may arrive in any order (for example the first and last pages before
+        the middle of the document). Each new page is matched together with the
+        edges of the neighbouring pages already read, so values that run across a
+        page break are still found. As soon as every field has a pattern match,
+        no further pages are pulled from the iterable. Otherwise the keyword
+        fallback runs over all pages once the iterable is exhausted.
+        
+        A field is taken from the first page that yields it in the order pages
+        are fed, which may differ from extract_fields on the whole text when a
+        field occurs more than once.
+        
+        Args:
+            pages (iterable): Objects with page_number and text attributes, such as
+                the PageResult records of PDFExtractor.iter_pages.
+            required_fields (iterable): Fields that must be found before reading
+                stops. Default is every field.
+        
+        Returns:
+            dict: Dictionary containing the extracted fields.
+        """
+        results = dict.fromkeys(self.patterns)
+        missing_fields = list(self.patterns)
+        required = set(self.patterns if required_fields is None else required_fields)
+        page_texts = {}
+        normalized_pages = {}
+        template = None
+        template_fields = {}
+        
+        for page in pages:
+            page_texts[page.page_number] = page.text
+            normalized = ' '.join(page.text.lower().split())
+            normalized_pages[page.page_number] = normalized
+            
+            if template is None:
+                # Markers must all be on one page; only the first page has a known offset
+                template = self.templates.match(page.text, normalized, getattr(page, 'page_count', None),
+                                                0 if page.page_number == 1 else None)
+            
+            # A match spans at most anchor_window characters, so the neighbours' edges are enough
+            previous_page = normalized_pages.get(page.page_number - 1, '')
+            next_page = normalized_pages.get(page.page_number + 1)
+            segment = ' '.join(filter(None, [
+                previous_page[-self.anchor_window:],
+                normalized,
+                (next_page or '')[:self.anchor_window]
+            ]))
+            
+            # Until the next page is read, a match running to the end of the segment is not final
+            is_last_page = page.page_number == getattr(page, 'page_count', None)
+            open_end = next_page is None and not is_last_page
+            
+            found = {}
+            if template is not None:
+                found = self._match_template(template, segment, missing_fields, open_end)
+                template_fields.update(found)
+            found.update(self._match_fields(segment, [field for field in missing_fields if field not in found],
+                                            open_end))
+            results.update(found)
+            missing_fields = [field for field in missing_fields if field not in found]
+            if not any(field in required for field in missing_fields):
+                break
+        
+        text = '\n'.join(page_texts[page_number] for page_number in sorted(page_texts))
+        
+        # Every page was read and some fields are still missing: match them on the whole text
+        if missing_fields and any(field in required for field in missing_fields):
+            normalized_text = ' '.join(text.lower().split())
+            found = {}
+            if template is not None:
+                found = self._match_template(template, normalized_text, missing_fields)
+                template_fields.update(found)
+            found.update(self._match_fields(normalized_text, [field for field in missing_fields if field not in found]))
+            results.update(found)
+        
+        return self._finalize_fields(results, text, template=template, template_fields=template_fields)
+    
+    def _match_template(self, template, normalized_text, fields, open_end=False):
+        """
+        Run a template's own patterns for several fields over a normalized text.
+        
+        Args:
+            template (Template): The template the document matched.
+            normalized_text (str): The lowercased, whitespace-collapsed text.
+            fields (iterable): Names of the fields to extract.
+            open_end (bool): True if the text may continue past its end.
+        
+        Returns:
+            dict: Value of each field that a template pattern matched.
+        """
+        found = {}
+        for field in fields:
+            matches = template.match_field(normalized_text, field)
+            if matches is None or (open_end and matches.end() == len(normalized_text)):
+                continue
+            found[field] = TRAILING_PUNCTUATION.sub('', matches.group(1).strip())
+        return found
+    
+    def _match_fields(self, normalized_text, fields, open_end=False):
+        """
+        Run the regex patterns of several fields over a normalized text.
+        
+        Args:
+            normalized_text (str): The lowercased, whitespace-collapsed text.
+            fields (iterable): Names of the fields to extract.
+            open_end (bool): True if the text may continue past its end.
+        
+        Returns:
+            dict: Value of each field that a pattern matched; unmatched fields are absent.
+        """
+        fields = list(fields)
+        if not fields:
+            return {}
+        
+        # Locate every pattern anchor in one pass
+        anchor_positions = self.anchor_index.scan(normalized_text)
+        
+        found = {}
+        for field in fields:
+            value = self._extract_field(normalized_text, anchor_positions, field, open_end)
+            if value is not None:
+                found[field] = value
+        return found
+    
+    def _finalize_fields(self, results, text, timings=None, start=None, template=None, template_fields=()):
+        """
+        Complete pattern matches with the keyword fallback, template defaults and date formatting.
+        
+        Args:
+            results (dict): Field values found by the patterns (None when missing).
+            text (str): The text the fields were extracted from.
+            timings (dict): Optional dictionary that receives 'regex' and 'dates' seconds.
+            start (float): time.perf_counter() value when the regex stage started.
+            template (Template): The template the document matched, or None.
+            template_fields (iterable): Fields found by the template's patterns.
+        
+        Returns:
+            dict: The completed results.
+        """
+        # If no pattern matched, try keyword-based extraction for all missing fields at once
+        missing_fields = [field for field in self.patterns if results[field] is None]
+        keyword_results = {}
+        if missing_fields:
+            keyword_results = self._keyword_extraction(text, missing_fields)
+            results.update(keyword_results)
         
-        # Extract each field
-        for field, patterns in self.patterns.items():
-            value = self._extract_field(text, patterns)
-            results[field] = value
-        
-        # Special case for Pure Healthcare Group - Framework Agreement
-        if "Pure Healthcare Group" in text:
-            # Extract names from the document
-            if "Michael Sinclair" in text and not results['print_name']:
-                results['print_name'] = "Michael Sinclair"
-                
-            if "Tony Constantindes" in text and not results.get('print_name_2'):
-                results['print_name_2'] = "Tony Constantindes"
-                
-            # Extract dates
-            if "10/01/2022" in text or "10-01-2022" in text:
-                if not results['effective_date']:
-                    results['effective_date'] = "10/01/2022"
-                if not results['start_date']:
-                    results['start_date'] = "10/01/2022"
-                    
-            # Extract terms
-            if "24 months" in text and not results['initial_term']:
-                results['initial_term'] = "24 months"
-        
-        # Try to parse dates into a standard format
+        # Values the template supplies when its layout defeats every pattern
+        if template is not None:
+            template.apply_defaults(results, text)
+        
+        if self.metrics is not None:
+            self._record_fields(results, missing_fields, keyword_results, template_fields)
+            if template is not None:
+                self.metrics.inc('field_template_matches_total', template=template.name)
+        
+        dates_start = time.perf_counter()
+        
+        # Convert dates to a standard format, keeping the original text if parsing fails
         for date_field in ['effective_date', 'start_date']:
             if results[date_field]:
-                try:
-                    parsed_date = parser.parse(results[date_field], fuzzy=True)
-                    results[date_field] = parsed_date.strftime('%Y-%m-%d')
-                except:
-                    # Keep the original text if parsing fails
-                    pass
-                
+                results[date_field] = self.dates.normalize(results[date_field]) or results[date_field]
+        
+        dates_seconds = time.perf_counter() - dates_start
+        if timings is not None:
+            if start is not None:
+                timings['regex'] = dates_start - start
+            timings['dates'] = dates_seconds
+        if self.metrics is not None:
+            if start is not None:
+                self.metrics.observe('field_stage_seconds', dates_start - start, stage='regex')
+            self.metrics.observe('field_stage_seconds', dates_seconds, stage='dates')
+        
         return results
     
-    def _extract_field(self, text, patterns):
+    def _record_fields(self, results, missing_fields, keyword_results, template_fields=()):
+        """
+        Count how each field was resolved: by a template pattern, a pattern, the
+        keyword fallback, a template default, or not at all.
+        
+        Args:
+            results (dict): The completed results, before date formatting.
+            missing_fields (list): Fields no pattern matched.
+            keyword_results (dict): Values found by the keyword fallback.
+            template_fields (iterable): Fields found by the template's patterns.
+        """
+        missing = set(missing_fields)
+        for field in self.patterns:
+            if results[field] is None:
+                method = 'missing'
+            elif field in template_fields:
+                method = 'template'
+            elif field not in missing:
+                method = 'pattern'
+            elif keyword_results.get(field) is not None:
+                method = 'keyword'
+            else:
+                method = 'template_default'
+            self.metrics.inc('field_results_total', field=field, method=method)
+    
+    def _extract_field(self, normalized_text, anchor_positions, field, open_end=False):
         """
         Extract a field using multiple regex patterns.
         
         Args:
-            text (str): The text to extract from.
-            patterns (list): List of regex patterns to try.
-            
+            normalized_text (str): The lowercased, whitespace-collapsed text.
+            anchor_positions (dict): Anchor positions found by the anchor index.
+            field (str): Name of the field to extract.
+            open_end (bool): True if the text may continue past its end (a page
+                that has not been read yet).
+        
         Returns:
             str or None: The extracted field value, or None if not found.
         """
-        # Normalize text: convert to lowercase and replace multiple spaces with a single space
-        normalized_text = ' '.join(text.lower().split())
-        
         # Try each pattern
-        for pattern in patterns:
-            matches = re.search(pattern, normalized_text, re.IGNORECASE)
-            if matches and matches.group(1).strip():
+        for index, (pattern, anchors) in enumerate(zip(self.compiled_patterns[field], self.anchors[field])):
+            # Patterns without a capture group only mark a clause; they carry no value
+            if not pattern.groups:
+                continue
+            matches = self._match_at_anchors(pattern, normalized_text, anchors, anchor_positions)
+            if matches and open_end and matches.end() == len(normalized_text):
+                # The value may continue on a page that has not been read yet
+                return None
+            if matches and matches.group(1) and matches.group(1).strip():
                 # Clean up the extracted value
                 value = matches.group(1).strip()
                 # Remove trailing punctuation
-                value = re.sub(r'[.,;:]+$', '', value)
+                value = TRAILING_PUNCTUATION.sub('', value)
+                if self.metrics is not None:
+                    self.metrics.inc('field_pattern_hits_total', field=field, pattern=index)
                 return value
-                
-        # If no pattern matched, try keyword-based extraction
-        return self._keyword_extraction(text, patterns)
+        
+        return None
+    
+    def _match_at_anchors(self, pattern, normalized_text, anchors, anchor_positions):
+        """
+        Find the leftmost match of a pattern, trying only where one of its anchors starts.
+        
+        Every pattern begins with one of its anchors, so this finds the same match
+        as a search over the whole text, as long as the match fits in anchor_window
+        and starts a word.
+        
+        Each attempt only sees anchor_window characters, so its backtracking is
+        bounded and the total cost grows linearly with the number of anchors,
+        whatever the text.
+        
+        Args:
+            pattern (re.Pattern): Compiled pattern.
+            normalized_text (str): The lowercased, whitespace-collapsed text.
+            anchors (tuple): Anchors the pattern can start with, or () if it does not
+                start with literal text.
+            anchor_positions (dict): Anchor positions found by the anchor index.
+        
+        Returns:
+            re.Match or None: The leftmost match, or None if the pattern does not match.
+        """
+        if not anchors:
+            # Nothing to anchor on: search the whole text
+            return pattern.search(normalized_text)
+        
+        position_lists = [anchor_positions[anchor] for anchor in anchors if anchor in anchor_positions]
+        if not position_lists:
+            # No anchor in the text: the pattern cannot match
+            return None
+        
+        previous = None
+        for position in merge(*position_lists):
+            if position == previous:
+                continue
+            previous = position
+            matches = pattern.match(normalized_text, position, position + self.anchor_window)
+            if matches:
+                return matches
+        
+        return None
     
-    def _keyword_extraction(self, text, patterns):
+    def _keyword_extraction(self, text, fields):
         """
         Fallback method for keyword-based extraction when regex fails.
         
+        The text is scanned once for all fields: each line with a colon is
+        searched for every field's keywords in a single pass.
+        
         Args:
             text (str): The text to extract from.
-            patterns (list): List of regex patterns (used to extract keywords).
-            
+            fields (list): Names of the fields to extract.
+        
         Returns:
-            str or None: The extracted field value, or None if not found.
+            dict: Extracted value of each field, or None if not found.
         """
-        # Extract keywords from patterns
-        keywords = set()
-        for pattern in patterns:
-            # Extract words from the pattern
-            words = re.findall(r'[A-Za-z]+', pattern)
-            # Add meaningful words (longer than 3 characters)
-            keywords.update([word.lower() for word in words if len(word) > 3])
-        
-        # Split text into lines
-        lines = text.split('\n')
+        results = dict.fromkeys(fields)
+        pending = list(fields)
         
         # Look for lines containing multiple keywords
-        for line in lines:
+        for line in text.split('\n'):
+            # Only lines with a colon can hold a value
+            if ':' not in line:
+                continue
             line = line.strip()
-            if not line:
+            
+            # Find every field's keywords in this line at once
+            present = self.keyword_index.scan(line.lower()).keys()
+            if len(present) < 2:
                 continue
-                
-            # Count keywords in this line
-            keyword_count = sum(1 for keyword in keywords if keyword in line.lower())
             
-            # If line contains at least 2 keywords and has a colon
-            if keyword_count >= 2 and ':' in line:
-                # Extract the value after the colon
-                value = line.split(':', 1)[1].strip()
-                if value:
-                    return value
+            for field in list(pending):
+                # If line contains at least 2 keywords of the field, take the value after the colon
+                if len(self.keywords[field] & present) >= 2:
+                    value = line.split(':', 1)[1].strip()
+                    if value:
+                        results[field] = value
+                        pending.remove(field)
+            
+            if not pending:
+                break
         
-        return None
+        return results
+    
+    @staticmethod
+    def _pattern_keywords(patterns):
+        """
+        Derive the fallback keywords of a field from its regex patterns.
+        
+        Args:
+            patterns (list): List of regex patterns.
+        
+        Returns:
+            frozenset: Meaningful words (longer than 3 characters), lowercased.
+        """
+        keywords = set()
+        for pattern in patterns:
+            # Extract words from the pattern
+            words = re.findall(r'[A-Za-z]+', pattern)
+            keywords.update(word.lower() for word in words if len(word) > 3)
+        return frozenset(keywords)
@@ -0,0 +1,306 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+from contextlib import contextmanager
+
+# Job states, in the order a document goes through them
+QUEUED = 'queued'
+EXTRACTING = 'extracting'
+OCR = 'ocr'
+DONE = 'done'
+FAILED = 'failed'
+
+RUNNING_STATES = (EXTRACTING, OCR)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    owner TEXT,
+    lease_until REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+"""
+
+class JobQueue:
+    """
+    Persistent queue of extraction jobs stored in SQLite.
+    
+    Every document is a job that moves through queued -> extracting -> ocr ->
+    done or failed, and its result is stored with it, so a batch killed midway
+    resumes where it stopped. Jobs are claimed atomically with a lease; a job
+    whose worker died is claimed again once its lease expires, up to
+    max_attempts times, then marked failed.
+    
+    A job belongs to the process that claimed it (its owner) until it is
+    done, failed or claimed again by another process after its lease
+    expired. The owner keeps the leases of the jobs it holds alive with
+    renew(); updates from a process that no longer owns a job are ignored,
+    so a job claimed again is never completed twice.
+    
+    Each process must open its own JobQueue on the same database file.
+    """
+    
+    def __init__(self, db_path, lease_seconds=900, max_attempts=3, owner=None):
+        """
+        Open (or create) the job database.
+        
+        Args:
+            db_path (str): Path of the SQLite database file.
+            lease_seconds (float): How long a claimed job is reserved for its worker.
+            max_attempts (int): Number of claims allowed before a job is marked failed.
+            owner (str): Owner of the jobs this process works on. Default is this
+                process; worker processes pass the worker_id of the process that
+                claims their jobs.
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.owner = owner or self.worker_id
+        
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        
+        # Databases created before jobs had an owner
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(jobs)")]
+        if 'owner' not in columns:
+            self.connection.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+    
+    def add(self, paths):
+        """
+        Queue documents. Paths that already have a job are left untouched.
+        
+        Args:
+            paths (iterable): Paths of the PDF files.
+        
+        Returns:
+            int: Number of jobs added.
+        """
+        now = time.time()
+        with self._transaction() as cursor:
+            before = self._count(cursor)
+            cursor.executemany(
+                "INSERT OR IGNORE INTO jobs (path, updated_at) VALUES (?, ?)",
+                ((path, now) for path in paths)
+            )
+            return self._count(cursor) - before
+    
+    def claim(self, limit=1):
+        """
+        Atomically claim queued jobs, and jobs whose lease has expired.
+        
+        Fresh jobs are claimed before retried ones, so a document that crashed
+        its worker is retried next to different documents. Expired jobs that
+        already used all their attempts are marked failed instead of being
+        claimed again.
+        
+        Args:
+            limit (int): Maximum number of jobs to claim.
+        
+        Returns:
+            list: (job id, path) tuples, possibly empty.
+        """
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE jobs SET state = ?, error = 'Exceeded retry limit', worker = NULL, updated_at = ? "
+                "WHERE state IN (?, ?) AND lease_until < ? AND attempts >= ?",
+                (FAILED, now, *RUNNING_STATES, now, self.max_attempts)
+            )
+            # BEGIN IMMEDIATE holds the write lock, so no other process can claim the
+            # selected jobs before they are updated (UPDATE ... RETURNING needs SQLite 3.35)
+            jobs = cursor.execute(
+                "SELECT id, path FROM jobs WHERE state = ? OR (state IN (?, ?) AND lease_until < ?) "
+                "ORDER BY attempts, id LIMIT ?",
+                (QUEUED, *RUNNING_STATES, now, limit)
+            ).fetchall()
+            cursor.executemany(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, worker = ?, owner = ?, lease_until = ?, "
+                "updated_at = ? WHERE id = ?",
+                ((EXTRACTING, self.worker_id, self.owner, now + self.lease_seconds, now, job_id)
+                 for job_id, _ in jobs)
+            )
+            return sorted(jobs)
+    
+    def start(self, job_id):
+        """
+        Record that a worker process has started a claimed job and renew its lease.
+        
+        Args:
+            job_id (int): Id of the job.
+        """
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE jobs SET worker = ?, lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND state IN (?, ?)",
+                (self.worker_id, now + self.lease_seconds, now, job_id, self.owner, *RUNNING_STATES)
+            )
+    
+    def set_state(self, job_id, state):
+        """
+        Record the stage a running job has reached and renew its lease.
+        
+        Args:
+            job_id (int): Id of the job.
+            state (str): EXTRACTING or OCR.
+        """
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE jobs SET state = ?, lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND state IN (?, ?)",
+                (state, now + self.lease_seconds, now, job_id, self.owner, *RUNNING_STATES)
+            )
+    
+    def renew(self, job_ids):
+        """
+        Extend the leases of running jobs this process still owns.
+        
+        Call this more often than lease_seconds for every job claimed and not
+        yet finished, including jobs waiting for a free worker.
+        
+        Args:
+            job_ids (iterable): Ids of the jobs.
+        
+        Returns:
+            int: Number of leases renewed.
+        """
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.executemany(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND state IN (?, ?)",
+                ((now + self.lease_seconds, job_id, self.owner, *RUNNING_STATES) for job_id in job_ids)
+            )
+            return cursor.rowcount
+    
+    def complete(self, job_id, result):
+        """
+        Mark a job as done and store its result, if this process still owns it.
+        
+        Args:
+            job_id (int): Id of the job.
+            result (dict): JSON-serializable result of the job.
+        
+        Returns:
+            bool: False if the job was claimed by another process in the meantime
+                and was left untouched.
+        """
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND owner = ?",
+                (DONE, json.dumps(result), time.time(), job_id, self.owner)
+            )
+            return cursor.rowcount == 1
+    
+    def fail(self, job_id, error, retry=False):
+        """
+        Mark a job as failed, or queue it again. Jobs this process no longer
+        owns are left untouched.
+        
+        Args:
+            job_id (int): Id of the job.
+            error (str): Description of the failure.
+            retry (bool): Queue the job again if it has attempts left. Use this
+                for crashes, not for documents that cannot be parsed. A job that
+                no worker had started (see start()) gets its attempt back.
+        
+        Returns:
+            bool: True if the job was queued again without using an attempt.
+        """
+        with self._transaction() as cursor:
+            row = cursor.execute("SELECT attempts, worker FROM jobs WHERE id = ? AND owner = ?",
+                                 (job_id, self.owner)).fetchone()
+            if row is None:
+                return False
+            attempts, worker = row
+            
+            # Still held by the claiming process: no worker ever started it
+            refunded = retry and worker == self.worker_id
+            if refunded:
+                attempts -= 1
+            state = QUEUED if retry and (refunded or attempts < self.max_attempts) else FAILED
+            
+            cursor.execute(
+                "UPDATE jobs SET state = ?, attempts = ?, error = ?, worker = NULL, owner = NULL, "
+                "lease_until = NULL, updated_at = ? WHERE id = ?",
+                (state, attempts, error, time.time(), job_id)
+            )
+            return refunded
+    
+    def recover(self):
+        """
+        Queue again every running job, as if all their leases had expired.
+        
+        Only call this when no other process is working on the database, e.g.
+        when resuming a run after a crash.
+        
+        Returns:
+            int: Number of jobs recovered.
+        """
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE jobs SET lease_until = 0 WHERE state IN (?, ?)",
+                RUNNING_STATES
+            )
+            return cursor.rowcount
+    
+    def counts(self):
+        """
+        Count the jobs in each state.
+        
+        Returns:
+            dict: State to number of jobs, including states with no jobs.
+        """
+        counts = dict.fromkeys((QUEUED, EXTRACTING, OCR, DONE, FAILED), 0)
+        for state, count in self.connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"):
+            counts[state] = count
+        return counts
+    
+    def results(self):
+        """
+        Iterate over finished jobs.
+        
+        Yields:
+            tuple: (path, state, result dict or None, error or None), in job order.
+        """
+        rows = self.connection.execute(
+            "SELECT path, state, result, error FROM jobs WHERE state IN (?, ?) ORDER BY id",
+            (DONE, FAILED)
+        )
+        for path, state, result, error in rows:
+            yield path, state, json.loads(result) if result else None, error
+    
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+    
+    def _count(self, cursor):
+        return cursor.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction that takes the database lock up front, so claims never interleave."""
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
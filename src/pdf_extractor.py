@@ -5,110 +5,716 @@ import pdfplumber
 from PIL import Image
 import io
 import tempfile
+import time
+import hashlib
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.pdf_source import PDFSource
+
+# Bump when a change to the extraction logic makes cached page text stale
+CACHE_VERSION = 1
+
+# Documents with fewer non-blank characters than this hold no usable text
+MIN_TEXT_LENGTH = 10
+
+
+class NoTextError(ValueError):
+    """Raised when a document yields little or no text to extract fields from."""
+    
+    def __init__(self, message="Little or no text extracted. The file may be corrupted or heavily image-based."):
+        super().__init__(message)
+
+
+def _init_ocr_worker():
+    """Limit tesseract to one thread per worker so the pool does not oversubscribe cores."""
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def _ocr_page(pdf_path, page_number, ocr_language, adaptive=None, ocr_cache=None):
+    """
+    Render and OCR a single page.
+    
+    Runs in a worker process when OCR is parallel, so each worker renders only
+    its own page instead of receiving a pickled image from the parent.
+    
+    Args:
+        pdf_path (str): Path to the PDF file.
+        page_number (int): Page to process (1-based).
+        ocr_language (str): Language for OCR.
+        adaptive (tuple): Optional (low_dpi, high_dpi, min_confidence) settings of
+            adaptive OCR. Default is None (one pass at 200 DPI).
+        ocr_cache (OCRCache): Optional cache of OCR text keyed by the rendered
+            page image. Default is None (no cache).
+    
+    Returns:
+        tuple: (OCR text of the page, dict of timings in seconds, OCR cache
+            lookup: None without a cache, else a dictionary with 'result'
+            ('hit' or 'miss') and 'saved' (OCR seconds avoided))
+    """
+    from pdf2image import convert_from_path
+    
+    start = time.perf_counter()
+    dpi = adaptive[0] if adaptive is not None else 200
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    rendered = time.perf_counter()
+    timings = {'render': rendered - start}
+    if not images:
+        timings['ocr'] = 0.0
+        return "", timings, None
+    
+    key = None
+    lookup = None
+    if ocr_cache is not None:
+        key = ocr_cache.key(images[0], f"v{CACHE_VERSION}|{ocr_language}|{adaptive}")
+        cached = ocr_cache.get(key)
+        timings['ocr_cache'] = time.perf_counter() - rendered
+        if cached is not None:
+            return cached['text'], timings, {'result': 'hit', 'saved': cached['seconds']}
+        lookup = {'result': 'miss', 'saved': 0.0}
+    
+    start = time.perf_counter()
+    if adaptive is None:
+        text = pytesseract.image_to_string(images[0], lang=ocr_language)
+        timings['ocr'] = time.perf_counter() - start
+    else:
+        text = _ocr_page_adaptive(images[0], pdf_path, page_number, ocr_language, *adaptive, timings)
+    
+    if key is not None:
+        ocr_cache.set(key, text, time.perf_counter() - start)
+    return text, timings, lookup
+
+
+def _ocr_page_adaptive(image, pdf_path, page_number, ocr_language, low_dpi, high_dpi, min_confidence, timings):
+    """
+    OCR a page at low resolution, re-OCRing only the unclear parts at high resolution.
+    
+    Tesseract time grows with the number of pixels, and most scans read fine at
+    a low DPI. The first pass reports a confidence per word; text blocks whose
+    mean confidence is under min_confidence are cropped from a high-DPI render
+    and OCR'd again. When most of the page is unclear, or no text was found,
+    the whole page is.
+    
+    Args:
+        image (PIL.Image.Image): The page rendered at low_dpi.
+        pdf_path (str): Path to the PDF file.
+        page_number (int): Page to process (1-based).
+        ocr_language (str): Language for OCR.
+        low_dpi (int): Resolution of the first pass.
+        high_dpi (int): Resolution of the second pass.
+        min_confidence (float): Mean word confidence (0-100) a block needs to be kept.
+        timings (dict): Receives the 'ocr' time, and 'render_high' and 'ocr_high'
+            when a second pass was needed.
+    
+    Returns:
+        str: OCR text of the page.
+    """
+    from pdf2image import convert_from_path
+    
+    start = time.perf_counter()
+    data = pytesseract.image_to_data(image, lang=ocr_language, output_type=pytesseract.Output.DICT)
+    timings['ocr'] = time.perf_counter() - start
+    blocks = _ocr_blocks(data)
+    
+    unclear = [number for number, block in blocks.items() if block['confidence'] < min_confidence]
+    if blocks and not unclear:
+        return _blocks_to_text(blocks)
+    
+    start = time.perf_counter()
+    high_image = convert_from_path(pdf_path, dpi=high_dpi, first_page=page_number, last_page=page_number)[0]
+    rendered = time.perf_counter()
+    timings['render_high'] = rendered - start
+    
+    unclear_words = sum(len(blocks[number]['words']) for number in unclear)
+    total_words = sum(len(block['words']) for block in blocks.values())
+    if unclear_words * 2 >= total_words:
+        # Mostly unclear, or no words found at all (e.g. print too small for the
+        # first pass): one full-page pass is cheaper than many crops
+        text = pytesseract.image_to_string(high_image, lang=ocr_language)
+        timings['ocr_high'] = time.perf_counter() - rendered
+        return text
+    
+    scale = high_dpi / low_dpi
+    for number in unclear:
+        left, top, right, bottom = blocks[number]['box']
+        # Pad the crop so characters on the edge of the block are not cut
+        padding = 10
+        crop = high_image.crop((
+            max(0, int((left - padding) * scale)),
+            max(0, int((top - padding) * scale)),
+            min(high_image.width, int((right + padding) * scale)),
+            min(high_image.height, int((bottom + padding) * scale)),
+        ))
+        # psm 6: treat the crop as a single uniform block of text
+        blocks[number]['text'] = pytesseract.image_to_string(crop, lang=ocr_language, config='--psm 6').strip()
+    timings['ocr_high'] = time.perf_counter() - rendered
+    
+    return _blocks_to_text(blocks)
+
+
+def _ocr_blocks(data):
+    """
+    Group the words of a tesseract image_to_data result into text blocks.
+    
+    Args:
+        data (dict): Output of pytesseract.image_to_data with Output.DICT.
+    
+    Returns:
+        dict: Block number to a dictionary with 'lines' (word lists in reading
+            order), 'words', 'confidence' (mean word confidence) and 'box'
+            (left, top, right, bottom in pixels).
+    """
+    blocks = {}
+    for index, word in enumerate(data['text']):
+        confidence = float(data['conf'][index])
+        # Confidence -1 marks layout levels (page, block, line) rather than words
+        if confidence < 0 or not word.strip():
+            continue
+        
+        block = blocks.setdefault(data['block_num'][index], {'lines': {}, 'words': [], 'box': None})
+        block['lines'].setdefault((data['par_num'][index], data['line_num'][index]), []).append(word)
+        block['words'].append(confidence)
+        
+        left, top = data['left'][index], data['top'][index]
+        right, bottom = left + data['width'][index], top + data['height'][index]
+        box = block['box']
+        block['box'] = (left, top, right, bottom) if box is None else (
+            min(box[0], left), min(box[1], top), max(box[2], right), max(box[3], bottom))
+    
+    for block in blocks.values():
+        block['confidence'] = sum(block['words']) / len(block['words'])
+        block['text'] = '\n'.join(' '.join(words) for _, words in sorted(block['lines'].items()))
+    return blocks
+
+
+def _blocks_to_text(blocks):
+    """Join the text of OCR blocks in reading order, one paragraph per block."""
+    return '\n\n'.join(blocks[number]['text'] for number in sorted(blocks)) + '\n'
+
+
+def first_last_page_order(first_pages=2, last_pages=1):
+    """
+    Build a page order that reads the first and last pages before the middle.
+    
+    Contract fields usually sit on the opening pages (parties, dates, term)
+    and in the signature block at the end.
+    
+    Args:
+        first_pages (int): Number of leading pages to read first.
+        last_pages (int): Number of trailing pages to read next.
+    
+    Returns:
+        callable: Function mapping a page count to the ordered 1-based page numbers,
+        for use as the page_order argument of PDFExtractor.iter_pages.
+    """
+    def page_order(page_count):
+        head = list(range(1, min(first_pages, page_count) + 1))
+        tail = [n for n in range(max(page_count - last_pages + 1, 1), page_count + 1) if n not in head]
+        rest = [n for n in range(1, page_count + 1) if n not in head and n not in tail]
+        return head + tail + rest
+    
+    return page_order
+
+
+def _page_numbers(page_count, page_order):
+    """
+    Resolve the page numbers to extract, in order.
+    
+    Args:
+        page_count (int): Number of pages in the document.
+        page_order (callable): Optional function mapping the page count to page numbers.
+    
+    Returns:
+        list: 1-based page numbers, without duplicates or out-of-range pages.
+    """
+    if page_order is None:
+        return list(range(1, page_count + 1))
+    
+    seen = set()
+    page_numbers = []
+    for page_number in page_order(page_count):
+        if 1 <= page_number <= page_count and page_number not in seen:
+            seen.add(page_number)
+            page_numbers.append(page_number)
+    return page_numbers
+
+
+class PageResult:
+    """
+    Text extracted from a single PDF page.
+    
+    Attributes:
+        page_number (int): 1-based page number.
+        page_count (int): Number of pages in the document.
+        text (str): Extracted text of the page.
+        source (str): Engine that produced the text: 'pdfplumber', 'PyPDF2' or 'OCR'.
+        timings (dict): Seconds spent per stage ('pdfplumber', 'pypdf2', 'render', 'ocr',
+            and 'ocr_cache', 'render_high', 'ocr_high' when used).
+        cached (bool): True if the page was served from the extraction cache.
+        ocr_failed (bool): True if the page needed OCR but OCR raised an error.
+        ocr_reason (str): Why the page was sent to OCR: 'image_only' (images and
+            almost no text layer), 'page_error' (the page could not be parsed) or
+            'unparsed' (the document could not be parsed). None if it was not.
+        ocr_cache (str): 'hit' or 'miss' when the page was looked up in the OCR
+            cache, None otherwise.
+        ocr_saved (float): OCR seconds avoided by an OCR cache hit.
+    """
+    
+    def __init__(self, page_number, page_count, text, source, timings=None, cached=False):
+        self.page_number = page_number
+        self.page_count = page_count
+        self.text = text
+        self.source = source
+        self.timings = timings or {}
+        self.cached = cached
+        self.ocr_failed = False
+        self.ocr_reason = None
+        self.ocr_cache = None
+        self.ocr_saved = 0.0
+    
+    def __repr__(self):
+        return (f"PageResult(page_number={self.page_number}, page_count={self.page_count}, "
+                f"source={self.source!r}, chars={len(self.text)})")
+
 
 class PDFExtractor:
     """
     Class for extracting text from PDF files.
     Handles both text-based PDFs and scanned/image-based PDFs.
+    
+    An extractor that starts its own OCR pool keeps it for every document it
+    reads; call close() when done with it.
     """
     
-    def __init__(self, ocr_language='eng'):
+    def __init__(self, ocr_language='eng', ocr_workers=1, min_page_chars=20, cache=None, metrics=None,
+                 adaptive_ocr=False, ocr_low_dpi=150, ocr_high_dpi=300, ocr_min_confidence=70, ocr_cache=None,
+                 ocr_executor=None):
         """
         Initialize the PDF extractor.
         
         Args:
             ocr_language (str): Language for OCR. Default is 'eng' (English).
+            ocr_workers (int): Number of worker processes used for OCR. Default is 1
+                (serial OCR in the calling process); 0 is serial too. Pass None to use
+                all CPU cores. Ignored in a worker process, which OCRs serially
+                unless given an ocr_executor, so pools are never nested. With
+                ocr_executor, the number of its workers one document may keep busy.
+            min_page_chars (int): Pages whose text layer has fewer characters than this
+                and that contain images are treated as scanned and sent to OCR.
+            cache (DiskCache): Optional cache of extracted page text, keyed by the
+                PDF content and the extraction settings. Default is None (no cache).
+            metrics (MetricsRegistry): Optional registry receiving page counts per
+                engine, per-page stage timings, OCR fallbacks and errors. Default is
+                None (no instrumentation).
+            adaptive_ocr (bool): OCR scanned pages at ocr_low_dpi first and re-OCR only
+                the text blocks whose mean word confidence is under ocr_min_confidence
+                at ocr_high_dpi. Default is False (one pass at 200 DPI).
+            ocr_low_dpi (int): Resolution of the first adaptive pass.
+            ocr_high_dpi (int): Resolution of the second adaptive pass.
+            ocr_min_confidence (float): Tesseract word confidence (0-100) under which
+                a block is OCR'd again.
+            ocr_cache (OCRCache): Optional cache of OCR text keyed by the rendered page
+                image, so pages repeated across documents are OCR'd once. Default is
+                None (no cache).
+            ocr_executor (Executor): Pool to submit scanned pages to, e.g. one shared by
+                several extractors. It is owned by the caller and left running by
+                close(). Default is None (the extractor starts its own pool when
+                ocr_workers is above 1).
         """
         self.ocr_language = ocr_language
-        
-    def extract_text(self, pdf_file):
+        if ocr_workers is None:
+            ocr_workers = os.cpu_count() or 1
+        if ocr_executor is None and multiprocessing.parent_process() is not None:
+            # Already in a worker process: a pool per worker would oversubscribe the cores
+            ocr_workers = 1
+        self.ocr_workers = max(ocr_workers, 1)
+        self.ocr_executor = ocr_executor
+        # Pool started by this extractor, on the first scanned page
+        self._own_executor = None
+        self.min_page_chars = min_page_chars
+        self.cache = cache
+        self.metrics = metrics
+        # Passed to the OCR workers as is, so it must stay picklable
+        self.adaptive_ocr = (ocr_low_dpi, ocr_high_dpi, ocr_min_confidence) if adaptive_ocr else None
+        self.ocr_cache = ocr_cache
+    
+    def close(self):
+        """Stop the OCR pool started by this extractor, if any. An ocr_executor is left running."""
+        if self._own_executor is not None:
+            self._own_executor.shutdown(wait=False, cancel_futures=True)
+            self._own_executor = None
+    
+    def extract_text(self, pdf_file, on_page=None):
         """
         Extract text from a PDF file.
         
+        Each page is classified on its own: pages with a text layer are read
+        directly, and only image-only pages are sent to OCR. Results are merged
+        in page order.
+        
         Args:
-            pdf_file: File object or path to the PDF file.
-            
+            pdf_file: Path to the PDF file, bytes, memoryview, file object or PDFSource.
+            on_page (callable): Optional function called with each PageResult as it
+                is read, e.g. to report progress or add up page timings.
+        
         Returns:
             str: Extracted text from the PDF.
         """
-        # First try standard text extraction
-        text = self._extract_text_standard(pdf_file)
+        start = time.perf_counter()
+        parts = []
+        for page in self.iter_pages(pdf_file):
+            if on_page is not None:
+                on_page(page)
+            parts.append(page.text + "\n\n" if page.source == 'OCR' else page.text)
         
-        # If little or no text was extracted, try OCR
-        if not text or len(text.strip()) < 100:  # Arbitrary threshold
-            text = self._extract_text_ocr(pdf_file)
-            
-        return text
+        if self.metrics is not None:
+            self.metrics.observe('pdf_document_seconds', time.perf_counter() - start)
+        return "".join(parts)
     
-    def _extract_text_standard(self, pdf_file):
+    def extract_usable_text(self, pdf_file, on_page=None):
         """
-        Extract text from a PDF using standard methods (no OCR).
+        Extract text from a PDF file to read fields from, failing if there is little or none.
         
         Args:
-            pdf_file: File object or path to the PDF file.
-            
+            pdf_file: Path to the PDF file, bytes, memoryview, file object or PDFSource.
+            on_page (callable): Optional function called with each PageResult as it
+                is read.
+        
         Returns:
             str: Extracted text from the PDF.
+        
+        Raises:
+            NoTextError: If the text has fewer than MIN_TEXT_LENGTH non-blank characters.
+        """
+        text = self.extract_text(pdf_file, on_page)
+        if len(text.strip()) < MIN_TEXT_LENGTH:
+            raise NoTextError()
+        return text
+    
+    def iter_pages(self, pdf_file, page_order=None):
+        """
+        Lazily extract the text of each page, in page order.
+        
+        Pages are parsed one at a time, so callers can start working on the
+        first pages before the last ones are read and memory stays flat on
+        long documents. With more than one OCR worker, scanned pages are OCR'd
+        ahead in a process pool while earlier pages are being consumed.
+        
+        The document is read once: paths are memory-mapped and in-memory
+        buffers are shared, without copies, by pdfplumber, PyPDF2 and OCR.
+        
+        Args:
+            pdf_file: Path to the PDF file, bytes, memoryview, file object or PDFSource.
+        
+        Yields:
+            PageResult: Extracted text and timings of each page.
         """
+        if isinstance(pdf_file, PDFSource):
+            yield from self._record_pages(self._iter_pages_source(pdf_file, page_order))
+            return
+        
         try:
-            # Try with pdfplumber first (often better for maintaining layout)
-            with pdfplumber.open(pdf_file) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-                    
-            # If pdfplumber didn't extract much, try PyPDF2
-            if not text or len(text.strip()) < 50:
-                if isinstance(pdf_file, str):
-                    with open(pdf_file, 'rb') as file:
-                        reader = PyPDF2.PdfReader(file)
-                        text = ""
-                        for page in reader.pages:
-                            text += page.extract_text() or ""
-                else:
-                    # Reset file pointer if it's a file object
-                    pdf_file.seek(0)
-                    reader = PyPDF2.PdfReader(pdf_file)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text() or ""
-                        
-            return text
+            source = PDFSource(pdf_file)
         except Exception as e:
             print(f"Error in standard text extraction: {e}")
-            return ""
+            self._record_error('source')
+            return
+        
+        try:
+            yield from self._record_pages(self._iter_pages_source(source, page_order))
+        finally:
+            source.close()
     
-    def _extract_text_ocr(self, pdf_file):
+    def _record_pages(self, pages):
         """
-        Extract text from a PDF using OCR.
+        Record the metrics of each page as it is yielded.
         
         Args:
-            pdf_file: File object or path to the PDF file.
-            
+            pages: Iterable of PageResult.
+        
         Returns:
-            str: Extracted text from the PDF.
+            The pages unchanged, or a generator recording them when metrics are enabled.
+        """
+        if self.metrics is None:
+            return pages
+        return self._iter_recorded_pages(pages)
+    
+    def _iter_recorded_pages(self, pages):
+        """Yield the pages, recording their engine, stage timings and OCR fallbacks."""
+        metrics = self.metrics
+        metrics.inc('pdf_documents_total')
+        for page in pages:
+            metrics.inc('pdf_pages_total', engine=page.source)
+            for stage, seconds in page.timings.items():
+                metrics.observe('pdf_page_stage_seconds', seconds, stage=stage)
+            if page.ocr_reason is not None:
+                metrics.inc('pdf_ocr_fallback_total', reason=page.ocr_reason)
+            if page.ocr_failed:
+                metrics.inc('pdf_ocr_failures_total')
+            if page.ocr_cache is not None:
+                metrics.inc('pdf_ocr_cache_lookups_total', result=page.ocr_cache)
+                metrics.inc('pdf_ocr_cache_saved_seconds_total', page.ocr_saved)
+            yield page
+    
+    def _record_error(self, stage):
+        """Count an error caught in an extraction stage."""
+        if self.metrics is not None:
+            self.metrics.inc('pdf_errors_total', stage=stage)
+    
+    def _iter_pages_source(self, source, page_order=None):
+        """
+        Extract the text of each page of an open source, using the cache if set.
+        
+        Args:
+            source (PDFSource): The PDF document.
+            page_order (callable): Optional function mapping the page count to page numbers.
+        
+        Yields:
+            PageResult: Extracted text and timings of each page.
+        """
+        if self.cache is None:
+            yield from self._resolve_ocr(source, self._iter_pages_standard(source, page_order))
+            return
+        
+        key = self._cache_key(source)
+        cached = self.cache.get(key)
+        if self.metrics is not None:
+            self.metrics.inc('pdf_cache_lookups_total', result='miss' if cached is None else 'hit')
+        if cached is not None:
+            # Cache hit: no PDF engine is touched at all
+            page_count = len(cached['pages'])
+            for page_number in _page_numbers(page_count, page_order):
+                text, engine = cached['pages'][page_number - 1]
+                yield PageResult(page_number, page_count, text, engine, cached=True)
+            return
+        
+        pages = {}
+        complete = True
+        page_count = 0
+        for page in self._resolve_ocr(source, self._iter_pages_standard(source, page_order)):
+            pages[page.page_number] = (page.text, page.source)
+            page_count = page.page_count
+            complete = complete and not page.ocr_failed
+            yield page
+        
+        # Only complete documents are cached; a consumer that stops early skips this
+        if complete and pages and len(pages) == page_count:
+            self.cache.set(key, {'pages': [pages[n] for n in range(1, page_count + 1)]})
+    
+    def _cache_key(self, source):
+        """
+        Build the cache key of a PDF for the current extraction settings.
+        
+        Args:
+            source (PDFSource): The PDF document.
+        
+        Returns:
+            str: Hex digest identifying the PDF content and settings.
+        """
+        settings = f"v{CACHE_VERSION}|{self.ocr_language}|{self.min_page_chars}|{source.sha256()}"
+        if self.adaptive_ocr is not None:
+            settings += "|adaptive:{}:{}:{}".format(*self.adaptive_ocr)
+        return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+    
+    def _iter_pages_standard(self, source, page_order=None):
+        """
+        Extract the text layer of each page using standard methods (no OCR).
+        
+        Args:
+            source (PDFSource): The PDF document.
+            page_order (callable): Optional function mapping the page count to page numbers.
+        
+        Yields:
+            tuple: (PageResult, needs_ocr) for each page.
         """
         try:
-            from pdf2image import convert_from_path, convert_from_bytes
-            
-            text = ""
-            
-            # Convert PDF to images
-            if isinstance(pdf_file, str):
-                images = convert_from_path(pdf_file)
-            else:
-                # Reset file pointer if it's a file object
-                pdf_file.seek(0)
-                pdf_bytes = pdf_file.read()
-                images = convert_from_bytes(pdf_bytes)
+            # Try with pdfplumber first (often better for maintaining layout)
+            pdf = pdfplumber.open(source.open_stream())
+        except Exception as e:
+            print(f"Error in standard text extraction: {e}")
+            self._record_error('pdfplumber')
+            # The document could not be parsed at all, so OCR every page
+            yield from self._iter_pages_unparsed(source, page_order)
+            return
+        
+        reader = None
+        try:
+            page_count = len(pdf.pages)
+            for page_number in _page_numbers(page_count, page_order):
+                index = page_number - 1
+                page = pdf.pages[index]
+                timings = {}
+                
+                start = time.perf_counter()
+                page_error = False
+                try:
+                    text = page.extract_text() or ""
+                    has_images = bool(page.images)
+                except Exception as e:
+                    print(f"Error in standard text extraction: {e}")
+                    self._record_error('pdfplumber')
+                    text, has_images, page_error = "", True, True
+                finally:
+                    # Drop the parsed layout of the page so memory stays flat
+                    page.close()
+                timings['pdfplumber'] = time.perf_counter() - start
+                engine = 'pdfplumber'
+                
+                # If pdfplumber didn't extract much, try PyPDF2 over the same buffer
+                if len(text.strip()) < self.min_page_chars:
+                    start = time.perf_counter()
+                    try:
+                        if reader is None:
+                            reader = PyPDF2.PdfReader(source.open_stream())
+                        pypdf2_text = reader.pages[index].extract_text() or ""
+                        if len(pypdf2_text.strip()) > len(text.strip()):
+                            text, engine = pypdf2_text, 'PyPDF2'
+                    except Exception as e:
+                        print(f"Error in standard text extraction: {e}")
+                        self._record_error('pypdf2')
+                    timings['pypdf2'] = time.perf_counter() - start
+                
+                needs_ocr = has_images and len(text.strip()) < self.min_page_chars
+                result = PageResult(page_number, page_count, text, engine, timings)
+                if needs_ocr:
+                    result.ocr_reason = 'page_error' if page_error else 'image_only'
+                yield result, needs_ocr
+        finally:
+            pdf.close()
+    
+    def _iter_pages_unparsed(self, source, page_order=None):
+        """
+        Produce empty page records for a document that only OCR can read.
+        
+        Args:
+            source (PDFSource): The PDF document.
+            page_order (callable): Optional function mapping the page count to page numbers.
+        
+        Yields:
+            tuple: (PageResult, needs_ocr) for each page.
+        """
+        try:
+            from pdf2image import pdfinfo_from_path
             
-            # Process each page
-            for image in images:
-                # Use pytesseract to extract text from the image
-                page_text = pytesseract.image_to_string(image, lang=self.ocr_language)
-                text += page_text + "\n\n"
+            page_count = pdfinfo_from_path(source.ocr_path())['Pages']
+        except Exception as e:
+            print(f"Error in OCR text extraction: {e}")
+            self._record_error('ocr')
+            return
+        
+        for page_number in _page_numbers(page_count, page_order):
+            page = PageResult(page_number, page_count, "", 'OCR')
+            page.ocr_reason = 'unparsed'
+            yield page, True
+    
+    def _resolve_ocr(self, source, pages):
+        """
+        OCR the pages that need it and yield all pages in order.
+        
+        With more than one OCR worker or an ocr_executor, scanned pages are
+        submitted to the pool as they are discovered. At most twice as many
+        pages as there are workers are held back while waiting for OCR results.
+        
+        Args:
+            source (PDFSource): The PDF document.
+            pages: Iterable of (PageResult, needs_ocr) tuples in page order.
+        
+        Yields:
+            PageResult: Each page, with OCR text filled in where needed.
+        """
+        if self.ocr_executor is None and self.ocr_workers == 1:
+            for page, needs_ocr in pages:
+                if needs_ocr:
+                    self._apply_ocr(page, lambda: _ocr_page(source.ocr_path(), page.page_number, self.ocr_language,
+                                                             self.adaptive_ocr, self.ocr_cache))
+                yield page
+            return
+        
+        pending = deque()
+        try:
+            for page, needs_ocr in pages:
+                future = None
+                if needs_ocr:
+                    # Workers render from a path, so the document is never pickled
+                    future = self._submit_ocr(_ocr_page, source.ocr_path(), page.page_number, self.ocr_language,
+                                              self.adaptive_ocr, self.ocr_cache)
+                pending.append((page, future))
                 
-            return text
+                # Yield every page whose text is final, keeping page order
+                while pending and (pending[0][1] is None or pending[0][1].done()
+                                   or len(pending) > self.ocr_workers * 2):
+                    page, future = pending.popleft()
+                    if future is not None:
+                        self._apply_ocr(page, future.result)
+                    yield page
+            
+            while pending:
+                page, future = pending.popleft()
+                if future is not None:
+                    self._apply_ocr(page, future.result)
+                yield page
+        finally:
+            # The pool outlives the document: only drop the pages no longer wanted
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+    
+    def _submit_ocr(self, function, *args):
+        """
+        Submit an OCR task to the shared executor, or to the extractor's own pool.
+        
+        The own pool is started on first use, and replaced if one of its worker
+        processes died.
+        
+        Returns:
+            Future: Future of the task.
+        """
+        if self.ocr_executor is not None:
+            return self.ocr_executor.submit(function, *args)
+        
+        if self._own_executor is None:
+            self._own_executor = ProcessPoolExecutor(max_workers=self.ocr_workers, initializer=_init_ocr_worker)
+        try:
+            return self._own_executor.submit(function, *args)
+        except BrokenProcessPool:
+            self.close()
+            self._own_executor = ProcessPoolExecutor(max_workers=self.ocr_workers, initializer=_init_ocr_worker)
+            return self._own_executor.submit(function, *args)
+    
+    def _apply_ocr(self, page, run_ocr):
+        """
+        Replace the text of a page with its OCR result.
+        
+        Args:
+            page (PageResult): Page to update in place.
+            run_ocr (callable): Returns the (text, timings, lookup) tuple of _ocr_page.
+        """
+        try:
+            text, timings, lookup = run_ocr()
         except Exception as e:
             print(f"Error in OCR text extraction: {e}")
-            return ""
+            self._record_error('ocr')
+            page.ocr_failed = True
+            return
+        
+        page.text = text
+        page.source = 'OCR'
+        page.timings.update(timings)
+        if lookup is not None:
+            page.ocr_cache = lookup['result']
+            page.ocr_saved = lookup['saved']
+    
+    def _extract_text_ocr(self, pdf_file):
+        """
+        Extract text from a PDF using OCR on every page.
+        
+        Args:
+            pdf_file: Path to the PDF file, bytes, memoryview or file object.
+        
+        Returns:
+            str: Extracted text from the PDF.
+        """
+        with PDFSource(pdf_file) as source:
+            pages = self._resolve_ocr(source, self._iter_pages_unparsed(source))
+            return "".join(page.text + "\n\n" for page in pages if page.source == 'OCR')
@@ -0,0 +1,199 @@
+import io
+import os
+import mmap
+import hashlib
+import tempfile
+
+
+class _BufferReader(io.RawIOBase):
+    """
+    Read-only file interface over a memoryview.
+    
+    Reads copy only the requested slice, never the whole buffer.
+    """
+    
+    def __init__(self, view):
+        self._view = view
+        self._position = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self._position
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+    
+    def readinto(self, buffer):
+        chunk = self._view[self._position:self._position + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        chunk.release()
+        self._position += size
+        return size
+    
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class PDFSource:
+    """
+    A PDF document read once and shared by every extraction engine.
+    
+    Paths and real files are memory-mapped, bytes are used as they are, and
+    other buffers (bytearray, memoryview, mmap) are wrapped without copying.
+    Each engine gets its own stream over the same underlying memory.
+    """
+    
+    def __init__(self, pdf_file):
+        """
+        Open a PDF source.
+        
+        Args:
+            pdf_file: Path to the PDF file, bytes, bytearray, memoryview, mmap,
+                or a binary file object.
+        """
+        self.path = None
+        self._file = None
+        self._temp_path = None
+        self._streams = []
+        
+        if isinstance(pdf_file, (str, os.PathLike)):
+            self.path = os.fspath(pdf_file)
+            self._file = open(self.path, 'rb')
+            self.buffer = self._map(self._file)
+        elif isinstance(pdf_file, bytes):
+            self.buffer = pdf_file
+        elif isinstance(pdf_file, (bytearray, memoryview, mmap.mmap)):
+            self.buffer = self._view(pdf_file)
+        elif hasattr(pdf_file, 'getbuffer'):
+            # BytesIO and Streamlit uploads: share the in-memory buffer
+            self.buffer = self._view(pdf_file.getbuffer())
+        elif self._has_fileno(pdf_file):
+            # Real file object: map our own duplicate of its descriptor
+            name = getattr(pdf_file, 'name', None)
+            self.path = name if isinstance(name, str) and os.path.isfile(name) else None
+            self._file = open(os.dup(pdf_file.fileno()), 'rb')
+            self.buffer = self._map(self._file)
+        else:
+            # Unknown stream: one read, without moving its position
+            position = pdf_file.tell()
+            pdf_file.seek(0)
+            self.buffer = pdf_file.read()
+            pdf_file.seek(position)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __len__(self):
+        return len(self.buffer)
+    
+    def open_stream(self):
+        """
+        Open an independent read-only stream over the document.
+        
+        Returns:
+            A seekable binary file object. Nothing is copied for bytes, mapped
+            files or other buffers.
+        """
+        if isinstance(self.buffer, bytes):
+            # BytesIO shares an immutable bytes object until it is written to
+            return io.BytesIO(self.buffer)
+        if isinstance(self.buffer, mmap.mmap) and self._file is not None:
+            # A second map of the same file has its own position and shares the page cache
+            stream = self._map(self._file)
+        else:
+            stream = io.BufferedReader(_BufferReader(memoryview(self.buffer)))
+        self._streams.append(stream)
+        return stream
+    
+    def sha256(self):
+        """
+        Compute the SHA-256 digest of the document without copying it.
+        
+        Returns:
+            str: Hex digest of the content.
+        """
+        return hashlib.sha256(self.buffer).hexdigest()
+    
+    def ocr_path(self):
+        """
+        Return a path that pdf2image can render from.
+        
+        In-memory documents are written to a temporary file once, on first use,
+        instead of once per rendered page.
+        
+        Returns:
+            str: Path to the PDF on disk.
+        """
+        if self.path is not None:
+            return self.path
+        if self._temp_path is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
+                tmp.write(self.buffer)
+                self._temp_path = tmp.name
+        return self._temp_path
+    
+    def close(self):
+        """Release the streams, the mapping, the file handle and any temporary file."""
+        for stream in self._streams:
+            stream.close()
+        self._streams = []
+        if isinstance(self.buffer, mmap.mmap) and self._file is not None:
+            self.buffer.close()
+        elif isinstance(self.buffer, memoryview):
+            # Let the caller resize or close the buffer it lent us
+            self.buffer.release()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._temp_path is not None:
+            try:
+                os.remove(self._temp_path)
+            except OSError as e:
+                print(f"Error removing temporary file {self._temp_path}: {e}")
+            self._temp_path = None
+    
+    @staticmethod
+    def _map(file):
+        """Memory-map a whole file read-only (empty files become empty bytes)."""
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    @staticmethod
+    def _view(buffer):
+        """Return bytes unchanged when a view spans a whole bytes object, else the view."""
+        view = memoryview(buffer)
+        if isinstance(view.obj, bytes) and view.contiguous and view.nbytes == len(view.obj):
+            return view.obj
+        return view.cast('B') if view.contiguous else view.tobytes()
+    
+    @staticmethod
+    def _has_fileno(pdf_file):
+        """Check whether a file object is backed by a real file descriptor."""
+        try:
+            pdf_file.fileno()
+            return True
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return False
@@ -0,0 +1,44 @@
+from src.pdf_extractor import first_last_page_order
+
+def extract_fields_from_pdf(pdf_extractor, field_extractor, pdf_file, first_pages=2, last_pages=1,
+                            required_fields=None, stats=None, on_page=None):
+    """
+    Extract fields from a PDF, parsing pages only until every field is found.
+    
+    Pages are read in "first N pages, then last M pages, then the rest" order
+    and fed to the field extractor one at a time. Once every required field is
+    resolved, the remaining pages are never parsed or OCR'd.
+    
+    Args:
+        pdf_extractor (PDFExtractor): Extractor used to read the pages.
+        field_extractor (FieldExtractor): Extractor used to find the fields.
+        pdf_file: Path to the PDF file, bytes, memoryview, file object or PDFSource.
+        first_pages (int): Number of leading pages to read first.
+        last_pages (int): Number of trailing pages to read next.
+        required_fields (iterable): Fields that must be found before reading
+            stops. Default is every field.
+        stats (dict): Optional dictionary that receives 'pages_read' and 'page_count'.
+        on_page (callable): Optional function called with each PageResult as it is read.
+    
+    Returns:
+        dict: Dictionary containing the extracted fields.
+    """
+    page_order = first_last_page_order(first_pages, last_pages)
+    pages = pdf_extractor.iter_pages(pdf_file, page_order=page_order)
+    counter = {'pages_read': 0, 'page_count': 0}
+    
+    def counted(pages):
+        for page in pages:
+            counter['pages_read'] += 1
+            counter['page_count'] = page.page_count
+            if on_page is not None:
+                on_page(page)
+            yield page
+    
+    try:
+        return field_extractor.extract_fields_from_pages(counted(pages), required_fields)
+    finally:
+        # Stop the page iterator so unread pages are never parsed and its resources are released
+        pages.close()
+        if stats is not None:
+            stats.update(counter)
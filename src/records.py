@@ -0,0 +1,303 @@
+import sys
+import json
+
+import numpy as np
+
+# Fields of an extraction result, in column order
+FIELDS = (
+    'file_name', 'print_name', 'title', 'effective_date', 'start_date',
+    'initial_term', 'further_term', 'print_name_2',
+)
+
+# Code of a missing value in a column
+MISSING_CODE = -1
+
+class _Missing:
+    """Type of the MISSING sentinel: falsy, and a single instance even after pickling."""
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    def __bool__(self):
+        return False
+    
+    def __repr__(self):
+        return 'MISSING'
+    
+    def __reduce__(self):
+        return (_Missing, ())
+
+# Value of a field that was not extracted, distinct from any string
+MISSING = _Missing()
+
+class ExtractionRecord:
+    """
+    Extraction result of one document with a fixed set of fields.
+    
+    Fields that were not extracted hold MISSING. Keys outside FIELDS are
+    kept in the extra dictionary, which is None for most records.
+    """
+    
+    __slots__ = FIELDS + ('extra',)
+    
+    def __init__(self, **values):
+        extra = None
+        for field in FIELDS:
+            setattr(self, field, MISSING)
+        for field, value in values.items():
+            if field in FIELDS:
+                setattr(self, field, MISSING if value is None or value == '' else value)
+            else:
+                extra = extra or {}
+                extra[field] = value
+        self.extra = extra
+    
+    def __repr__(self):
+        return f"ExtractionRecord(file_name={self.file_name!r})"
+    
+    def __eq__(self, other):
+        if not isinstance(other, ExtractionRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    @classmethod
+    def from_dict(cls, result):
+        """
+        Build a record from a result dictionary.
+        
+        Args:
+            result (dict): Extracted fields, as returned by FieldExtractor. None
+                and empty values become MISSING.
+        
+        Returns:
+            ExtractionRecord: The record.
+        """
+        return cls(**result)
+    
+    def get(self, field, default=None):
+        """Return the value of a field, or default if it is missing."""
+        if field in FIELDS:
+            value = getattr(self, field)
+        else:
+            value = (self.extra or {}).get(field, MISSING)
+        return default if value is MISSING else value
+    
+    def to_dict(self):
+        """Return the record as a result dictionary, with None for missing fields."""
+        result = {field: self.get(field) for field in FIELDS}
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+class RecordBatch:
+    """
+    Append-only, column-oriented batch of extraction results.
+    
+    Each field is dictionary-encoded: its distinct values are stored once
+    and every row holds a small integer code (MISSING_CODE for missing
+    values). Codes start as int8 and are widened when a column's dictionary
+    outgrows them, matching the code width pandas picks for a Categorical,
+    so to_pandas() and to_arrow() wrap the code buffers without copying
+    them. Rows are never modified once appended, so frames built earlier
+    stay valid as the batch grows.
+    
+    Missing values are counted per field as rows are appended, so summary
+    statistics never need a pass over the rows.
+    """
+    
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty batch.
+        
+        Args:
+            capacity (int): Number of rows to allocate room for up front.
+        """
+        self._length = 0
+        self._codes = {field: np.full(capacity, MISSING_CODE, dtype=np.int8) for field in FIELDS}
+        self._values = {field: [] for field in FIELDS}
+        self._lookup = {field: {} for field in FIELDS}
+        self._missing = dict.fromkeys(FIELDS, 0)
+        # Row number -> keys outside FIELDS, for the few rows that have any
+        self._extra = {}
+    
+    def __len__(self):
+        return self._length
+    
+    def __iter__(self):
+        for row in range(self._length):
+            yield self[row]
+    
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._length
+        if not 0 <= row < self._length:
+            raise IndexError("RecordBatch index out of range")
+        
+        record = ExtractionRecord()
+        for field in FIELDS:
+            code = self._codes[field][row]
+            if code != MISSING_CODE:
+                setattr(record, field, self._values[field][code])
+        record.extra = self._extra.get(row)
+        return record
+    
+    @classmethod
+    def from_dicts(cls, results):
+        """
+        Build a batch from result dictionaries.
+        
+        Args:
+            results (iterable): Extracted fields, as returned by FieldExtractor.
+        
+        Returns:
+            RecordBatch: The batch.
+        """
+        batch = cls()
+        batch.extend(results)
+        return batch
+    
+    def append(self, result):
+        """
+        Append one result.
+        
+        Args:
+            result (dict or ExtractionRecord): Extracted fields. None and empty values
+                are stored as missing; lists and dictionaries as JSON strings.
+        """
+        if isinstance(result, ExtractionRecord):
+            result = result.to_dict()
+        
+        row = self._length
+        if row == len(self._codes[FIELDS[0]]):
+            self._grow(max(row * 2, 16))
+        
+        extra = None
+        for field, value in result.items():
+            if field not in self._codes:
+                extra = extra or {}
+                extra[field] = value
+                continue
+            if value is not None and value != '':
+                self._codes[field][row] = self._encode(field, value)
+        for field in FIELDS:
+            if self._codes[field][row] == MISSING_CODE:
+                self._missing[field] += 1
+        
+        if extra:
+            self._extra[row] = extra
+        self._length += 1
+    
+    def extend(self, results):
+        """Append several results, in order."""
+        for result in results:
+            self.append(result)
+    
+    def missing_count(self, fields=FIELDS):
+        """
+        Return the number of missing values of the given fields, over all rows.
+        
+        Args:
+            fields (iterable): Field names. Default is every field.
+        
+        Returns:
+            int: Total of the missing values.
+        """
+        return sum(self._missing[field] for field in fields)
+    
+    def codes(self, field):
+        """
+        Return the codes of a field, without copying them.
+        
+        Args:
+            field (str): Field name.
+        
+        Returns:
+            numpy.ndarray: One code per row, MISSING_CODE for missing values;
+                the code indexes values(field).
+        """
+        return self._codes[field][:self._length]
+    
+    def values(self, field):
+        """Return the distinct values of a field, in code order."""
+        return self._values[field]
+    
+    def to_dicts(self):
+        """Return every row as a result dictionary, with None for missing fields."""
+        return [record.to_dict() for record in self]
+    
+    def to_pandas(self, columns=FIELDS):
+        """
+        Convert the batch to a DataFrame of categorical columns.
+        
+        The code buffers are shared with the frame rather than copied; missing
+        values are NaN.
+        
+        Args:
+            columns (iterable): Fields to include, in order. Default is every field.
+        
+        Returns:
+            pandas.DataFrame: One row per result.
+        """
+        import pandas as pd
+        
+        series = {
+            field: pd.Series(pd.Categorical.from_codes(self.codes(field), self._values[field], validate=False),
+                             copy=False)
+            for field in columns
+        }
+        return pd.DataFrame(series, copy=False)
+    
+    def to_arrow(self, columns=FIELDS):
+        """
+        Convert the batch to an Arrow table of dictionary-encoded columns.
+        
+        The code buffers are shared with the table rather than copied; missing
+        values are null.
+        
+        Args:
+            columns (iterable): Fields to include, in order. Default is every field.
+        
+        Returns:
+            pyarrow.Table: One row per result.
+        """
+        import pyarrow as pa
+        
+        arrays = []
+        for field in columns:
+            codes = self.codes(field)
+            indices = pa.array(codes, mask=codes == MISSING_CODE)
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(self._values[field], type=pa.string())))
+        return pa.Table.from_arrays(arrays, names=list(columns))
+    
+    def _encode(self, field, value):
+        """Return the code of a value in a field's dictionary, adding it if new."""
+        if not isinstance(value, str):
+            value = json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list, tuple)) else str(value)
+        
+        lookup = self._lookup[field]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self._values[field])
+            # pandas uses the narrowest code type that holds every category
+            if code + 1 >= np.iinfo(self._codes[field].dtype).max:
+                self._widen(field)
+            lookup[value] = code
+            self._values[field].append(sys.intern(value))
+        return code
+    
+    def _grow(self, capacity):
+        """Reallocate every code buffer with room for capacity rows."""
+        for field, codes in self._codes.items():
+            grown = np.full(capacity, MISSING_CODE, dtype=codes.dtype)
+            grown[:self._length] = codes[:self._length]
+            self._codes[field] = grown
+    
+    def _widen(self, field):
+        """Move a field's codes to the next wider integer type."""
+        codes = self._codes[field]
+        wider = {np.dtype(np.int8): np.int16, np.dtype(np.int16): np.int32}.get(codes.dtype, np.int64)
+        self._codes[field] = codes.astype(wider)
@@ -0,0 +1,230 @@
+import re
+from heapq import merge
+from src.utils.anchors import literal_prefixes
+
+class Template:
+    """
+    A known contract template and how to read its fields.
+    
+    A document matches the template when every marker phrase occurs in it
+    (within marker_window characters of its start, if set) and, if page_count
+    is set, it has that many pages. Markers are typically the title and
+    section headings of the template. They are matched as written in the
+    original text, unless ignore_case is set.
+    
+    Fields the template has patterns for are first read with those patterns,
+    which are few and specific to its wording; the fields they miss and the
+    other fields go through the full pattern set. Each pattern is only tried
+    where its literal prefix occurs, on a window of the text. Defaults fill
+    fields that are still missing once every other method has run.
+    """
+    
+    def __init__(self, name, markers, patterns=None, defaults=None, page_count=None, marker_window=None,
+                 pattern_window=2000, ignore_case=False):
+        """
+        Initialize the template.
+        
+        Args:
+            name (str): Name of the template, reported in metrics.
+            markers (iterable): Phrases identifying the template. Matched
+                case-sensitively in the original text.
+            patterns (dict): Field name to a list of regex patterns, tried in order on
+                the normalized text. Each pattern captures the value in group 1 and
+                should start with literal text, which is used to find where to try it.
+            defaults (dict): Field name to a list of (needle, value) pairs: if the
+                field is still missing and the original text contains the needle,
+                the field is set to the value. Fields outside the standard set are
+                allowed.
+            page_count (int): Number of pages of the template, or None for any.
+            marker_window (int): Characters from the start of the document within
+                which every marker must start, or None for anywhere.
+            pattern_window (int): Maximum number of characters a pattern match may span.
+            ignore_case (bool): Match the markers in the lowercased, whitespace-collapsed
+                text instead, so they also match headings in capitals or broken across
+                lines. Default is False.
+        """
+        self.name = name
+        self.ignore_case = ignore_case
+        self.markers = tuple(' '.join(marker.lower().split()) if ignore_case else marker for marker in markers)
+        self.patterns = patterns or {}
+        self.defaults = defaults or {}
+        self.page_count = page_count
+        self.marker_window = marker_window
+        self.pattern_window = pattern_window
+        
+        # (compiled pattern, lowercase literal prefixes or ()) for each pattern
+        self.compiled_patterns = {
+            field: [(re.compile(pattern, re.IGNORECASE), literal_prefixes(pattern)) for pattern in field_patterns]
+            for field, field_patterns in self.patterns.items()
+        }
+    
+    def __repr__(self):
+        return f"Template(name={self.name!r}, markers={self.markers!r})"
+    
+    def matches(self, text, normalized_text, page_count=None, offset=0):
+        """
+        Check whether a document matches the template's fingerprint.
+        
+        Args:
+            text (str): The original text of the document, or of one of its pages.
+            normalized_text (str): The same text lowercased and whitespace-collapsed.
+            page_count (int): Number of pages of the document, or None if unknown.
+            offset (int): Position of the text in the document, or None if unknown
+                (e.g. a page other than the first).
+        
+        Returns:
+            bool: True if the document matches.
+        """
+        if self.page_count is not None and page_count is not None and page_count != self.page_count:
+            return False
+        
+        haystack = normalized_text if self.ignore_case else text
+        end = len(haystack)
+        if self.marker_window is not None:
+            if offset is None:
+                return False
+            end = self.marker_window - offset
+        
+        # str.find is a C scan, much cheaper than a regex pass for a few markers
+        return all(haystack.find(marker, 0, max(0, end) + len(marker)) != -1 for marker in self.markers)
+    
+    def match_field(self, normalized_text, field):
+        """
+        Look up a field with the template's patterns.
+        
+        Args:
+            normalized_text (str): The lowercased, whitespace-collapsed text.
+            field (str): Name of the field.
+        
+        Returns:
+            re.Match or None: The leftmost match of the first pattern that yields a
+                non-empty value.
+        """
+        for pattern, prefixes in self.compiled_patterns.get(field, ()):
+            matches = self._match_pattern(pattern, prefixes, normalized_text)
+            if matches and matches.group(1) and matches.group(1).strip():
+                return matches
+        return None
+    
+    def has_patterns(self, field):
+        """Return True if the template reads the field with its own patterns."""
+        return field in self.compiled_patterns
+    
+    def _match_pattern(self, pattern, prefixes, normalized_text):
+        """Find the leftmost match of a pattern, trying it only where one of its literal prefixes starts."""
+        if not prefixes:
+            return pattern.search(normalized_text)
+        
+        previous = None
+        for position in merge(*(_occurrences(normalized_text, prefix) for prefix in prefixes)):
+            if position == previous:
+                continue
+            previous = position
+            matches = pattern.match(normalized_text, position, position + self.pattern_window)
+            if matches:
+                return matches
+        return None
+    
+    def apply_defaults(self, results, text):
+        """
+        Fill missing fields from the template's defaults.
+        
+        Args:
+            results (dict): Field values, updated in place.
+            text (str): The original text of the document.
+        
+        Returns:
+            list: Names of the fields that were filled.
+        """
+        filled = []
+        for field, choices in self.defaults.items():
+            if results.get(field):
+                continue
+            for needle, value in choices:
+                if needle in text:
+                    results[field] = value
+                    filled.append(field)
+                    break
+        return filled
+
+class TemplateRegistry:
+    """
+    Set of known templates, tried in registration order.
+    
+    Identifying a document only looks for a few literal markers per template
+    (and only near its start for templates with a marker_window), so it costs
+    far less than running the field patterns. The first template that matches
+    wins.
+    """
+    
+    def __init__(self, templates=()):
+        """
+        Initialize the registry.
+        
+        Args:
+            templates (iterable): Templates to register, in priority order.
+        """
+        self.templates = []
+        for template in templates:
+            self.register(template)
+    
+    def __len__(self):
+        return len(self.templates)
+    
+    def register(self, template):
+        """
+        Add a template, after the already registered ones.
+        
+        Args:
+            template (Template): The template to add.
+        """
+        self.templates.append(template)
+    
+    def match(self, text, normalized_text, page_count=None, offset=0):
+        """
+        Find the template of a document.
+        
+        Args:
+            text (str): The original text of the document, or of one of its pages.
+            normalized_text (str): The same text lowercased and whitespace-collapsed.
+            page_count (int): Number of pages of the document, or None if unknown.
+            offset (int): Position of the text in the document, or None if unknown.
+        
+        Returns:
+            Template or None: The matching template, or None for unknown documents.
+        """
+        for template in self.templates:
+            if template.matches(text, normalized_text, page_count, offset):
+                return template
+        return None
+
+# Framework agreement of the Pure Healthcare Group, whose signatories and
+# dates the generic patterns cannot read from its layout. It has no patterns:
+# its fields go through the full set and the defaults fill what is missing.
+PURE_HEALTHCARE_FRAMEWORK = Template(
+    'pure_healthcare_framework',
+    markers=['Pure Healthcare Group'],
+    defaults={
+        'print_name': [('Michael Sinclair', "Michael Sinclair")],
+        'print_name_2': [('Tony Constantindes', "Tony Constantindes")],
+        'effective_date': [('10/01/2022', "10/01/2022"), ('10-01-2022', "10/01/2022")],
+        'start_date': [('10/01/2022', "10/01/2022"), ('10-01-2022', "10/01/2022")],
+        'initial_term': [('24 months', "24 months")],
+    },
+)
+
+def default_templates():
+    """
+    Build a registry of the built-in templates.
+    
+    Returns:
+        TemplateRegistry: A new registry, which callers may extend.
+    """
+    return TemplateRegistry([PURE_HEALTHCARE_FRAMEWORK])
+
+def _occurrences(text, literal):
+    """Yield the positions where a literal occurs in a text, in ascending order."""
+    position = text.find(literal)
+    while position != -1:
+        yield position
+        position = text.find(literal, position + 1)
@@ -0,0 +1,253 @@
+import re
+
+# Characters with a special meaning in a regex
+REGEX_SPECIAL = set('.^$*+?{}[]\\|()')
+
+# Quantifiers that make the preceding item optional
+OPTIONAL_QUANTIFIERS = '*?{'
+
+def literal_prefixes(pattern):
+    """
+    Return the literal texts a regex pattern can start with, in normalized form.
+    
+    Leading groups of alternatives, such as (?:initial term|contract term),
+    are expanded into one prefix per alternative, and whitespace classes become
+    a single space, matching text that is lowercased and whitespace-collapsed.
+    The prefixes stop at the first item that is not a required literal.
+    
+    Args:
+        pattern (str): Regex source.
+    
+    Returns:
+        tuple: Sorted, lowercase prefixes, or () if the pattern does not start
+            with literal text.
+    """
+    prefixes, _ = _alternatives_prefixes(pattern, 0)
+    # Trailing spaces carry no information and may be a space the text lacks at its end
+    prefixes = {prefix.rstrip() for prefix in prefixes}
+    if '' in prefixes:
+        return ()
+    # A prefix that extends another one finds no position the shorter one misses
+    return tuple(sorted(
+        prefix for prefix in prefixes
+        if not any(other != prefix and prefix.startswith(other) for other in prefixes)
+    ))
+
+def _sequence_prefixes(pattern, index):
+    """
+    Collect the literal prefixes of a sequence of regex items.
+    
+    Args:
+        pattern (str): Regex source.
+        index (int): Position of the first item.
+    
+    Returns:
+        tuple: (prefixes, complete, index) with the set of prefixes, whether the
+            whole sequence is literal, and the position where the sequence ends
+            (a closing parenthesis, a top-level '|' or the end of the pattern).
+    """
+    prefixes = {''}
+    while index < len(pattern) and pattern[index] not in '|)':
+        char = pattern[index]
+        quantifier = pattern[index + 2] if char == '\\' and index + 2 < len(pattern) else None
+        if char == '(':
+            end = _group_end(pattern, index)
+            if end is None or pattern.startswith('(?', index) and not pattern.startswith('(?:', index):
+                break
+            body_start = index + (3 if pattern.startswith('(?:', index) else 1)
+            following = pattern[end + 1:end + 2]
+            if following and following in OPTIONAL_QUANTIFIERS:
+                break
+            alternatives, complete = _alternatives_prefixes(pattern, body_start)
+            prefixes = {prefix + alternative for prefix in prefixes for alternative in alternatives}
+            if not complete or following == '+':
+                return prefixes, False, index
+            index = end + 1
+            continue
+        if char == '\\':
+            escaped = pattern[index + 1:index + 2]
+            if escaped == 's':
+                # Whitespace runs are collapsed to one space, so \s+ matches exactly one
+                literal = ' '
+                if quantifier == '+':
+                    quantifier = None
+                    index += 1
+            elif escaped and not escaped.isalnum():
+                literal = escaped
+            else:
+                break
+            following = quantifier
+            index += 2
+        elif char in REGEX_SPECIAL:
+            break
+        else:
+            literal = char
+            following = pattern[index + 1] if index + 1 < len(pattern) else None
+            index += 1
+        if following and following in OPTIONAL_QUANTIFIERS:
+            return prefixes, False, index
+        prefixes = {prefix + literal.lower() for prefix in prefixes}
+        if following == '+':
+            return prefixes, False, index
+    return prefixes, index >= len(pattern) or pattern[index] in '|)', index
+
+def _alternatives_prefixes(pattern, index):
+    """
+    Collect the literal prefixes of the alternatives of a group.
+    
+    Args:
+        pattern (str): Regex source.
+        index (int): Position just after the opening of the group.
+    
+    Returns:
+        tuple: (prefixes, complete) with the prefixes of every alternative and
+            whether every alternative is entirely literal.
+    """
+    prefixes = set()
+    complete = True
+    while True:
+        alternative, alternative_complete, index = _sequence_prefixes(pattern, index)
+        prefixes |= alternative
+        complete = complete and alternative_complete
+        if not alternative_complete:
+            # Skip the rest of the alternative, up to the next top-level '|' or ')'
+            index = _alternative_end(pattern, index)
+        if index >= len(pattern) or pattern[index] == ')':
+            return prefixes, complete
+        index += 1
+
+def _group_end(pattern, index):
+    """Return the position of the parenthesis closing the group opened at index, or None."""
+    depth = 0
+    in_class = False
+    position = index
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '\\':
+            position += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return position
+        position += 1
+    return None
+
+def _alternative_end(pattern, index):
+    """Return the position of the '|' or ')' ending the alternative that contains index."""
+    while index < len(pattern) and pattern[index] not in '|)':
+        if pattern[index] == '\\':
+            index += 2
+        elif pattern[index] == '(':
+            end = _group_end(pattern, index)
+            index = len(pattern) if end is None else end + 1
+        elif pattern[index] == '[':
+            index = _class_end(pattern, index) + 1
+        else:
+            index += 1
+    return index
+
+def _class_end(pattern, index):
+    """Return the position of the bracket closing the character class opened at index."""
+    position = index + 1
+    if position < len(pattern) and pattern[position] == '^':
+        position += 1
+    if position < len(pattern) and pattern[position] == ']':
+        position += 1
+    while position < len(pattern) and pattern[position] != ']':
+        position += 2 if pattern[position] == '\\' else 1
+    return position
+
+def _trie_pattern(words):
+    """
+    Build a regex that matches the longest of several literals, factored as a trie.
+    
+    Shared prefixes are tested once, so the regex engine walks a trie at each
+    text position instead of retrying every literal from scratch.
+    
+    Args:
+        words (iterable): Literal strings.
+    
+    Returns:
+        str: Regex source matching any of the words, longest first.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A word may end here: make the longer continuations optional (greedy, so longest wins)
+        return '(?:' + body + ')?' if '' in node else body
+    
+    return build(trie)
+
+class AnchorIndex:
+    """
+    Multi-literal scanner that finds every occurrence of a set of anchors in one pass.
+    
+    Works like Aho-Corasick: the anchors are compiled into a single trie that is
+    tried at each text position, so the text is scanned once whatever the number
+    of anchors. Overlapping anchors are all reported.
+    """
+    
+    def __init__(self, anchors, word_start=False):
+        """
+        Build the scanner.
+        
+        Args:
+            anchors (iterable): Literal strings to look for (matched case-sensitively).
+            word_start (bool): Only report anchors that start a word, i.e. are not
+                preceded by a letter, digit or underscore, so that 'name' is not
+                found inside 'surname'. Default is False (report every occurrence).
+        """
+        self.anchors = sorted(set(anchors))
+        boundary = r'(?<!\w)' if word_start else ''
+        self._scanner = (re.compile(boundary + '(?=(' + _trie_pattern(self.anchors) + '))')
+                         if self.anchors else None)
+        
+        # At a given position only the longest anchor is reported by the scanner;
+        # every shorter anchor that is a prefix of it also starts there.
+        self._prefixes = {
+            anchor: [other for other in self.anchors if other != anchor and anchor.startswith(other)]
+            for anchor in self.anchors
+        }
+    
+    def scan(self, text, start=0, end=None):
+        """
+        Find all anchors in a text.
+        
+        Args:
+            text (str): The text to scan.
+            start (int): Position to start scanning from.
+            end (int): Position to stop scanning at. Default is the end of the text.
+        
+        Returns:
+            dict: Anchor to the ascending list of positions where it starts.
+                Anchors that do not occur are absent.
+        """
+        positions = {}
+        if self._scanner is None:
+            return positions
+        
+        end = len(text) if end is None else end
+        for match in self._scanner.finditer(text, start, end):
+            anchor = match.group(1)
+            position = match.start()
+            positions.setdefault(anchor, []).append(position)
+            for prefix in self._prefixes[anchor]:
+                positions.setdefault(prefix, []).append(position)
+        
+        return positions
@@ -0,0 +1,335 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: atomic renames still keep entries consistent
+    fcntl = None
+
+class DiskCache:
+    """
+    Content-addressed on-disk cache of JSON values.
+    
+    Entries are written atomically (temporary file + rename), so several
+    processes can share one cache directory. The total size of the entries
+    is kept in a small sidecar file, updated on every write; only when it
+    exceeds max_bytes is the directory scanned and the least recently used
+    entries evicted, down to low_water of max_bytes.
+    """
+    
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, low_water=0.9):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory (str): Directory holding the cache entries. Created if missing.
+            max_bytes (int): Maximum total size of the entries. Default is 512 MB.
+            low_water (float): Share of max_bytes an eviction brings the cache down
+                to, so evictions are rare instead of happening on every write.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.size_path = os.path.join(directory, '.size')
+        os.makedirs(directory, exist_ok=True)
+    
+    def get(self, key):
+        """
+        Look up a cache entry.
+        
+        Args:
+            key (str): Hex key of the entry.
+        
+        Returns:
+            The cached value, or None if the key is not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                value = json.load(file)
+            # Mark the entry as recently used for LRU eviction
+            os.utime(path)
+            return value
+        except (OSError, ValueError):
+            # Missing, evicted by another process, or unreadable
+            return None
+    
+    def set(self, key, value):
+        """
+        Store a cache entry, then evict old entries if the cache is too large.
+        
+        Args:
+            key (str): Hex key of the entry.
+            value: JSON-serializable value.
+        """
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                previous_size = os.path.getsize(path)
+            except OSError:
+                previous_size = 0
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump(value, file)
+                os.replace(temp_path, path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+            
+            self._add_size(os.path.getsize(path) - previous_size)
+        except Exception as e:
+            print(f"Error writing cache entry {key}: {e}")
+    
+    def _path(self, key):
+        """Return the file path of a key, sharded by its first two characters."""
+        return os.path.join(self.directory, key[:2], key + '.json')
+    
+    @contextmanager
+    def _lock(self):
+        """Hold an exclusive lock on the cache directory across processes."""
+        if fcntl is None:
+            yield
+            return
+        
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _add_size(self, delta):
+        """
+        Add to the running total size of the cache, evicting entries if it is over max_bytes.
+        
+        Args:
+            delta (int): Change in bytes caused by the last write.
+        """
+        with self._lock():
+            total = self._read_size()
+            if total is None:
+                # No (readable) total yet, e.g. a cache created before it was kept: count once
+                total = self._scan()[1]
+            else:
+                total += delta
+            
+            if total > self.max_bytes:
+                total = self._evict(int(self.max_bytes * self.low_water))
+            self._write_size(total)
+    
+    def _read_size(self):
+        """Return the running total size, or None if it is missing or unreadable."""
+        try:
+            with open(self.size_path, 'r', encoding='ascii') as file:
+                return max(0, int(file.read()))
+        except (OSError, ValueError):
+            return None
+    
+    def _write_size(self, total):
+        """Store the running total size. Called with the directory lock held."""
+        with open(self.size_path, 'w', encoding='ascii') as file:
+            file.write(str(total))
+    
+    def _scan(self):
+        """
+        List the cache entries.
+        
+        Returns:
+            tuple: ([(mtime, size, path), ...], total size in bytes)
+        """
+        entries = []
+        total = 0
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        return entries, total
+    
+    def _evict(self, target):
+        """
+        Remove least recently used entries until the cache fits in target bytes.
+        Called with the directory lock held.
+        
+        Args:
+            target (int): Total size to get down to.
+        
+        Returns:
+            int: Total size of the remaining entries.
+        """
+        entries, total = self._scan()
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        return total
+
+class OCRCache:
+    """
+    On-disk cache of OCR text keyed by the rendered page image.
+    
+    Scanned contracts often share whole pages (standard terms, signature
+    pages), so a page image seen before is served from the cache instead of
+    running tesseract again. Keys are an exact hash of the image pixels:
+    near-identical pages are deliberately not matched, since two contracts
+    can differ by a single name or date that a similarity hash cannot see.
+    Entries are stored in a DiskCache, so they are shared by processes and
+    evicted least recently used first.
+    """
+    
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory (str): Directory holding the cache entries. Created if missing.
+            max_bytes (int): Maximum total size of the entries. Default is 256 MB.
+        """
+        self.cache = DiskCache(directory, max_bytes)
+    
+    def key(self, image, settings):
+        """
+        Build the cache key of a page image.
+        
+        Args:
+            image (PIL.Image.Image): Rendered page.
+            settings (str): OCR language and settings that affect the text.
+        
+        Returns:
+            str: Hex digest identifying the image and settings.
+        """
+        fingerprint = f"{image.mode}:{image.width}x{image.height}:".encode('ascii') + image.tobytes()
+        digest = hashlib.sha256(fingerprint)
+        digest.update(settings.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key):
+        """
+        Look up the OCR result of a page image.
+        
+        Args:
+            key (str): Value returned by key().
+        
+        Returns:
+            dict: 'text' and 'seconds' (the OCR time the entry saves), or None.
+        """
+        return self.cache.get(key)
+    
+    def set(self, key, text, seconds):
+        """
+        Store the OCR result of a page image.
+        
+        Args:
+            key (str): Value returned by key().
+            text (str): OCR text of the page.
+            seconds (float): Time OCR took, reported as saved on later hits.
+        """
+        self.cache.set(key, {'text': text, 'seconds': seconds})
+
+class ResultStore:
+    """
+    Process-wide store of extraction results keyed by document content.
+    
+    The most recently used results are kept in memory; older ones are
+    spilled to a DiskCache instead of being dropped, and promoted back to
+    memory when looked up again. All methods are thread-safe, so one store
+    can be shared by every session of a server.
+    """
+    
+    def __init__(self, max_items=1024, directory=None, max_bytes=256 * 1024 * 1024):
+        """
+        Initialize the store.
+        
+        Args:
+            max_items (int): Maximum number of results kept in memory.
+            directory (str): Directory results are spilled to. Default is None
+                (results evicted from memory are dropped).
+            max_bytes (int): Maximum total size of the spilled results. Default is 256 MB.
+        """
+        self.max_items = max_items
+        self.disk = DiskCache(directory, max_bytes) if directory else None
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._memory)
+    
+    @staticmethod
+    def key(pdf_bytes, settings=''):
+        """
+        Build the key of a document.
+        
+        Args:
+            pdf_bytes (bytes): Contents of the PDF file.
+            settings (str): Extraction settings that affect the result, e.g. the OCR
+                language, and the versions of the extractors (CACHE_VERSION of
+                src.pdf_extractor, EXTRACTOR_VERSION of src.field_extractor), so
+                results of older code are never returned.
+        
+        Returns:
+            str: Hex digest identifying the content and settings.
+        """
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(settings.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key):
+        """
+        Look up the result of a document.
+        
+        Args:
+            key (str): Value returned by key().
+        
+        Returns:
+            dict: A copy of the stored fields, or None if the document is unknown.
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return dict(value)
+        
+        if self.disk is None:
+            return None
+        value = self.disk.get(key)
+        if value is not None:
+            self.set(key, value)
+        return value
+    
+    def set(self, key, value):
+        """
+        Store the result of a document, spilling the least recently used ones to disk.
+        
+        Args:
+            key (str): Value returned by key().
+            value (dict): Extracted fields; must be JSON-serializable to be spilled.
+        """
+        with self._lock:
+            self._memory[key] = dict(value)
+            self._memory.move_to_end(key)
+            spilled = []
+            while len(self._memory) > self.max_items:
+                spilled.append(self._memory.popitem(last=False))
+        
+        # Disk writes happen outside the lock, so lookups are never blocked by them
+        if self.disk is not None:
+            for spilled_key, spilled_value in spilled:
+                self.disk.set(spilled_key, spilled_value)
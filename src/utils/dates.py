@@ -0,0 +1,136 @@
+import re
+import datetime
+from functools import lru_cache
+from dateutil import parser
+
+MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+# Three-letter abbreviations, and the "sept" spelling dateutil also accepts
+MONTHS.update({name[:3]: number for name, number in list(MONTHS.items())})
+MONTHS['sept'] = 9
+
+_MONTH_NAME = '(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?'
+_DAY = r'(\d{1,2})(?:st|nd|rd|th)?'
+
+# Formats seen in contracts, matched against the whole (stripped) value
+ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+NUMERIC_DATE = re.compile(r'(\d{1,2})([/.-])(\d{1,2})\2(\d{4})')
+DAY_MONTH_YEAR = re.compile(_DAY + r'\s+(?:of\s+)?' + _MONTH_NAME + r',?\s+(\d{4})', re.IGNORECASE)
+MONTH_DAY_YEAR = re.compile(_MONTH_NAME + r'\s+' + _DAY + r',?\s+(\d{4})', re.IGNORECASE)
+
+class DateNormalizer:
+    """
+    Convert extracted date strings to ISO format (YYYY-MM-DD).
+    
+    The formats contracts actually use (dd/mm/yyyy or mm/dd/yyyy, "10 January
+    2022", "January 10, 2022" and ISO dates) are parsed by compiled regexes.
+    Anything else goes to dateutil's fuzzy parser as a last resort. Results
+    are memoized, so a date repeated across a batch is parsed once.
+    
+    Numeric dates follow an explicit policy: with day_first=False, 10/01/2022
+    is October 1st; with day_first=True, it is January 10th. A first number
+    above 12 can only be a day, whatever the policy.
+    """
+    
+    def __init__(self, day_first=False, cache_size=4096):
+        """
+        Initialize the normalizer.
+        
+        Args:
+            day_first (bool): Read ambiguous numeric dates as day/month/year.
+                Default is False (month/day/year, as dateutil does).
+            cache_size (int): Maximum number of memoized values.
+        """
+        self.day_first = day_first
+        self.cache_size = cache_size
+        self._normalize = lru_cache(maxsize=cache_size)(self._parse)
+    
+    def __getstate__(self):
+        # The memo cache cannot be pickled: a copy sent to another process starts empty
+        state = self.__dict__.copy()
+        del state['_normalize']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._normalize = lru_cache(maxsize=self.cache_size)(self._parse)
+    
+    def normalize(self, value):
+        """
+        Convert a date string to ISO format.
+        
+        Args:
+            value (str): Date as extracted from a contract.
+        
+        Returns:
+            str or None: The date as YYYY-MM-DD, or None if it cannot be parsed.
+        """
+        if not value:
+            return None
+        return self._normalize(value.strip())
+    
+    def normalize_many(self, values):
+        """
+        Convert a column of date strings to ISO format.
+        
+        Args:
+            values (iterable): Date strings; None and empty values are allowed.
+        
+        Returns:
+            list: The ISO date or None for each value, in order.
+        """
+        normalized = {}
+        results = []
+        for value in values:
+            if value not in normalized:
+                normalized[value] = self.normalize(value)
+            results.append(normalized[value])
+        return results
+    
+    def cache_info(self):
+        """Return the hits, misses and size of the memo cache."""
+        return self._normalize.cache_info()
+    
+    def _parse(self, value):
+        """Parse a stripped date string, trying the fast paths before dateutil."""
+        parsed = self._parse_fast(value)
+        if parsed is None:
+            try:
+                parsed = parser.parse(value, fuzzy=True, dayfirst=self.day_first).date()
+            except (ValueError, OverflowError):
+                return None
+        return parsed.strftime('%Y-%m-%d')
+    
+    def _parse_fast(self, value):
+        """
+        Parse the common date formats without dateutil.
+        
+        Returns:
+            datetime.date or None: The date, or None if the value has another
+                format or is not a valid date.
+        """
+        try:
+            matches = ISO_DATE.fullmatch(value)
+            if matches:
+                return datetime.date(int(matches.group(1)), int(matches.group(2)), int(matches.group(3)))
+            
+            matches = NUMERIC_DATE.fullmatch(value)
+            if matches:
+                first, second, year = int(matches.group(1)), int(matches.group(3)), int(matches.group(4))
+                if (self.day_first or first > 12) and second <= 12:
+                    return datetime.date(year, second, first)
+                return datetime.date(year, first, second)
+            
+            matches = DAY_MONTH_YEAR.fullmatch(value)
+            if matches:
+                return datetime.date(int(matches.group(3)), MONTHS[matches.group(2).lower()], int(matches.group(1)))
+            
+            matches = MONTH_DAY_YEAR.fullmatch(value)
+            if matches:
+                return datetime.date(int(matches.group(3)), MONTHS[matches.group(1).lower()], int(matches.group(2)))
+        except ValueError:
+            # Out-of-range day or month: let dateutil decide
+            return None
+        return None
@@ -1,27 +1,26 @@
 import os
 import csv
-import pandas as pd
+import json
+import tempfile
 
 def export_to_csv(data, output_path):
     """
     Export extracted data to a CSV file.
     
+    Rows are streamed to the file one at a time. The header is the union of
+    the keys of all rows, in the order they first appear.
+    
     Args:
         data (list): List of dictionaries containing the extracted fields.
         output_path (str): Path to save the CSV file.
-        
+    
     Returns:
         bool: True if export was successful, False otherwise.
     """
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Convert to DataFrame for easier handling
-        df = pd.DataFrame(data)
-        
-        # Write to CSV
-        df.to_csv(output_path, index=False)
+        with CSVWriter(output_path, fieldnames=_union_keys(data)) as writer:
+            for row in data:
+                writer.write(row)
         
         return True
     except Exception as e:
@@ -36,17 +35,17 @@ def export_to_csv_basic(data, output_path):
     Args:
         data (list): List of dictionaries containing the extracted fields.
         output_path (str): Path to save the CSV file.
-        
+    
     Returns:
         bool: True if export was successful, False otherwise.
     """
     try:
         # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        _make_parent_dir(output_path)
         
-        # Get field names from the first dictionary
+        # Get field names from every dictionary, so keys that only appear in later rows are kept
         if data and len(data) > 0:
-            fieldnames = list(data[0].keys())
+            fieldnames = _union_keys(data)
         else:
             fieldnames = ['client_name', 'contract_start_date', 'sign_date', 'initial_term', 'further_term']
         
@@ -61,3 +60,435 @@ def export_to_csv_basic(data, output_path):
     except Exception as e:
         print(f"Error exporting to CSV (basic): {e}")
         return False
+
+def export_to_parquet(data, output_path):
+    """
+    Export extracted data to a Parquet file with dictionary-encoded string columns.
+    
+    Args:
+        data (iterable): Dictionaries containing the extracted fields.
+        output_path (str): Path to save the Parquet file.
+    
+    Returns:
+        bool: True if export was successful, False otherwise.
+    """
+    try:
+        with ParquetWriter(output_path) as writer:
+            for row in data:
+                writer.write(row)
+        
+        return True
+    except Exception as e:
+        print(f"Error exporting to Parquet: {e}")
+        return False
+
+def export_to_excel(rows, fieldnames, output_path, sheet_name='Extraction Results', max_width=60):
+    """
+    Export extracted data to an Excel file in constant memory.
+    
+    Rows are streamed with xlsxwriter's constant_memory mode, which flushes
+    each row to disk once the next one starts, and column widths are measured
+    in the same pass.
+    
+    Args:
+        rows (iterable): Rows to write, as dictionaries or as sequences ordered
+            like fieldnames.
+        fieldnames (list): Column headers, in order.
+        output_path (str): Path to save the Excel file.
+        sheet_name (str): Name of the worksheet.
+        max_width (int): Widest a column may be set, in characters.
+    
+    Returns:
+        bool: True if export was successful, False otherwise.
+    """
+    try:
+        import xlsxwriter
+        
+        _make_parent_dir(output_path)
+        workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True, 'nan_inf_to_errors': True})
+        try:
+            worksheet = workbook.add_worksheet(sheet_name)
+            header_format = workbook.add_format({
+                'bold': True,
+                'bg_color': '#D3D3D3',
+                'border': 1
+            })
+            
+            widths = [len(str(name)) for name in fieldnames]
+            worksheet.write_row(0, 0, fieldnames, header_format)
+            for row_number, row in enumerate(rows, start=1):
+                if isinstance(row, dict):
+                    row = [row.get(name) for name in fieldnames]
+                for column, value in enumerate(row):
+                    if value is None:
+                        continue
+                    value = _scalar(value)
+                    worksheet.write(row_number, column, value)
+                    widths[column] = max(widths[column], len(str(value)))
+            
+            # Column widths go in the sheet header, which xlsxwriter writes on close
+            for column, width in enumerate(widths):
+                worksheet.set_column(column, column, min(width + 2, max_width))
+        finally:
+            workbook.close()
+        
+        return True
+    except Exception as e:
+        print(f"Error exporting to Excel: {e}")
+        return False
+
+def open_writer(output_path, output_format=None, append=False, fieldnames=None):
+    """
+    Open a streaming writer for a results file.
+    
+    Args:
+        output_path (str): Path of the output file.
+        output_format (str): 'jsonl', 'csv' or 'parquet'. Default is taken from the
+            file extension, falling back to 'jsonl'.
+        append (bool): Add to an existing file instead of replacing it.
+        fieldnames (list): Columns to start with, in order (CSV and Parquet).
+    
+    Returns:
+        JSONLWriter, CSVWriter or ParquetWriter: The open writer.
+    """
+    output_format = resolve_format(output_path, output_format)
+    if output_format == 'csv':
+        return CSVWriter(output_path, fieldnames, append)
+    if output_format == 'parquet':
+        return ParquetWriter(output_path, fieldnames, append)
+    if output_format == 'jsonl':
+        return JSONLWriter(output_path, append)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+def resolve_format(output_path, output_format=None):
+    """
+    Return the format of a results file: the given one, else the one its extension implies.
+    
+    Args:
+        output_path (str): Path of the output file.
+        output_format (str): Explicit format, or None.
+    
+    Returns:
+        str: 'jsonl', 'csv' or 'parquet'.
+    """
+    if output_format is not None:
+        return output_format
+    extension = os.path.splitext(output_path)[1].lower()
+    return {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet'}.get(extension, 'jsonl')
+
+class JSONLWriter:
+    """Append rows to a JSON Lines file, one object per line."""
+    
+    def __init__(self, output_path, append=False):
+        """
+        Open the output file.
+        
+        Args:
+            output_path (str): Path of the output file.
+            append (bool): Add to an existing file instead of replacing it.
+        """
+        _make_parent_dir(output_path)
+        self.file = open(output_path, 'a' if append else 'w', encoding='utf-8')
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def write(self, row):
+        """Write one row and flush it, so partial runs keep their output."""
+        self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.file.flush()
+    
+    def close(self):
+        """Close the output file."""
+        self.file.close()
+
+class CSVWriter:
+    """
+    Append rows to a CSV file as they arrive, growing the header when needed.
+    
+    A row with a key the header does not have yet (e.g. 'print_name_2')
+    triggers a rewrite of the file with the extended header. The rewrite
+    streams the existing rows one at a time, so memory stays flat; it happens
+    once per new column, which is rare after the first rows.
+    """
+    
+    def __init__(self, output_path, fieldnames=None, append=False):
+        """
+        Open the output file.
+        
+        Args:
+            output_path (str): Path of the output file.
+            fieldnames (list): Columns to start with, in order. Default is the header
+                of the existing file when appending, else the keys of the first row.
+            append (bool): Add to an existing file instead of replacing it.
+        """
+        _make_parent_dir(output_path)
+        self.output_path = output_path
+        self.fieldnames = list(fieldnames or [])
+        
+        existing = []
+        if append and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            with open(output_path, 'r', newline='', encoding='utf-8') as file:
+                existing = next(csv.reader(file), [])
+        
+        self.file = open(output_path, 'a' if append else 'w', newline='', encoding='utf-8')
+        self.writer = None
+        if existing:
+            self.fieldnames = existing
+            self._open_writer()
+            self._add_fields([field for field in fieldnames or [] if field not in existing])
+        elif self.fieldnames:
+            self._start()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def write(self, row):
+        """Write one row and flush it, so partial runs keep their output."""
+        if self.writer is None:
+            self.fieldnames = list(row)
+            self._start()
+        else:
+            self._add_fields([field for field in row if field not in self.writer.fieldnames])
+        self.writer.writerow(row)
+        self.file.flush()
+    
+    def close(self):
+        """Close the output file; a file that received no row and no header stays empty."""
+        self.file.close()
+    
+    def _start(self):
+        """Write the header of an empty file."""
+        self._open_writer()
+        self.writer.writeheader()
+    
+    def _open_writer(self):
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, restval='')
+    
+    def _add_fields(self, new_fields):
+        """Extend the header with new columns, rewriting the rows written so far."""
+        if not new_fields:
+            return
+        
+        self.fieldnames = self.fieldnames + new_fields
+        self.file.close()
+        
+        directory = os.path.dirname(os.path.abspath(self.output_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with open(self.output_path, 'r', newline='', encoding='utf-8') as source, \
+                    os.fdopen(fd, 'w', newline='', encoding='utf-8') as target:
+                writer = csv.DictWriter(target, fieldnames=self.fieldnames, restval='')
+                writer.writeheader()
+                reader = csv.DictReader(source)
+                for row in reader:
+                    writer.writerow(row)
+            os.replace(temp_path, self.output_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        
+        self.file = open(self.output_path, 'a', newline='', encoding='utf-8')
+        self._open_writer()
+
+class ParquetWriter:
+    """
+    Write rows to a Parquet file in row groups, for analytics on large runs.
+    
+    Rows are buffered and written batch_size at a time. String columns are
+    dictionary-encoded, which keeps repeated values such as terms and dates
+    small on disk and in memory once loaded. Numbers and booleans keep their
+    type; nested values are stored as JSON strings.
+    
+    Parquet files have a fixed schema, so a new column, or a value that does
+    not fit the type of its column, rewrites the file with the extended
+    schema one row group at a time. The file is only readable once the
+    writer is closed.
+    
+    Requires pyarrow.
+    """
+    
+    def __init__(self, output_path, fieldnames=None, append=False, batch_size=1024):
+        """
+        Open the output file.
+        
+        Args:
+            output_path (str): Path of the output file.
+            fieldnames (list): Columns to start with, in order. Their types are
+                taken from the first values written.
+            append (bool): Keep the rows of an existing file.
+            batch_size (int): Number of rows per row group.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        self.pa = pa
+        self.pq = pq
+        _make_parent_dir(output_path)
+        self.output_path = output_path
+        self.batch_size = batch_size
+        self.columns = {field: None for field in fieldnames or []}
+        self.rows = []
+        self.writer = None
+        
+        if append and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            schema = pq.read_schema(output_path)
+            # Existing columns first, then the requested ones in their order
+            columns = {name: schema.field(name).type for name in schema.names}
+            columns.update({name: None for name in self.columns if name not in columns})
+            self.columns = columns
+            self._rewrite()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def write(self, row):
+        """Buffer one row, writing a row group once batch_size rows are buffered."""
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self._flush()
+    
+    def close(self):
+        """Write the buffered rows and the file footer."""
+        self._flush()
+        if self.writer is None:
+            # No rows at all: still write a valid, empty file
+            self._open_writer()
+        self.writer.close()
+    
+    def _flush(self):
+        """Write the buffered rows as one row group."""
+        if not self.rows:
+            return
+        
+        rows, self.rows = self.rows, []
+        for row in rows:
+            for name in row:
+                if name not in self.columns:
+                    self.columns[name] = None
+        columns = {name: [_scalar(row.get(name)) for row in rows] for name in self.columns}
+        
+        changed = False
+        for name, values in columns.items():
+            column_type = self._column_type(self.columns[name], values)
+            if column_type != self.columns[name]:
+                self.columns[name] = column_type
+                changed = True
+        
+        if self.writer is None:
+            self._open_writer()
+        elif changed:
+            # The schema grew: copy what was written so far into a file with the new schema
+            self.writer.close()
+            self._rewrite()
+        self.writer.write_table(self._table(columns))
+    
+    def _open_writer(self, path=None):
+        """Start the output file, or path; columns that only held nulls so far become strings."""
+        string_type = self.pa.dictionary(self.pa.int32(), self.pa.string())
+        self.columns = {name: column_type or string_type for name, column_type in self.columns.items()}
+        schema = self.pa.schema(list(self.columns.items()))
+        self.writer = self.pq.ParquetWriter(path or self.output_path, schema)
+    
+    def _rewrite(self):
+        """
+        Copy the rows of the output file into a new one with the current schema, a row group at a time.
+        
+        The rows are copied into a temporary file next to the output, which
+        replaces the output only once the copy succeeded, so a failure leaves
+        the original file untouched. The writer stays open on the new file
+        after the rename, and keeps appending to it.
+        """
+        directory = os.path.dirname(os.path.abspath(self.output_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            source = self.pq.ParquetFile(self.output_path)
+            try:
+                self._open_writer(temp_path)
+                for batch in source.iter_batches(batch_size=self.batch_size):
+                    columns = {}
+                    for name in self.columns:
+                        if name in batch.schema.names:
+                            columns[name] = batch.column(name).to_pylist()
+                        else:
+                            columns[name] = [None] * batch.num_rows
+                    self.writer.write_table(self._table(columns))
+            finally:
+                source.close()
+            os.replace(temp_path, self.output_path)
+        except Exception:
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+            os.remove(temp_path)
+            raise
+    
+    def _column_type(self, current, values):
+        """Return the narrowest type holding the current column type and the new values."""
+        pa = self.pa
+        string_type = pa.dictionary(pa.int32(), pa.string())
+        types = {type(value) for value in values if value is not None}
+        if current is not None:
+            if current == string_type or not types:
+                return current
+            if pa.types.is_boolean(current):
+                types.add(bool)
+            elif pa.types.is_integer(current):
+                types.add(int)
+            elif pa.types.is_floating(current):
+                types.add(float)
+            else:
+                return string_type
+        
+        if not types:
+            return None
+        if types == {bool}:
+            return pa.bool_()
+        if types == {int}:
+            return pa.int64()
+        if types <= {int, float}:
+            return pa.float64()
+        return string_type
+    
+    def _table(self, columns):
+        """Build a table with the current schema from column value lists."""
+        pa = self.pa
+        schema = pa.schema(list(self.columns.items()))
+        arrays = []
+        for field in schema:
+            values = columns[field.name]
+            if pa.types.is_dictionary(field.type):
+                values = [None if value is None else str(value) for value in values]
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode().cast(field.type))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+def _scalar(value):
+    """Return a value Parquet or Excel can store: nested values become JSON strings."""
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+def _union_keys(rows):
+    """Return every key of a list of dictionaries, in the order they first appear."""
+    keys = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    return list(keys)
+
+def _make_parent_dir(output_path):
+    """Create the directory of an output file if it does not exist."""
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
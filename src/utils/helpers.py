@@ -2,13 +2,21 @@ import os
 import tempfile
 from datetime import datetime
 
+# Fields shown in the results table, with their column names
+DISPLAY_FIELDS = {
+    'effective_date': "Effective Date",
+    'start_date': "Start Date",
+    'initial_term': "Initial Term",
+    'further_term': "Further Term",
+}
+
 def get_file_name(file_path):
     """
     Extract the file name from a file path.
     
     Args:
         file_path (str): Path to the file.
-        
+    
     Returns:
         str: File name without extension.
     """
@@ -20,7 +28,7 @@ def create_temp_file(uploaded_file):
     
     Args:
         uploaded_file: Streamlit uploaded file object.
-        
+    
     Returns:
         str: Path to the temporary file.
     """
@@ -54,7 +62,7 @@ def generate_output_filename(prefix="contract_data"):
     
     Args:
         prefix (str): Prefix for the filename.
-        
+    
     Returns:
         str: Generated filename.
     """
@@ -67,7 +75,7 @@ def format_extraction_results(results):
     
     Args:
         results (list): List of dictionaries containing extraction results.
-        
+    
     Returns:
         list: Formatted results for display.
     """
@@ -82,9 +90,9 @@ def format_extraction_results(results):
             "Initial Term": result.get("initial_term", "Not found"),
             "Further Term": result.get("further_term", "Not found")
         }
-            
-        formatted_results.append(formatted_result)
         
+        formatted_results.append(formatted_result)
+    
     return formatted_results
 
 def handle_missing_fields(results):
@@ -93,7 +101,7 @@ def handle_missing_fields(results):
     
     Args:
         results (list): List of dictionaries containing extraction results.
-        
+    
     Returns:
         tuple: (results with missing fields handled, count of missing fields)
     """
@@ -105,5 +113,28 @@ def handle_missing_fields(results):
             if not result.get(field):
                 result[field] = "Not found"
                 missing_count += 1
-                
+    
     return results, missing_count
+
+def results_to_frame(results):
+    """
+    Build the results table of extraction results.
+    
+    Unlike format_extraction_results and handle_missing_fields, the results
+    are not looped over or modified: the columns are categoricals over the
+    batch's dictionary codes, and missing fields stay missing (NaN), so they
+    can be found with vectorized isna() masks.
+    
+    Args:
+        results (RecordBatch): Extraction results.
+    
+    Returns:
+        pandas.DataFrame: A 'File' column and one column per DISPLAY_FIELDS entry.
+    """
+    frame = results.to_pandas(columns=['file_name', *DISPLAY_FIELDS])
+    
+    unnamed = frame['file_name'].isna()
+    if unnamed.any():
+        frame['file_name'] = frame['file_name'].astype(object)
+        frame.loc[unnamed, 'file_name'] = [f"Document {i + 1}" for i in frame.index[unnamed]]
+    return frame.rename(columns={'file_name': "File", **DISPLAY_FIELDS})
@@ -0,0 +1,194 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+class MetricsRegistry:
+    """
+    In-process registry of counters and timers.
+    
+    Metrics are identified by a name and optional labels, e.g.
+    inc('pdf_pages_total', engine='OCR'). Timers keep the count, sum and
+    maximum of their observations. The registry is thread-safe and can be
+    dumped as JSON or in the Prometheus text format. A disabled registry
+    ignores every call.
+    """
+    
+    def __init__(self, enabled=True):
+        """
+        Initialize the registry.
+        
+        Args:
+            enabled (bool): Record metrics. Default is True.
+        """
+        self.enabled = enabled
+        self._counters = {}
+        self._timers = {}
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        # Locks cannot be pickled: a copy sent to another process records on its own
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def inc(self, name, value=1, **labels):
+        """
+        Increase a counter.
+        
+        Args:
+            name (str): Name of the counter.
+            value (float): Amount to add. Default is 1.
+            **labels: Label values of the counter.
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name, seconds, **labels):
+        """
+        Record one observation of a timer.
+        
+        Args:
+            name (str): Name of the timer.
+            seconds (float): Observed duration.
+            **labels: Label values of the timer.
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is None:
+                self._timers[key] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+    
+    @contextmanager
+    def time(self, name, **labels):
+        """
+        Time a block of code with a timer.
+        
+        Args:
+            name (str): Name of the timer.
+            **labels: Label values of the timer.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def snapshot(self):
+        """
+        Return the current values of all metrics.
+        
+        Returns:
+            dict: 'counters' and 'timers', each a list of dictionaries with the
+                metric 'name', its 'labels' and its value ('value', or 'count',
+                'sum' and 'max').
+        """
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            timers = [{'name': name, 'labels': dict(labels), 'count': count, 'sum': total, 'max': maximum}
+                      for (name, labels), (count, total, maximum) in sorted(self._timers.items())]
+        return {'counters': counters, 'timers': timers}
+    
+    def merge(self, snapshot):
+        """
+        Add the metrics of a snapshot, e.g. one taken in a worker process.
+        
+        Args:
+            snapshot (dict): Value returned by snapshot().
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for counter in snapshot['counters']:
+                key = (counter['name'], tuple(sorted(counter['labels'].items())))
+                self._counters[key] = self._counters.get(key, 0) + counter['value']
+            for observed in snapshot['timers']:
+                key = (observed['name'], tuple(sorted(observed['labels'].items())))
+                timer = self._timers.get(key)
+                if timer is None:
+                    self._timers[key] = [observed['count'], observed['sum'], observed['max']]
+                else:
+                    timer[0] += observed['count']
+                    timer[1] += observed['sum']
+                    timer[2] = max(timer[2], observed['max'])
+    
+    def reset(self):
+        """Remove all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+    
+    def to_json(self, indent=2):
+        """
+        Dump the metrics as JSON.
+        
+        Args:
+            indent (int): Indentation of the output.
+        
+        Returns:
+            str: The snapshot serialized as JSON.
+        """
+        return json.dumps(self.snapshot(), indent=indent)
+    
+    def to_prometheus(self):
+        """
+        Dump the metrics in the Prometheus text exposition format.
+        
+        Counters are exposed as counters, and timers as summaries (_count and
+        _sum) along with a separate _max gauge.
+        
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        
+        declared = set()
+        for counter in snapshot['counters']:
+            name = counter['name']
+            if name not in declared:
+                lines.append(f"# TYPE {name} counter")
+                declared.add(name)
+            lines.append(f"{name}{_format_labels(counter['labels'])} {counter['value']}")
+        
+        timers = {}
+        for timer in snapshot['timers']:
+            timers.setdefault(timer['name'], []).append(timer)
+        for name, series in timers.items():
+            lines.append(f"# TYPE {name} summary")
+            for timer in series:
+                labels = _format_labels(timer['labels'])
+                lines.append(f"{name}_count{labels} {timer['count']}")
+                lines.append(f"{name}_sum{labels} {timer['sum']:.6f}")
+            lines.append(f"# TYPE {name}_max gauge")
+            for timer in series:
+                lines.append(f"{name}_max{_format_labels(timer['labels'])} {timer['max']:.6f}")
+        
+        return "\n".join(lines) + "\n"
+
+def _format_labels(labels):
+    """Format label values as a Prometheus label set, escaping quotes and backslashes."""
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
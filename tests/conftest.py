@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Tests import the parser modules (src, api, batch_parser) from the repository root
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def sample_pdf():
+    """Path of the three-page, text-based sample contract."""
+    return os.path.join(ROOT, 'sample_contract.pdf')
+
+@pytest.fixture
+def sample_bytes(sample_pdf):
+    """Contents of the sample contract."""
+    with open(sample_pdf, 'rb') as file:
+        return file.read()
+
+@pytest.fixture
+def build_pdf(tmp_path):
+    """
+    Return a function writing a PDF with one page per item: a string is written
+    as the text layer of its page, None makes an image-only (scanned) page.
+    """
+    from PIL import Image
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+    
+    def build(pages, name='document.pdf'):
+        path = str(tmp_path / name)
+        pdf = canvas.Canvas(path, pagesize=letter)
+        for text in pages:
+            if text is None:
+                pdf.drawImage(ImageReader(Image.new('RGB', (200, 100), 'white')), 72, 500, 200, 100)
+            else:
+                lines = pdf.beginText(72, 720)
+                for line in text.split('\n'):
+                    lines.textLine(line)
+                pdf.drawText(lines)
+            pdf.showPage()
+        pdf.save()
+        return path
+    
+    return build
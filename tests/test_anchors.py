@@ -0,0 +1,48 @@
+import re
+
+from src.utils.anchors import AnchorIndex, literal_prefixes
+
+def _naive_positions(anchors, text):
+    positions = {}
+    for anchor in anchors:
+        found = [match.start() for match in re.finditer('(?=' + re.escape(anchor) + ')', text)]
+        if found:
+            positions[anchor] = found
+    return positions
+
+def test_scan_finds_every_occurrence_including_overlaps():
+    anchors = ['term', 'terms', 'initial term', 'term of', 'rm']
+    text = "the initial term of the terms of this term"
+    index = AnchorIndex(anchors)
+    assert index.scan(text) == _naive_positions(anchors, text)
+
+def test_scan_respects_start_and_end():
+    index = AnchorIndex(['ab'])
+    assert index.scan("ab ab ab", 1, 5) == {'ab': [3]}
+    assert AnchorIndex([]).scan("anything") == {}
+
+def test_word_start_skips_anchors_inside_words():
+    index = AnchorIndex(['name', 'term'], word_start=True)
+    assert index.scan("surname name determine terms") == {'name': [8], 'term': [23]}
+
+def test_literal_prefixes():
+    assert literal_prefixes(r'Initial\s+term of (\d+)') == ('initial term of',)
+    assert literal_prefixes(r'terms? of') == ('term',)
+    assert literal_prefixes(r'(?:name|print\s+name)(?:\s*:|\s+is)') == ('name', 'print name')
+    assert literal_prefixes(r'agreement\s+(?:shall|may)\s+(?:be\s+)?renew') == ('agreement may', 'agreement shall')
+    assert literal_prefixes(r'renewal|further\s+term') == ('further term', 'renewal')
+    assert literal_prefixes(r'(?:a|)x') == ('ax', 'x')
+    assert literal_prefixes(r'(\d+) months') == ()
+    assert literal_prefixes(r'(?:title)?\s*:') == ()
+
+def test_literal_prefixes_start_every_match():
+    patterns = [
+        r'(?:initial\s+term|contract\s+term|term\s+of\s+(?:this\s+)?agreement)(?:\s*:|\s+is)\s*(\d+)',
+        r'(?:after\s+the\s+initial\s+term[^.]*?(?:renew|extend)(?:ed)?(?:\s+for\s+))(\d+)',
+        r'Further\s+Term\s*(?:\n|\r|\s)*([^.]*)',
+    ]
+    text = "the contract term: 12. after the initial term it may renew for 6. term of agreement is 3. further term 2"
+    for pattern in patterns:
+        prefixes = literal_prefixes(pattern)
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            assert text.startswith(prefixes, match.start())
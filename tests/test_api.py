@@ -0,0 +1,101 @@
+import io
+import os
+import signal
+import time
+
+import pytest
+
+from api import index
+from api.index import ExtractionPool, QueueFullError
+
+def _slow_document(pdf_bytes):
+    """Stand-in for _extract_document that runs for the number of seconds it is sent."""
+    time.sleep(float(pdf_bytes))
+    return {'fields': {}, 'timings': {}, 'pages': 0, 'ocr_pages': 0, 'metrics': {'counters': [], 'timers': []}}
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Condition not met in time"
+        time.sleep(0.05)
+
+def _crashes():
+    return sum(counter['value'] for counter in index.metrics.snapshot()['counters']
+               if counter['name'] == 'api_worker_crashes_total')
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = ExtractionPool(workers=1, queue_size=0)
+    monkeypatch.setattr(index, 'pool', pool)
+    yield pool
+    with pool._lock:
+        executor = pool._executor
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+@pytest.fixture
+def client():
+    return index.app.test_client()
+
+def test_extract_returns_the_fields(pool, client, sample_bytes):
+    response = client.post('/extract', data=sample_bytes, content_type='application/pdf')
+    assert response.status_code == 200
+    assert response.json['fields']['initial_term'] == '24 months'
+    assert response.json['pages'] == 3
+    assert 'metrics' not in response.json
+
+def test_extract_rejects_empty_and_unreadable_documents(pool, client):
+    assert client.post('/extract', data=b'').status_code == 400
+    response = client.post('/extract', data=b'not a pdf', content_type='application/pdf')
+    assert response.status_code == 422
+    assert response.json['error'].startswith("Little or no text extracted")
+
+def test_batch_and_metrics(pool, client, sample_bytes):
+    response = client.post('/extract/batch', data={'files': [(io.BytesIO(sample_bytes), 'contract.pdf')]},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    result, = response.json['results']
+    assert (result['file_name'], result['status']) == ('contract.pdf', 200)
+    
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert 'api_requests_total{endpoint="batch",status="200"}' in metrics
+
+def test_full_queue_is_refused(pool, client, monkeypatch):
+    monkeypatch.setattr(index, '_extract_document', _slow_document)
+    future, = pool.submit_many([b'0.5'])
+    with pytest.raises(QueueFullError):
+        pool.submit_many([b'0'])
+    response = client.post('/extract', data=b'0', content_type='application/pdf')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '1'
+    future.result(timeout=10)
+
+def test_timed_out_document_frees_its_slot(pool, client, monkeypatch):
+    monkeypatch.setattr(index, '_extract_document', _slow_document)
+    monkeypatch.setattr(index, 'REQUEST_TIMEOUT', 0.5)
+    crashes = _crashes()
+    
+    response = client.post('/extract', data=b'60', content_type='application/pdf')
+    assert response.status_code == 504
+    # The stuck worker is killed rather than holding the only slot for a minute
+    _wait_for(lambda: pool._slots._value == pool.capacity)
+    future, = pool.submit_many([b'0'])
+    assert future.result(timeout=10)['pages'] == 0
+    # Killing an abandoned document's worker is not a crash
+    assert _crashes() == crashes
+
+def test_pool_recovers_from_a_crashed_worker(pool, monkeypatch):
+    monkeypatch.setattr(index, '_extract_document', _slow_document)
+    future, = pool.submit_many([b'30'])
+    _wait_for(pool.worker_pids)
+    time.sleep(0.3)
+    for pid in pool.worker_pids():
+        os.kill(pid, signal.SIGKILL)
+    crashes = _crashes()
+    with pytest.raises(Exception):
+        future.result(timeout=10)
+    _wait_for(lambda: _crashes() == crashes + 1)
+    
+    _wait_for(lambda: pool._slots._value == pool.capacity)
+    future, = pool.submit_many([b'0'])
+    assert future.result(timeout=10)['pages'] == 0
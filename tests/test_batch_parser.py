@@ -0,0 +1,56 @@
+import csv
+import json
+import shutil
+import sys
+
+import batch_parser
+
+def _run(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['batch_parser.py', *args])
+    batch_parser.main()
+
+def _read_jsonl(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+def test_collect_inputs_from_directories_globs_and_manifests(tmp_path):
+    (tmp_path / 'nested').mkdir()
+    for name in ['a.pdf', 'b.PDF', 'notes.txt', 'nested/c.pdf']:
+        (tmp_path / name).write_bytes(b'%PDF')
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text(f"# batch\n{tmp_path / 'extra.pdf'}\n\n{tmp_path / 'a.pdf'}\n", encoding='utf-8')
+    
+    paths = batch_parser.collect_inputs([str(tmp_path), str(tmp_path / '*.pdf')], str(manifest))
+    assert paths == [str(tmp_path / name) for name in ['a.pdf', 'b.PDF', 'nested/c.pdf', 'extra.pdf']]
+
+def test_batch_writes_one_row_per_document(tmp_path, monkeypatch, sample_pdf):
+    inputs = tmp_path / 'inputs'
+    inputs.mkdir()
+    shutil.copy(sample_pdf, inputs / 'first.pdf')
+    shutil.copy(sample_pdf, inputs / 'second.pdf')
+    (inputs / 'broken.pdf').write_bytes(b'not a pdf')
+    output = tmp_path / 'results.jsonl'
+    
+    _run(monkeypatch, str(inputs), '--output', str(output), '--workers', '2')
+    
+    rows = {row['file_name']: row for row in _read_jsonl(output)}
+    assert sorted(rows) == ['broken.pdf', 'first.pdf', 'second.pdf']
+    assert rows['first.pdf']['initial_term'] == rows['second.pdf']['initial_term'] == '24 months'
+    assert rows['first.pdf']['error'] is None
+    assert rows['broken.pdf']['error'].startswith("Little or no text extracted")
+
+def test_batch_early_exit_and_csv_output(tmp_path, monkeypatch, sample_pdf):
+    output = tmp_path / 'results.csv'
+    _run(monkeypatch, sample_pdf, '--output', str(output), '--workers', '1', '--early-exit')
+    
+    with open(output, newline='', encoding='utf-8') as file:
+        row, = csv.DictReader(file)
+    assert row['file_name'] == 'sample_contract.pdf'
+    assert row['initial_term'] == '24 months'
+    assert row['error'] == ''
+
+def test_batch_without_inputs_writes_nothing(tmp_path, monkeypatch, capsys):
+    output = tmp_path / 'results.jsonl'
+    _run(monkeypatch, str(tmp_path / 'missing'), '--output', str(output))
+    assert "No PDF files found" in capsys.readouterr().out
+    assert not output.exists()
@@ -0,0 +1,90 @@
+import os
+import hashlib
+
+from PIL import Image
+
+from src.utils.cache import DiskCache, OCRCache, ResultStore
+
+def _key(name):
+    return hashlib.sha256(name.encode('utf-8')).hexdigest()
+
+def _entries(directory):
+    return [name for _, _, files in os.walk(directory) for name in files if name.endswith('.json')]
+
+def test_disk_cache_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get(_key('a')) is None
+    cache.set(_key('a'), {'text': 'page one', 'pages': [1, 2]})
+    assert cache.get(_key('a')) == {'text': 'page one', 'pages': [1, 2]}
+
+def test_disk_cache_keeps_a_running_size(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set(_key('a'), 'x' * 100)
+    cache.set(_key('b'), 'y' * 100)
+    # Overwriting an entry only counts the difference
+    cache.set(_key('a'), 'x' * 50)
+    total = sum(os.path.getsize(os.path.join(root, name))
+                for root, _, files in os.walk(tmp_path) for name in files if name.endswith('.json'))
+    assert cache._read_size() == total
+
+def test_disk_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=2000)
+    for index in range(30):
+        cache.set(_key(str(index)), 'x' * 200)
+    
+    assert cache._read_size() <= 2000
+    assert len(_entries(tmp_path)) < 30
+    # The last entry written is kept
+    assert cache.get(_key('29')) == 'x' * 200
+
+def test_disk_cache_rebuilds_a_missing_size(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set(_key('a'), 'x' * 100)
+    expected = cache._read_size()
+    os.remove(cache.size_path)
+    cache.set(_key('b'), 'y' * 100)
+    assert cache._read_size() == 2 * expected
+
+def test_ocr_cache_keys_by_exact_pixels(tmp_path):
+    cache = OCRCache(str(tmp_path))
+    page = Image.new('L', (60, 80), 255)
+    same = page.copy()
+    changed = page.copy()
+    changed.putpixel((30, 40), 0)
+    
+    assert cache.key(page, 'eng') == cache.key(same, 'eng')
+    assert cache.key(page, 'eng') != cache.key(changed, 'eng')
+    assert cache.key(page, 'eng') != cache.key(page, 'fra')
+    
+    cache.set(cache.key(page, 'eng'), 'Standard terms', 1.5)
+    assert cache.get(cache.key(same, 'eng')) == {'text': 'Standard terms', 'seconds': 1.5}
+    assert cache.get(cache.key(changed, 'eng')) is None
+
+def test_result_store_key_covers_content_and_settings():
+    assert ResultStore.key(b'%PDF-1', 'v1|eng') == ResultStore.key(b'%PDF-1', 'v1|eng')
+    assert ResultStore.key(b'%PDF-1', 'v1|eng') != ResultStore.key(b'%PDF-2', 'v1|eng')
+    assert ResultStore.key(b'%PDF-1', 'v1|eng') != ResultStore.key(b'%PDF-1', 'v2|eng')
+
+def test_result_store_spills_to_disk_and_promotes_back(tmp_path):
+    store = ResultStore(max_items=2, directory=str(tmp_path))
+    for name in 'abc':
+        store.set(_key(name), {'file_name': name})
+    
+    assert len(store) == 2
+    assert len(_entries(tmp_path)) == 1
+    assert store.get(_key('a')) == {'file_name': 'a'}
+    # Promoted back into memory, spilling the least recently used one in turn
+    assert len(store) == 2
+    assert store.get(_key('b')) == {'file_name': 'b'}
+
+def test_result_store_hands_out_copies():
+    store = ResultStore()
+    store.set(_key('a'), {'file_name': 'a'})
+    store.get(_key('a'))['file_name'] = 'renamed'
+    assert store.get(_key('a')) == {'file_name': 'a'}
+
+def test_result_store_without_directory_drops_old_results():
+    store = ResultStore(max_items=1)
+    store.set(_key('a'), {'file_name': 'a'})
+    store.set(_key('b'), {'file_name': 'b'})
+    assert store.get(_key('a')) is None
@@ -0,0 +1,52 @@
+import pickle
+import random
+
+import pytest
+
+from benchmarks.bench_dates import legacy_normalize
+from benchmarks.text_corpus import _date_variants
+from src.utils.dates import DateNormalizer
+
+@pytest.mark.parametrize('value, expected', [
+    ('2022-10-01', '2022-10-01'),
+    ('10/01/2022', '2022-10-01'),
+    ('10-01-2022', '2022-10-01'),
+    ('10 January 2022', '2022-01-10'),
+    ('1st of March, 2021', '2021-03-01'),
+    ('January 10, 2022', '2022-01-10'),
+    ('Sept. 3 2020', '2020-09-03'),
+    ('25/12/2022', '2022-12-25'),
+])
+def test_formats(value, expected):
+    assert DateNormalizer().normalize(value) == expected
+
+def test_day_first_policy():
+    assert DateNormalizer(day_first=False).normalize('10/01/2022') == '2022-10-01'
+    assert DateNormalizer(day_first=True).normalize('10/01/2022') == '2022-01-10'
+    # A first number above 12 can only be a day
+    assert DateNormalizer(day_first=False).normalize('13/01/2022') == '2022-01-13'
+
+def test_missing_and_unparseable_values():
+    normalizer = DateNormalizer()
+    assert normalizer.normalize(None) is None
+    assert normalizer.normalize('') is None
+    assert normalizer.normalize('no date here') is None
+
+def test_values_are_memoized():
+    normalizer = DateNormalizer()
+    assert normalizer.normalize_many(['10/01/2022', None, ' 10/01/2022 ']) == ['2022-10-01', None, '2022-10-01']
+    assert normalizer.cache_info().hits == 1
+
+def test_pickled_copy_starts_with_an_empty_cache():
+    normalizer = DateNormalizer(day_first=True)
+    normalizer.normalize('10/01/2022')
+    copy = pickle.loads(pickle.dumps(normalizer))
+    assert copy.cache_info().currsize == 0
+    assert copy.normalize('10/01/2022') == '2022-01-10'
+
+def test_generated_dates_match_dateutil():
+    normalizer = DateNormalizer()
+    rng = random.Random(0)
+    for _ in range(200):
+        for value in _date_variants(rng):
+            assert normalizer.normalize(value) == legacy_normalize(value)
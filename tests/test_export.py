@@ -0,0 +1,126 @@
+import csv
+import json
+import os
+import zipfile
+
+import pyarrow.parquet as pq
+import pytest
+
+from src.utils.export import (
+    CSVWriter, JSONLWriter, ParquetWriter, export_to_csv, export_to_excel, export_to_parquet, open_writer,
+    resolve_format,
+)
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+def test_resolve_format():
+    assert resolve_format('out.csv') == 'csv'
+    assert resolve_format('out.PQ') == 'parquet'
+    assert resolve_format('out.txt') == 'jsonl'
+    assert resolve_format('out.csv', 'parquet') == 'parquet'
+    with pytest.raises(ValueError):
+        open_writer('out.xml', 'xml')
+
+def test_jsonl_writer_appends(tmp_path):
+    path = str(tmp_path / 'out' / 'results.jsonl')
+    with JSONLWriter(path) as writer:
+        writer.write({'file_name': 'a.pdf', 'title': 'Directeur général'})
+    with JSONLWriter(path, append=True) as writer:
+        writer.write({'file_name': 'b.pdf'})
+    with open(path, encoding='utf-8') as file:
+        assert [json.loads(line) for line in file] == [
+            {'file_name': 'a.pdf', 'title': 'Directeur général'}, {'file_name': 'b.pdf'},
+        ]
+
+def test_csv_writer_grows_its_header(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    with CSVWriter(path, fieldnames=['file_name', 'title']) as writer:
+        writer.write({'file_name': 'a.pdf', 'title': 'CEO'})
+        writer.write({'file_name': 'b.pdf', 'print_name_2': 'Tony Constantindes'})
+    
+    assert _read_csv(path) == [
+        {'file_name': 'a.pdf', 'title': 'CEO', 'print_name_2': ''},
+        {'file_name': 'b.pdf', 'title': '', 'print_name_2': 'Tony Constantindes'},
+    ]
+    assert [name for name in os.listdir(tmp_path)] == ['results.csv']
+
+def test_csv_writer_appends_with_the_existing_header(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    with CSVWriter(path) as writer:
+        writer.write({'file_name': 'a.pdf', 'title': 'CEO'})
+    with CSVWriter(path, fieldnames=['file_name', 'error'], append=True) as writer:
+        writer.write({'file_name': 'b.pdf', 'error': 'unreadable'})
+    assert _read_csv(path) == [
+        {'file_name': 'a.pdf', 'title': 'CEO', 'error': ''},
+        {'file_name': 'b.pdf', 'title': '', 'error': 'unreadable'},
+    ]
+
+def test_export_to_csv_uses_every_key(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    assert export_to_csv([{'a': 1}, {'b': 2}], path)
+    assert _read_csv(path) == [{'a': '1', 'b': ''}, {'a': '', 'b': '2'}]
+
+def test_parquet_writer_widens_its_schema(tmp_path):
+    path = str(tmp_path / 'results.parquet')
+    with ParquetWriter(path, batch_size=2) as writer:
+        writer.write({'file_name': 'a.pdf', 'pages': 3})
+        writer.write({'file_name': 'b.pdf', 'pages': 4})
+        # A new column and a string in an integer column: the file is rewritten
+        writer.write({'file_name': 'c.pdf', 'pages': 'unknown', 'terms': ['24 months']})
+    
+    table = pq.read_table(path)
+    assert table.to_pylist() == [
+        {'file_name': 'a.pdf', 'pages': '3', 'terms': None},
+        {'file_name': 'b.pdf', 'pages': '4', 'terms': None},
+        {'file_name': 'c.pdf', 'pages': 'unknown', 'terms': '["24 months"]'},
+    ]
+    assert str(table.schema.field('file_name').type) == 'dictionary<values=string, indices=int32, ordered=0>'
+    assert os.listdir(tmp_path) == ['results.parquet']
+
+def test_parquet_writer_keeps_types_and_appends(tmp_path):
+    path = str(tmp_path / 'results.parquet')
+    assert export_to_parquet([{'pages': 3, 'ratio': 0.5, 'ocr': True}], path)
+    with ParquetWriter(path, fieldnames=['file_name'], append=True) as writer:
+        writer.write({'pages': 5, 'ratio': 1, 'ocr': False, 'file_name': 'b.pdf'})
+    
+    table = pq.read_table(path)
+    assert table.column_names == ['pages', 'ratio', 'ocr', 'file_name']
+    assert table.to_pylist() == [
+        {'pages': 3, 'ratio': 0.5, 'ocr': True, 'file_name': None},
+        {'pages': 5, 'ratio': 1.0, 'ocr': False, 'file_name': 'b.pdf'},
+    ]
+
+def test_parquet_writer_without_rows_writes_a_valid_file(tmp_path):
+    path = str(tmp_path / 'results.parquet')
+    ParquetWriter(path, fieldnames=['file_name']).close()
+    assert pq.read_table(path).num_rows == 0
+
+def test_failed_parquet_rewrite_keeps_the_original(tmp_path, monkeypatch):
+    path = str(tmp_path / 'results.parquet')
+    assert export_to_parquet([{'file_name': 'a.pdf'}, {'file_name': 'b.pdf'}], path)
+    with open(path, 'rb') as file:
+        original = file.read()
+    
+    def fail(self, columns):
+        raise OSError("disk full")
+    monkeypatch.setattr(ParquetWriter, '_table', fail)
+    
+    with pytest.raises(OSError):
+        ParquetWriter(path, fieldnames=['title'], append=True)
+    with open(path, 'rb') as file:
+        assert file.read() == original
+    assert os.listdir(tmp_path) == ['results.parquet']
+
+def test_export_to_excel(tmp_path):
+    path = str(tmp_path / 'results.xlsx')
+    rows = [{'file_name': 'a.pdf', 'terms': ['24 months'], 'pages': 3}, ['b.pdf', None, 4]]
+    assert export_to_excel(rows, ['file_name', 'terms', 'pages'], path, sheet_name='Results')
+    
+    with zipfile.ZipFile(path) as workbook:
+        sheet = workbook.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        names = workbook.read('xl/workbook.xml').decode('utf-8')
+    assert 'name="Results"' in names
+    for value in ('a.pdf', 'b.pdf', '["24 months"]', '<v>4</v>'):
+        assert value in sheet
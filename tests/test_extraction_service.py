@@ -0,0 +1,78 @@
+import os
+import signal
+import time
+
+import pytest
+
+from src import extraction_service, pdf_extractor
+from src.extraction_service import ExtractionService, DONE, FAILED
+
+def _wait(service, job_ids, timeout=30):
+    """Poll until every job is finished, returning the finished jobs."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        jobs = service.jobs(job_ids)
+        if all(job.finished for job in jobs):
+            return jobs
+        time.sleep(0.05)
+    raise AssertionError("Jobs did not finish in time")
+
+def _slow_job(job_id, pdf_bytes):
+    """Stand-in for _extract_job that runs long enough for its worker to be killed."""
+    time.sleep(float(pdf_bytes))
+    return {'file_name': job_id}
+
+@pytest.fixture
+def service():
+    service = ExtractionService(workers=1)
+    yield service
+    service.shutdown()
+
+def test_extracts_and_hands_out_results_once(service, sample_bytes):
+    job_id = service.submit('contract.pdf', sample_bytes)
+    job, = _wait(service, [job_id])
+    assert job.state == DONE
+    assert job.fraction == 1.0
+    assert job.result['initial_term'] == '24 months'
+    
+    assert service.collect([job_id]) == [job]
+    assert service.collect([job_id]) == []
+    assert service.jobs([job_id]) == []
+
+def test_unreadable_document_fails(service):
+    job, = _wait(service, [service.submit('empty.pdf', b'not a pdf')])
+    assert job.state == FAILED
+    assert job.error
+
+def test_documents_without_text_fail_like_the_other_entry_points(service, build_pdf, monkeypatch):
+    # The pool is started by the first submission, so its workers run the patched OCR
+    monkeypatch.setattr(pdf_extractor, '_ocr_page', lambda *args: ("", {}, None))
+    with open(build_pdf([None, None]), 'rb') as file:
+        job, = _wait(service, [service.submit('scan.pdf', file.read())])
+    assert job.state == FAILED
+    assert job.error.startswith("Little or no text")
+
+def test_discard_cancels_queued_jobs(service, monkeypatch):
+    monkeypatch.setattr(extraction_service, '_extract_job', _slow_job)
+    running = service.submit('running.pdf', b'0.5')
+    queued = service.submit('queued.pdf', b'0')
+    service.discard([queued])
+    assert service.jobs([running, queued])[0].job_id == running
+    assert len(service.jobs([running, queued])) == 1
+    _wait(service, [running])
+
+def test_recovers_from_a_crashed_worker(service, monkeypatch, sample_bytes):
+    monkeypatch.setattr(extraction_service, '_extract_job', _slow_job)
+    job_ids = [service.submit(f'{index}.pdf', b'5') for index in range(2)]
+    time.sleep(0.5)
+    for pid in list(service._executor._processes):
+        os.kill(pid, signal.SIGKILL)
+    
+    jobs = _wait(service, job_ids)
+    assert [job.state for job in jobs] == [FAILED, FAILED]
+    assert all(job.error.startswith("Worker process crashed") for job in jobs)
+    
+    # The next submission gets a fresh pool
+    monkeypatch.undo()
+    job, = _wait(service, [service.submit('after.pdf', sample_bytes)])
+    assert job.state == DONE
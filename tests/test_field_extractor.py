@@ -0,0 +1,118 @@
+import os
+import pickle
+import re
+
+import pytest
+
+from benchmarks.bench_adversarial import ADVERSARIAL_INPUTS, build_text
+from benchmarks.bench_fields import legacy_extract_fields
+from benchmarks.text_corpus import PLACEMENTS, generate_contract_texts
+from src.field_extractor import FieldExtractor
+from src.pdf_extractor import PDFExtractor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _legacy_keyword_value(field_patterns, text):
+    """The original per-field keyword fallback, run once for each missing field."""
+    keywords = set()
+    for pattern in field_patterns:
+        keywords.update(word.lower() for word in re.findall(r'[A-Za-z]+', pattern) if len(word) > 3)
+    for line in text.split('\n'):
+        line = line.strip()
+        if sum(1 for keyword in keywords if keyword in line.lower()) >= 2 and ':' in line:
+            value = line.split(':', 1)[1].strip()
+            if value:
+                return value
+    return None
+
+def test_sample_contract_fields(sample_pdf):
+    text = PDFExtractor().extract_text(sample_pdf)
+    results = FieldExtractor().extract_fields(text)
+    assert results['initial_term'] == '24 months'
+    assert results['further_term'].startswith('successive 12-month periods')
+
+def test_patterns_without_a_capture_group_are_skipped():
+    with open(os.path.join(ROOT, 'sample_contract.txt'), encoding='utf-8') as file:
+        text = file.read()
+    assert FieldExtractor().extract_fields(text) == legacy_extract_fields(FieldExtractor().patterns, text)
+
+@pytest.mark.parametrize('placement', PLACEMENTS)
+def test_results_match_the_original_extraction(placement):
+    extractor = FieldExtractor()
+    for text in generate_contract_texts(40, missing_rate=0.4, seed=1, placement=placement):
+        assert extractor.extract_fields(text) == legacy_extract_fields(extractor.patterns, text)
+
+def test_long_documents_match_the_original_extraction():
+    extractor = FieldExtractor()
+    for text in generate_contract_texts(3, filler_clauses=2000, placement='end'):
+        assert extractor.extract_fields(text) == legacy_extract_fields(extractor.patterns, text)
+
+def test_extractor_can_be_sent_to_worker_processes():
+    extractor = FieldExtractor()
+    text = generate_contract_texts(1)[0]
+    assert pickle.loads(pickle.dumps(extractor)).extract_fields(text) == extractor.extract_fields(text)
+
+def test_every_pattern_has_anchors_derived_from_it():
+    extractor = FieldExtractor()
+    assert extractor.anchors.keys() == extractor.patterns.keys()
+    for field, patterns in extractor.patterns.items():
+        assert len(extractor.anchors[field]) == len(patterns)
+        assert all(extractor.anchors[field])
+    assert extractor.anchors['print_name'][0] == ('name', 'print name')
+
+def test_patterns_without_literal_prefix_search_the_whole_text():
+    extractor = FieldExtractor()
+    pattern = re.compile(r'(\d+) months')
+    normalized_text = "renews after 12 months"
+    match = extractor._match_at_anchors(pattern, normalized_text, (), {})
+    assert match.group(1) == '12'
+
+def test_anchored_matching_finds_the_same_match_as_a_full_search():
+    extractor = FieldExtractor()
+    texts = generate_contract_texts(20, missing_rate=0.4, seed=3)
+    texts.append("the term of this agreement is long. " * 50 + "initial term: 12 months.")
+    for text in texts:
+        normalized_text = ' '.join(text.lower().split())
+        positions = extractor.anchor_index.scan(normalized_text)
+        for field, patterns in extractor.compiled_patterns.items():
+            for pattern, anchors in zip(patterns, extractor.anchors[field]):
+                expected = pattern.search(normalized_text)
+                found = extractor._match_at_anchors(pattern, normalized_text, anchors, positions)
+                assert (found and found.span()) == (expected and expected.span())
+
+def test_keyword_fallback_matches_the_per_field_scan():
+    extractor = FieldExtractor()
+    text = "\n".join([
+        "Preamble without a colon mentioning the initial term and the renewal",
+        "Contract Initial Term: twenty four months",
+        "Renewal extension: on request",
+        "Agreement Effective Date noted: the first of May",
+        "Print Name signed: J. Smith",
+    ])
+    fields = list(extractor.patterns)
+    expected = {field: _legacy_keyword_value(extractor.patterns[field], text) for field in fields}
+    assert extractor._keyword_extraction(text, fields) == expected
+    assert expected['initial_term'] == 'twenty four months'
+    
+    for text in generate_contract_texts(20, missing_rate=0.8, seed=2):
+        expected = {field: _legacy_keyword_value(extractor.patterns[field], text) for field in fields}
+        assert extractor._keyword_extraction(text, fields) == expected
+
+def test_adversarial_text_matches_the_original_extraction():
+    extractor = FieldExtractor()
+    for fragment in ADVERSARIAL_INPUTS.values():
+        # Shorter than anchor_window, so the windows do not cut any match short
+        text = build_text(fragment, 1500)
+        assert extractor.extract_fields(text) == legacy_extract_fields(extractor.patterns, text)
+
+def test_anchors_only_match_at_the_start_of_words():
+    extractor = FieldExtractor()
+    text = "surname: x " * 300 + "name: Real Name."
+    assert extractor.extract_fields(text)['print_name'] == 'real name'
+    text = "We determine terms. " * 300 + " term: 3 years."
+    assert extractor.extract_fields(text)['initial_term'] == '3 years'
+
+def test_many_failed_anchors_do_not_hide_a_later_match():
+    extractor = FieldExtractor()
+    text = "after the initial term the parties may renew for another " * 400 + "The initial term is 24 months."
+    assert extractor.extract_fields(text)['initial_term'] == '24 months'
@@ -0,0 +1,182 @@
+import time
+import sqlite3
+import threading
+
+import batch_parser
+from src.job_queue import JobQueue, QUEUED, EXTRACTING, OCR, DONE, FAILED
+
+def _open(path, owner=None, lease_seconds=900, max_attempts=3):
+    return JobQueue(str(path), lease_seconds=lease_seconds, max_attempts=max_attempts, owner=owner)
+
+def _row(queue, job_id, columns='state, attempts, owner'):
+    return queue.connection.execute(f"SELECT {columns} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+def test_jobs_move_from_queued_to_done(tmp_path):
+    queue = _open(tmp_path / 'jobs.sqlite')
+    assert queue.add(['a.pdf', 'b.pdf']) == 2
+    assert queue.add(['a.pdf']) == 0
+    
+    claimed = queue.claim(limit=5)
+    assert [path for _, path in claimed] == ['a.pdf', 'b.pdf']
+    assert queue.claim() == []
+    
+    (first, _), (second, _) = claimed
+    queue.set_state(first, OCR)
+    assert queue.complete(first, {'initial_term': '24 months'}) is True
+    queue.fail(second, "No pages could be read.")
+    
+    assert queue.counts() == {QUEUED: 0, EXTRACTING: 0, OCR: 0, DONE: 1, FAILED: 1}
+    assert list(queue.results()) == [
+        ('a.pdf', DONE, {'initial_term': '24 months'}, None),
+        ('b.pdf', FAILED, None, "No pages could be read."),
+    ]
+
+def test_concurrent_claims_never_share_a_job(tmp_path):
+    paths = [f'{index}.pdf' for index in range(50)]
+    _open(tmp_path / 'jobs.sqlite').add(paths)
+    
+    def claim_all(owner, claimed):
+        queue = _open(tmp_path / 'jobs.sqlite', owner=owner)
+        while True:
+            jobs = queue.claim(limit=3)
+            if not jobs:
+                break
+            claimed.extend(path for _, path in jobs)
+        queue.close()
+    
+    claims = [[] for _ in range(4)]
+    threads = [threading.Thread(target=claim_all, args=(f'runner-{index}', claimed))
+               for index, claimed in enumerate(claims)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(path for claimed in claims for path in claimed) == sorted(paths)
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    first = _open(tmp_path / 'jobs.sqlite', owner='runner-1', lease_seconds=0.1)
+    second = _open(tmp_path / 'jobs.sqlite', owner='runner-2', lease_seconds=0.1)
+    first.add(['a.pdf'])
+    (job_id, _), = first.claim()
+    assert second.claim() == []
+    
+    time.sleep(0.2)
+    assert second.claim() == [(job_id, 'a.pdf')]
+    assert _row(second, job_id) == (EXTRACTING, 2, 'runner-2')
+
+def test_job_claimed_again_ignores_its_previous_owner(tmp_path):
+    first = _open(tmp_path / 'jobs.sqlite', owner='runner-1', lease_seconds=0.1)
+    second = _open(tmp_path / 'jobs.sqlite', owner='runner-2', lease_seconds=0.1)
+    first.add(['a.pdf'])
+    (job_id, _), = first.claim()
+    time.sleep(0.2)
+    second.claim()
+    
+    # The first runner finishes late: its updates must not touch the new owner's job
+    assert first.renew([job_id]) == 0
+    assert first.complete(job_id, {'title': 'stale'}) is False
+    assert first.fail(job_id, "crashed", retry=True) is False
+    assert _row(second, job_id) == (EXTRACTING, 2, 'runner-2')
+    
+    assert second.complete(job_id, {'title': 'fresh'}) is True
+    assert list(second.results()) == [('a.pdf', DONE, {'title': 'fresh'}, None)]
+
+def test_renew_keeps_a_lease_alive(tmp_path):
+    queue = _open(tmp_path / 'jobs.sqlite', lease_seconds=0.3)
+    other = _open(tmp_path / 'jobs.sqlite', owner='other', lease_seconds=0.3)
+    queue.add(['a.pdf'])
+    (job_id, _), = queue.claim()
+    for _ in range(3):
+        time.sleep(0.15)
+        assert queue.renew([job_id]) == 1
+    assert other.claim() == []
+
+def test_worker_updates_need_the_claiming_owner(tmp_path):
+    runner = _open(tmp_path / 'jobs.sqlite')
+    worker = _open(tmp_path / 'jobs.sqlite', owner=runner.worker_id)
+    stranger = _open(tmp_path / 'jobs.sqlite', owner='someone-else')
+    runner.add(['a.pdf'])
+    (job_id, _), = runner.claim()
+    
+    stranger.set_state(job_id, OCR)
+    assert _row(runner, job_id, 'state')[0] == EXTRACTING
+    worker.set_state(job_id, OCR)
+    assert _row(runner, job_id, 'state')[0] == OCR
+
+def test_crash_before_start_refunds_the_attempt(tmp_path):
+    runner = _open(tmp_path / 'jobs.sqlite', max_attempts=1)
+    runner.add(['a.pdf'])
+    (job_id, _), = runner.claim()
+    assert runner.fail(job_id, "Worker process crashed", retry=True) is True
+    assert _row(runner, job_id) == (QUEUED, 0, None)
+
+def test_crash_after_start_uses_up_attempts(tmp_path):
+    runner = _open(tmp_path / 'jobs.sqlite', max_attempts=2)
+    worker = _open(tmp_path / 'jobs.sqlite', owner=runner.worker_id)
+    # Tell the two connections apart, as separate processes would be
+    worker.worker_id = 'worker-process'
+    runner.add(['a.pdf'])
+    
+    for state in (QUEUED, FAILED):
+        (job_id, _), = runner.claim()
+        worker.start(job_id)
+        assert runner.fail(job_id, "Worker process crashed", retry=True) is False
+        assert _row(runner, job_id, 'state')[0] == state
+
+def test_expired_jobs_over_the_retry_limit_fail(tmp_path):
+    queue = _open(tmp_path / 'jobs.sqlite', lease_seconds=0.05, max_attempts=1)
+    queue.add(['a.pdf'])
+    (job_id, _), = queue.claim()
+    time.sleep(0.1)
+    assert queue.claim() == []
+    assert _row(queue, job_id, 'state, error') == (FAILED, 'Exceeded retry limit')
+
+def test_recover_requeues_running_jobs(tmp_path):
+    queue = _open(tmp_path / 'jobs.sqlite')
+    queue.add(['a.pdf'])
+    queue.claim()
+    assert queue.recover() == 1
+    assert [path for _, path in queue.claim()] == ['a.pdf']
+
+def test_databases_without_owners_are_migrated(tmp_path):
+    path = tmp_path / 'jobs.sqlite'
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, state TEXT NOT NULL DEFAULT 'queued', "
+        "attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, lease_until REAL, result TEXT, error TEXT, "
+        "updated_at REAL NOT NULL)"
+    )
+    connection.execute("INSERT INTO jobs (path, updated_at) VALUES ('a.pdf', 0)")
+    connection.commit()
+    connection.close()
+    
+    queue = _open(path)
+    (job_id, _), = queue.claim()
+    assert queue.complete(job_id, {}) is True
+
+def _slow_document(pdf_path, job_id=None):
+    """Stand-in for process_document that outlasts the lease of the documents queued behind it."""
+    batch_parser._worker['job_queue'].start(job_id)
+    time.sleep(0.3)
+    return {'file_name': pdf_path, 'path': pdf_path, 'error': None, 'seconds': 0.3}
+
+class _ListWriter:
+    def __init__(self):
+        self.rows = []
+    
+    def write(self, row):
+        self.rows.append(row)
+
+def test_run_batch_renews_the_leases_of_queued_documents(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_parser, 'process_document', _slow_document)
+    queue = _open(tmp_path / 'jobs.sqlite', lease_seconds=0.4)
+    queue.add([f'{index}.pdf' for index in range(4)])
+    writer = _ListWriter()
+    
+    # One worker holds four documents: the last one waits three times the lease
+    counts = batch_parser.run_batch([], writer, workers=1, job_queue=queue)
+    
+    assert counts == {'processed': 4, 'failed': 0}
+    assert len(writer.rows) == 4
+    attempts = [attempt for attempt, in queue.connection.execute("SELECT attempts FROM jobs")]
+    assert attempts == [1, 1, 1, 1]
@@ -0,0 +1,53 @@
+import json
+import pickle
+
+from src.utils.metrics import MetricsRegistry
+
+def test_counters_and_timers():
+    metrics = MetricsRegistry()
+    metrics.inc('pages_total', engine='OCR')
+    metrics.inc('pages_total', 2, engine='OCR')
+    metrics.observe('stage_seconds', 0.5, stage='ocr')
+    metrics.observe('stage_seconds', 1.5, stage='ocr')
+    
+    snapshot = metrics.snapshot()
+    assert snapshot['counters'] == [{'name': 'pages_total', 'labels': {'engine': 'OCR'}, 'value': 3}]
+    assert snapshot['timers'] == [{'name': 'stage_seconds', 'labels': {'stage': 'ocr'},
+                                   'count': 2, 'sum': 2.0, 'max': 1.5}]
+    assert json.loads(metrics.to_json()) == snapshot
+
+def test_merge_adds_worker_snapshots():
+    parent, worker = MetricsRegistry(), MetricsRegistry()
+    parent.inc('documents_total')
+    parent.observe('seconds', 1.0)
+    worker.inc('documents_total', 2)
+    worker.observe('seconds', 3.0)
+    
+    parent.merge(worker.snapshot())
+    snapshot = parent.snapshot()
+    assert snapshot['counters'][0]['value'] == 3
+    assert snapshot['timers'][0] == {'name': 'seconds', 'labels': {}, 'count': 2, 'sum': 4.0, 'max': 3.0}
+
+def test_prometheus_format():
+    metrics = MetricsRegistry()
+    metrics.inc('requests_total', endpoint='extract', status=200)
+    metrics.observe('request_seconds', 0.25)
+    lines = metrics.to_prometheus().splitlines()
+    assert '# TYPE requests_total counter' in lines
+    assert 'requests_total{endpoint="extract",status="200"} 1' in lines
+    assert 'request_seconds_count 1' in lines
+    assert 'request_seconds_max 0.250000' in lines
+
+def test_disabled_registry_records_nothing():
+    metrics = MetricsRegistry(enabled=False)
+    metrics.inc('pages_total')
+    metrics.observe('seconds', 1.0)
+    assert metrics.snapshot() == {'counters': [], 'timers': []}
+
+def test_pickled_registry_keeps_its_values():
+    metrics = MetricsRegistry()
+    metrics.inc('pages_total')
+    copy = pickle.loads(pickle.dumps(metrics))
+    copy.inc('pages_total')
+    assert copy.snapshot()['counters'][0]['value'] == 2
+    assert metrics.snapshot()['counters'][0]['value'] == 1
@@ -0,0 +1,257 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import pdf_extractor
+from src.pdf_extractor import PDFExtractor, NoTextError, first_last_page_order
+from src.pdf_source import PDFSource
+
+PAGES = ["First page of the contract text", None, "Third page with more contract text", None]
+
+def _fake_ocr(pdf_path, page_number, ocr_language, adaptive=None, ocr_cache=None):
+    """Stand-in for _ocr_page: earlier pages take longer, so results arrive out of order."""
+    time.sleep(0.05 * (5 - page_number))
+    return f"OCR text of page {page_number}", {'render': 0.0, 'ocr': 0.01}, None
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    # OCR pools are started after the patch, so forked workers run the fake too
+    monkeypatch.setattr(pdf_extractor, '_ocr_page', _fake_ocr)
+
+def test_text_documents_are_not_ocrd(sample_pdf, monkeypatch):
+    monkeypatch.setattr(pdf_extractor, '_ocr_page', lambda *args: pytest.fail("OCR was run"))
+    text = PDFExtractor(ocr_workers=2).extract_text(sample_pdf)
+    assert "initial term of 24\nmonths" in text
+
+def test_only_image_only_pages_are_ocrd(build_pdf, monkeypatch):
+    calls = []
+    monkeypatch.setattr(pdf_extractor, '_ocr_page', lambda *args: calls.append(args[1]) or _fake_ocr(*args))
+    pages = list(PDFExtractor().iter_pages(build_pdf(PAGES)))
+    
+    assert [page.source for page in pages] == ['pdfplumber', 'OCR', 'pdfplumber', 'OCR']
+    assert [page.ocr_reason for page in pages] == [None, 'image_only', None, 'image_only']
+    assert calls == [2, 4]
+    assert pages[1].text == "OCR text of page 2"
+    assert pages[1].timings['ocr'] == 0.01
+
+def test_iter_pages_is_lazy(build_pdf, monkeypatch):
+    calls = []
+    monkeypatch.setattr(pdf_extractor, '_ocr_page', lambda *args: calls.append(args[1]) or _fake_ocr(*args))
+    pages = PDFExtractor().iter_pages(build_pdf(PAGES))
+    
+    first = next(pages)
+    assert (first.page_number, first.page_count, first.text) == (1, 4, "First page of the contract text")
+    assert calls == []
+    pages.close()
+
+def test_extract_text_joins_the_pages(build_pdf, fake_ocr):
+    path = build_pdf(PAGES)
+    assert PDFExtractor().extract_text(path) == ("First page of the contract textOCR text of page 2\n\n"
+                                                 "Third page with more contract textOCR text of page 4\n\n")
+    with open(path, 'rb') as file:
+        assert PDFExtractor().extract_text(file) == PDFExtractor().extract_text(path)
+
+@pytest.mark.parametrize('ocr_workers', [2, 4])
+def test_parallel_ocr_keeps_page_order(build_pdf, fake_ocr, ocr_workers):
+    path = build_pdf(PAGES)
+    serial = PDFExtractor().extract_text(path)
+    
+    extractor = PDFExtractor(ocr_workers=ocr_workers)
+    try:
+        pages = list(extractor.iter_pages(path))
+        assert [page.page_number for page in pages] == [1, 2, 3, 4]
+        assert extractor.extract_text(path) == serial
+    finally:
+        extractor.close()
+
+def test_own_pool_is_kept_across_documents(build_pdf, fake_ocr):
+    path = build_pdf(PAGES)
+    extractor = PDFExtractor(ocr_workers=2)
+    try:
+        first = extractor.extract_text(path)
+        pool = extractor._own_executor
+        assert extractor.extract_text(path) == first
+        assert extractor._own_executor is pool
+    finally:
+        extractor.close()
+    assert extractor._own_executor is None
+
+def test_shared_ocr_executor_is_left_running(build_pdf, fake_ocr):
+    path = build_pdf(PAGES)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        extractor = PDFExtractor(ocr_executor=executor)
+        first = extractor.extract_text(path)
+        extractor.close()
+        # The executor belongs to the caller: another extractor keeps using it
+        assert PDFExtractor(ocr_executor=executor).extract_text(path) == first
+    assert first.count("OCR text of page") == 2
+
+def test_zero_workers_means_serial_ocr():
+    assert PDFExtractor(ocr_workers=0).ocr_workers == 1
+    assert PDFExtractor(ocr_workers=None).ocr_workers == (os.cpu_count() or 1)
+
+def _workers_in_child(queue):
+    queue.put(PDFExtractor(ocr_workers=4).ocr_workers)
+
+def test_worker_processes_never_start_a_nested_pool():
+    queue = multiprocessing.SimpleQueue()
+    process = multiprocessing.Process(target=_workers_in_child, args=(queue,))
+    process.start()
+    process.join()
+    assert queue.get() == 1
+
+def test_cached_documents_skip_extraction(build_pdf, fake_ocr, tmp_path, monkeypatch):
+    from src.utils.cache import DiskCache
+    
+    path = build_pdf(PAGES)
+    extractor = PDFExtractor(cache=DiskCache(str(tmp_path / 'cache')))
+    first = list(extractor.iter_pages(path))
+    assert not any(page.cached for page in first)
+    
+    monkeypatch.setattr(pdf_extractor.pdfplumber, 'open', lambda *args: pytest.fail("PDF was parsed"))
+    second = list(extractor.iter_pages(path))
+    assert all(page.cached for page in second)
+    assert [(page.text, page.source) for page in second] == [(page.text, page.source) for page in first]
+
+def test_failed_ocr_is_not_cached(build_pdf, tmp_path, monkeypatch):
+    from src.utils.cache import DiskCache
+    
+    def broken_ocr(*args):
+        raise RuntimeError("tesseract is not installed")
+    
+    monkeypatch.setattr(pdf_extractor, '_ocr_page', broken_ocr)
+    cache = DiskCache(str(tmp_path / 'cache'))
+    pages = list(PDFExtractor(cache=cache).iter_pages(build_pdf(PAGES)))
+    assert [page.ocr_failed for page in pages] == [False, True, False, True]
+    assert os.listdir(cache.directory) == []
+
+def test_page_order_reads_first_and_last_pages_first(build_pdf):
+    path = build_pdf([f"Text of page {number} of the document" for number in range(1, 7)])
+    order = first_last_page_order(first_pages=2, last_pages=1)
+    assert order(6) == [1, 2, 6, 3, 4, 5]
+    assert order(2) == [1, 2]
+    pages = PDFExtractor().iter_pages(path, page_order=order)
+    assert [page.page_number for page in pages] == [1, 2, 6, 3, 4, 5]
+    with PDFSource(path) as source:
+        assert [page.page_number for page in PDFExtractor().iter_pages(source, page_order=order)] == [1, 2, 6, 3, 4, 5]
+
+def test_extract_usable_text_reports_each_page(build_pdf):
+    path = build_pdf(["Some text long enough", "More text on page two"])
+    seen = []
+    text = PDFExtractor().extract_usable_text(path, on_page=lambda page: seen.append(page.page_number))
+    assert seen == [1, 2]
+    assert "page two" in text
+
+def test_extract_usable_text_rejects_empty_documents(build_pdf, monkeypatch):
+    monkeypatch.setattr(pdf_extractor, '_ocr_page', lambda *args: ("", {}, None))
+    with pytest.raises(NoTextError, match="Little or no text extracted"):
+        PDFExtractor().extract_usable_text(build_pdf([None]))
+    with pytest.raises(NoTextError):
+        PDFExtractor().extract_usable_text(b'not a pdf')
+
+def test_metrics_count_pages_per_engine(build_pdf, fake_ocr):
+    from src.utils.metrics import MetricsRegistry
+    
+    metrics = MetricsRegistry()
+    PDFExtractor(metrics=metrics).extract_text(build_pdf(PAGES))
+    counters = {(counter['name'], tuple(counter['labels'].items())): counter['value']
+                for counter in metrics.snapshot()['counters']}
+    assert counters[('pdf_documents_total', ())] == 1
+    assert counters[('pdf_pages_total', (('engine', 'pdfplumber'),))] == 2
+    assert counters[('pdf_pages_total', (('engine', 'OCR'),))] == 2
+    assert counters[('pdf_ocr_fallback_total', (('reason', 'image_only'),))] == 2
+
+def _ocr_data(words):
+    """image_to_data output for (block, line, text, confidence, left) words, plus one layout row."""
+    data = {key: [] for key in ('text', 'conf', 'block_num', 'par_num', 'line_num', 'left', 'top', 'width',
+                                'height')}
+    for block, line, text, confidence, left in [(0, 0, '', -1, 0)] + words:
+        for key, value in zip(data, (text, confidence, block, 1, line, left, block * 40, 30, 20)):
+            data[key].append(value)
+    return data
+
+@pytest.fixture
+def adaptive_tesseract(monkeypatch):
+    """Fake tesseract and renderer recording the second-pass calls."""
+    from PIL import Image
+    import pdf2image
+    
+    calls = {'render': [], 'crops': []}
+    
+    def convert_from_path(pdf_path, dpi, first_page, last_page):
+        calls['render'].append(dpi)
+        return [Image.new('L', (dpi * 4, dpi * 4), 255)]
+    
+    def image_to_string(image, lang=None, config=''):
+        if config:
+            calls['crops'].append(image.size)
+            return "sharp block"
+        return "full page at high resolution"
+    
+    monkeypatch.setattr(pdf2image, 'convert_from_path', convert_from_path)
+    monkeypatch.setattr(pdf_extractor.pytesseract, 'image_to_string', image_to_string)
+    return calls
+
+def _adaptive(monkeypatch, words):
+    from PIL import Image
+    
+    monkeypatch.setattr(pdf_extractor.pytesseract, 'image_to_data', lambda *args, **kwargs: _ocr_data(words))
+    timings = {}
+    text = pdf_extractor._ocr_page_adaptive(Image.new('L', (600, 600), 255), 'doc.pdf', 1, 'eng', 150, 300, 70,
+                                            timings)
+    return text, timings
+
+def test_adaptive_ocr_keeps_a_clear_first_pass(monkeypatch, adaptive_tesseract):
+    text, timings = _adaptive(monkeypatch, [(1, 1, 'Initial', 95, 10), (1, 1, 'Term', 90, 60),
+                                            (2, 1, 'Signed', 88, 10)])
+    assert text == "Initial Term\n\nSigned\n"
+    assert adaptive_tesseract['render'] == []
+    assert 'ocr_high' not in timings
+
+def test_adaptive_ocr_rereads_only_unclear_blocks(monkeypatch, adaptive_tesseract):
+    words = [(1, 1, word, 95, 10 * index) for index, word in enumerate("the initial term is 24 months".split())]
+    words += [(2, 1, 'b1urry', 30, 10)]
+    text, timings = _adaptive(monkeypatch, words)
+    assert text == "the initial term is 24 months\n\nsharp block\n"
+    assert adaptive_tesseract['render'] == [300]
+    # The crop is the unclear block only, padded and scaled to the high resolution
+    assert adaptive_tesseract['crops'] == [(100, 80)]
+    assert timings['ocr_high'] >= 0
+
+def test_adaptive_ocr_rereads_mostly_unclear_pages_whole(monkeypatch, adaptive_tesseract):
+    text, _ = _adaptive(monkeypatch, [(1, 1, 'b1ur', 20, 10), (2, 1, 'ok', 90, 10)])
+    assert text == "full page at high resolution"
+    assert adaptive_tesseract['crops'] == []
+    
+    text, _ = _adaptive(monkeypatch, [])
+    assert text == "full page at high resolution"
+
+def test_adaptive_settings_reach_the_ocr_workers(build_pdf, monkeypatch):
+    calls = []
+    monkeypatch.setattr(pdf_extractor, '_ocr_page', lambda *args: calls.append(args[3]) or _fake_ocr(*args))
+    PDFExtractor(adaptive_ocr=True, ocr_low_dpi=100, ocr_high_dpi=250).extract_text(build_pdf(PAGES))
+    assert calls == [(100, 250, 70), (100, 250, 70)]
+
+def test_repeated_page_images_are_ocrd_once(build_pdf, tmp_path, monkeypatch):
+    from PIL import Image
+    import pdf2image
+    from src.utils.cache import OCRCache
+    from src.utils.metrics import MetricsRegistry
+    
+    ocr_calls = []
+    monkeypatch.setattr(pdf2image, 'convert_from_path', lambda *args, **kwargs: [Image.new('L', (60, 80), 255)])
+    monkeypatch.setattr(pdf_extractor.pytesseract, 'image_to_string',
+                        lambda image, lang=None: ocr_calls.append(lang) or "Standard signature page")
+    metrics = MetricsRegistry()
+    extractor = PDFExtractor(ocr_cache=OCRCache(str(tmp_path)), metrics=metrics)
+    
+    text = extractor.extract_text(build_pdf(PAGES))
+    assert text.count("Standard signature page") == 2
+    assert ocr_calls == ['eng']
+    counters = {(counter['name'], tuple(counter['labels'].items())): counter['value']
+                for counter in metrics.snapshot()['counters']}
+    assert counters[('pdf_ocr_cache_lookups_total', (('result', 'miss'),))] == 1
+    assert counters[('pdf_ocr_cache_lookups_total', (('result', 'hit'),))] == 1
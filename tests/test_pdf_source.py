@@ -0,0 +1,63 @@
+import io
+import os
+import hashlib
+
+import pytest
+
+from src.pdf_source import PDFSource
+
+def _sources(path, data):
+    return {
+        'path': lambda: path,
+        'bytes': lambda: data,
+        'bytearray': lambda: bytearray(data),
+        'memoryview': lambda: memoryview(data),
+        'BytesIO': lambda: io.BytesIO(data),
+        'file': lambda: open(path, 'rb'),
+    }
+
+@pytest.mark.parametrize('kind', ['path', 'bytes', 'bytearray', 'memoryview', 'BytesIO', 'file'])
+def test_every_input_reads_the_same_document(sample_pdf, sample_bytes, kind):
+    pdf_file = _sources(sample_pdf, sample_bytes)[kind]()
+    with PDFSource(pdf_file) as source:
+        assert len(source) == len(sample_bytes)
+        assert source.sha256() == hashlib.sha256(sample_bytes).hexdigest()
+        assert source.open_stream().read() == sample_bytes
+    if hasattr(pdf_file, 'close'):
+        pdf_file.close()
+
+def test_streams_are_independent(sample_pdf):
+    with PDFSource(sample_pdf) as source:
+        first, second = source.open_stream(), source.open_stream()
+        first.seek(100)
+        assert second.read(5) == b'%PDF-'
+        assert first.tell() == 100
+
+def test_unknown_stream_keeps_its_position(sample_bytes):
+    class Stream:
+        def __init__(self):
+            self.inner = io.BytesIO(sample_bytes)
+        def tell(self):
+            return self.inner.tell()
+        def seek(self, position):
+            return self.inner.seek(position)
+        def read(self):
+            return self.inner.read()
+    
+    stream = Stream()
+    stream.seek(42)
+    with PDFSource(stream) as source:
+        assert len(source) == len(sample_bytes)
+    assert stream.tell() == 42
+
+def test_ocr_path_writes_in_memory_documents_once(sample_pdf, sample_bytes):
+    with PDFSource(sample_pdf) as source:
+        assert source.ocr_path() == sample_pdf
+    
+    source = PDFSource(sample_bytes)
+    path = source.ocr_path()
+    assert source.ocr_path() == path
+    with open(path, 'rb') as file:
+        assert file.read() == sample_bytes
+    source.close()
+    assert not os.path.exists(path)
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+from benchmarks.bench_fields import legacy_extract_fields
+from benchmarks.bench_pipeline import run_benchmark
+from benchmarks.pdf_corpus import generate_pdf_corpus
+from src.field_extractor import FieldExtractor
+from src.pdf_extractor import PDFExtractor
+from src.pipeline import extract_fields_from_pdf
+
+REQUIRED = ['effective_date', 'initial_term']
+
+def _pages(texts, order=None):
+    order = order or range(1, len(texts) + 1)
+    return [SimpleNamespace(page_number=number, page_count=len(texts), text=texts[number - 1]) for number in order]
+
+def _reading(pages, read):
+    for page in pages:
+        read.append(page.page_number)
+        yield page
+
+def test_reading_stops_once_the_required_fields_are_found():
+    texts = ["Effective Date: 1 March 2023. Recitals", "The initial term is 24 months. Renewal", "Filler clause.",
+             "Filler."]
+    read = []
+    results = FieldExtractor().extract_fields_from_pages(_reading(_pages(texts), read), REQUIRED)
+    assert read == [1, 2]
+    assert results['effective_date'] == '2023-03-01'
+    assert results['initial_term'] == '24 months'
+
+def test_a_match_at_the_end_of_a_page_waits_for_the_next_page():
+    texts = ["Effective Date: 1 March 2023. The initial term is 24 months.", "Filler clause.", "Filler."]
+    read = []
+    FieldExtractor().extract_fields_from_pages(_reading(_pages(texts), read), REQUIRED)
+    # A value at the very end of page 1 might continue on page 2
+    assert read == [1, 2]
+
+def test_values_running_across_a_page_break_are_complete():
+    texts = ["Effective Date: 1 March 2023. The initial term is 24 months and may be extended by",
+             "mutual agreement. Filler clause."]
+    whole = FieldExtractor().extract_fields("\n".join(texts))
+    read = []
+    results = FieldExtractor().extract_fields_from_pages(_reading(_pages(texts), read), REQUIRED)
+    # Page 1 alone ends mid-value, so the term is only taken once page 2 is read
+    assert read == [1, 2]
+    assert results['initial_term'] == whole['initial_term'] == '24 months and may be extended by mutual agreement'
+
+def test_pages_out_of_order_use_their_read_neighbours():
+    texts = ["Effective Date: 1 March 2023.", "Filler clause.", "Filler clause.",
+             "The initial term of this agreement shall be", "36 months."]
+    read = []
+    results = FieldExtractor().extract_fields_from_pages(_reading(_pages(texts, [1, 2, 5, 3, 4]), read), REQUIRED)
+    assert read == [1, 2, 5, 3, 4]
+    assert results['initial_term'] == '36 months'
+
+def test_missing_fields_fall_back_to_the_whole_text():
+    texts = ["Preamble.", "Initial Term\n24 months"]
+    results = FieldExtractor().extract_fields_from_pages(_pages(texts), REQUIRED)
+    assert results['initial_term'] == FieldExtractor().extract_fields("\n".join(texts))['initial_term']
+
+def test_pdf_pipeline_skips_the_middle_pages(build_pdf):
+    path = build_pdf(["Effective Date: 1 March 2023.\nThe initial term is 24 months.\nDefinitions"]
+                     + [f"Filler clause number {number}." for number in range(2, 9)])
+    stats = {}
+    read = []
+    results = extract_fields_from_pdf(PDFExtractor(), FieldExtractor(), path, required_fields=REQUIRED,
+                                      stats=stats, on_page=lambda page: read.append(page.page_number))
+    assert results['initial_term'] == '24 months'
+    assert read == [1]
+    assert stats == {'pages_read': 1, 'page_count': 8}
+
+def test_generated_corpus_matches_the_original_extraction(tmp_path):
+    manifest = generate_pdf_corpus(str(tmp_path), 3, pages=3, placement='random', seed=4)
+    pdf_extractor = PDFExtractor()
+    field_extractor = FieldExtractor()
+    for entry in manifest:
+        text = pdf_extractor.extract_text(entry['path'])
+        assert field_extractor.extract_fields(text) == legacy_extract_fields(field_extractor.patterns, text)
+    
+    results = run_benchmark([entry['path'] for entry in manifest], warmup=0)
+    assert results['documents'] == 3
+    assert results['pages'] == sum(entry['page_count'] for entry in manifest)
+    assert results['ocr_pages'] == 0
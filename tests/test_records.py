@@ -0,0 +1,63 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from src.records import FIELDS, MISSING, MISSING_CODE, ExtractionRecord, RecordBatch
+
+RESULT = {
+    'file_name': 'a.pdf', 'print_name': 'Jane Doe', 'title': None, 'effective_date': '2022-10-01',
+    'start_date': '', 'initial_term': '24 months', 'further_term': None,
+}
+
+def test_record_round_trip():
+    record = ExtractionRecord.from_dict(dict(RESULT, reviewer='ops'))
+    assert record.title is MISSING
+    assert record.start_date is MISSING
+    assert record.get('title', 'Not found') == 'Not found'
+    assert record.get('reviewer') == 'ops'
+    assert record.to_dict() == dict(RESULT, start_date=None, print_name_2=None, reviewer='ops')
+
+def test_missing_survives_pickling():
+    assert pickle.loads(pickle.dumps(MISSING)) is MISSING
+    assert not MISSING
+
+def test_batch_rows_and_missing_counts():
+    batch = RecordBatch(capacity=1)
+    batch.append(RESULT)
+    batch.append(ExtractionRecord(file_name='b.pdf', print_name='Jane Doe', extra_field=[1, 2]))
+    
+    assert len(batch) == 2
+    assert batch[0] == ExtractionRecord.from_dict(RESULT)
+    assert batch[-1].extra == {'extra_field': [1, 2]}
+    # Repeated values are stored once
+    assert batch.values('print_name') == ['Jane Doe']
+    assert list(batch.codes('title')) == [MISSING_CODE, MISSING_CODE]
+    assert batch.missing_count(['title', 'start_date']) == 4
+    assert batch.missing_count() == sum(value is None for value in batch.to_dicts()[0].values()) + len(FIELDS) - 2
+    with pytest.raises(IndexError):
+        batch[2]
+
+def test_codes_widen_past_int8():
+    batch = RecordBatch.from_dicts({'file_name': f'{index}.pdf'} for index in range(300))
+    assert batch.codes('file_name').dtype == np.int16
+    assert batch[299].file_name == '299.pdf'
+    assert batch.codes('title').dtype == np.int8
+
+def test_nested_values_are_stored_as_json():
+    batch = RecordBatch.from_dicts([{'file_name': 'a.pdf', 'title': {'role': 'CEO'}}])
+    assert batch[0].title == '{"role": "CEO"}'
+
+def test_to_pandas_shares_the_code_buffers():
+    batch = RecordBatch.from_dicts([RESULT, dict(RESULT, file_name='b.pdf', title='CEO')])
+    frame = batch.to_pandas()
+    assert list(frame.columns) == list(FIELDS)
+    assert frame['file_name'].tolist() == ['a.pdf', 'b.pdf']
+    assert frame['title'].isna().tolist() == [True, False]
+    assert np.shares_memory(frame['print_name'].array.codes, batch.codes('print_name'))
+
+def test_to_arrow():
+    batch = RecordBatch.from_dicts([RESULT])
+    table = batch.to_arrow(columns=['file_name', 'title'])
+    assert table.column_names == ['file_name', 'title']
+    assert table.to_pylist() == [{'file_name': 'a.pdf', 'title': None}]
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+from src.field_extractor import FieldExtractor
+from src.templates import Template, TemplateRegistry, default_templates, PURE_HEALTHCARE_FRAMEWORK
+
+CONTRACT = (
+    "MASTER SUPPLY AGREEMENT\n"
+    "This agreement is made as of 1 March 2023.\n"
+    "The supply period is 36 months from signature.\n"
+    "Signed: Jane Doe, Director"
+)
+
+SUPPLY = Template(
+    'master_supply',
+    markers=['Master Supply Agreement'],
+    marker_window=50,
+    ignore_case=True,
+    patterns={
+        'initial_term': [r'the supply period is (\d+ months)'],
+        'effective_date': [r'made as of ([0-9a-z ]+?)\.'],
+    },
+    defaults={'print_name': [('Jane Doe', 'Jane Doe')]},
+)
+
+def _normalize(text):
+    return ' '.join(text.lower().split())
+
+def _matches(template, text, **kwargs):
+    return template.matches(text, _normalize(text), **kwargs)
+
+def test_markers_match_as_written_by_default():
+    exact = Template('exact', markers=['Master Supply Agreement'])
+    assert _matches(exact, "This Master Supply Agreement is made")
+    assert not _matches(exact, CONTRACT)
+    assert not _matches(exact, "Master\nSupply Agreement")
+
+def test_ignore_case_markers_match_across_lines():
+    assert _matches(SUPPLY, CONTRACT)
+    assert _matches(SUPPLY, "master\nsupply   AGREEMENT")
+    assert not _matches(SUPPLY, "Services Agreement")
+
+def test_marker_window_and_page_count():
+    assert not _matches(SUPPLY, "x" * 100 + " master supply agreement")
+    # A page whose position in the document is unknown cannot satisfy a marker window
+    assert not _matches(SUPPLY, CONTRACT, offset=None)
+    
+    two_pages = Template('two_pages', markers=['supply'], page_count=2)
+    assert _matches(two_pages, 'supply', page_count=2)
+    assert not _matches(two_pages, 'supply', page_count=3)
+    assert _matches(two_pages, 'supply', page_count=None)
+
+def test_match_field_uses_the_template_patterns():
+    normalized = _normalize(CONTRACT)
+    assert SUPPLY.has_patterns('initial_term')
+    assert not SUPPLY.has_patterns('title')
+    assert SUPPLY.match_field(normalized, 'initial_term').group(1) == '36 months'
+    assert SUPPLY.match_field(normalized, 'title') is None
+
+def test_defaults_fill_missing_fields_only():
+    results = {'print_name': None, 'title': 'CEO'}
+    assert SUPPLY.apply_defaults(results, CONTRACT) == ['print_name']
+    assert results['print_name'] == 'Jane Doe'
+    
+    results = {'print_name': 'John Smith'}
+    assert SUPPLY.apply_defaults(results, CONTRACT) == []
+    assert results['print_name'] == 'John Smith'
+
+def test_registry_returns_the_first_matching_template():
+    generic = Template('generic', markers=['agreement'])
+    registry = TemplateRegistry([SUPPLY, generic])
+    assert len(registry) == 2
+    for text, expected in [(CONTRACT, SUPPLY), ("Lease agreement", generic), ("Invoice", None)]:
+        assert registry.match(text, _normalize(text)) is expected
+
+def test_default_registry_is_a_fresh_copy():
+    registry = default_templates()
+    registry.register(SUPPLY)
+    assert default_templates().templates == [PURE_HEALTHCARE_FRAMEWORK]
+
+def test_field_extractor_reads_template_fields():
+    registry = TemplateRegistry([SUPPLY])
+    results = FieldExtractor(templates=registry).extract_fields(CONTRACT)
+    assert results['initial_term'] == '36 months'
+    assert results['effective_date'] == '2023-03-01'
+    assert results['print_name'] == 'Jane Doe'
+
+def test_template_fields_fall_back_to_the_full_pattern_set():
+    registry = TemplateRegistry([SUPPLY])
+    text = "MASTER SUPPLY AGREEMENT\nThe initial term is 24 months.\nEffective Date: 1 March 2023."
+    results = FieldExtractor(templates=registry).extract_fields(text)
+    assert results['initial_term'] == '24 months'
+    assert results['effective_date'] == '2023-03-01'
+    
+    pages = [SimpleNamespace(page_number=1, page_count=1, text=text)]
+    assert FieldExtractor(templates=registry).extract_fields_from_pages(pages)['initial_term'] == '24 months'
+
+def test_built_in_defaults_require_the_exact_name():
+    text = "FRAMEWORK AGREEMENT\nPure Healthcare Group\nSigned by Tony Constantindes on 10/01/2022"
+    results = FieldExtractor().extract_fields(text)
+    assert results['print_name_2'] == 'Tony Constantindes'
+    assert results['start_date'] == '2022-10-01'
+    
+    results = FieldExtractor().extract_fields(text.replace("Pure Healthcare Group", "PURE HEALTHCARE GROUP"))
+    assert 'print_name_2' not in results